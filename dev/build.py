@@ -7,6 +7,7 @@ import zlib
 import math
 import os
 import shutil
+import struct
 import subprocess
 import sys
 import time
@@ -20,6 +21,14 @@ BUILD_DIR_DEFAULT = "build"
 SOURCE_DIR_DEFAULT = "src"
 MPY_CROSS = "mpy-cross"
 
+# game config keys nothing on the device reads, dropped from the archive
+UNUSED_CONFIG_KEYS = {
+    None: ("Definition", "Memory", "InPlayScores", "InPlayInfo"),
+    "GameInfo": ("FileVer",),
+    "BallInPlay": ("Ball1", "Ball2", "Ball3", "Ball4", "Ball5"),
+    "InPlay": ("Warnings", "ExtraBalls", "EnterInitials", "ZeroNibble"),
+}
+
 
 def get_directory_size(path: str) -> tuple[int, int]:
     total_size = 0
@@ -61,6 +70,31 @@ def step_report(func):
     return wrapper
 
 
+def normalize_game_config(data):
+    """Precompile a game config for the device: "0x.." strings become integers and unused keys are dropped.
+
+    The device loads the result as is (no hex walk at boot), so this must match what the
+    old on-device convert_hex_to_int produced.
+    """
+
+    def convert(value):
+        if isinstance(value, dict):
+            return {key: convert(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [convert(item) for item in value]
+        if isinstance(value, str) and value.startswith("0x"):
+            return int(value, 16)
+        return value
+
+    data = convert(data)
+    for section, keys in UNUSED_CONFIG_KEYS.items():
+        target = data if section is None else data.get(section)
+        if isinstance(target, dict):
+            for key in keys:
+                target.pop(key, None)
+    return data
+
+
 class Builder:
     def __init__(self, build_dir, source_dir, target_hardware="sys11"):
         self.build_dir = build_dir
@@ -231,30 +265,60 @@ class Builder:
 
     @step_report
     def combine_json_configs(self):
-        """Combine JSON files in build/config into a deflate-compressed all.jsonl.z file."""
+        """Combine JSON files in build/config into the indexed games.bin archive and its catalog.json.
+
+        Each config is normalized (normalize_game_config) and compressed as its own zlib
+        block so the device can seek to one title without inflating the rest and use it
+        without further conversion. Layout (read by src/common/GameArchive.py):
+        b"VGA1", <H count, count x (<B key length, key, <I offset, <I length), blocks.
+        catalog.json maps each key to [name, rom, system, offset] so the device can list
+        games without reading the archive.
+        """
         print("Combining JSON config files...")
         config_dir = os.path.join(self.build_dir, "config")
         if not os.path.isdir(config_dir):
             print("No 'config' directory found; skipping.")
             return
-        
+
         # Validate LinkTo references before combining
         self.validate_linkto_references(config_dir)
-        
-        output_path = os.path.join(config_dir, "all.jsonl.z")
-        compressor = zlib.compressobj(level=9, wbits=8)
+
+        blocks = []
+        info = {}
+        for root, dirs, files in os.walk(config_dir):
+            for file in sorted(files):
+                if file.endswith(".json"):
+                    file_path = os.path.join(root, file)
+                    with open(file_path, "r") as f:
+                        data = normalize_game_config(json.load(f))
+                    key = os.path.splitext(file)[0].encode("utf-8")
+                    if len(key) > 255:
+                        raise ValueError(f"Config name too long for the archive index: {file}")
+                    compressor = zlib.compressobj(level=9, wbits=8)
+                    block = compressor.compress(json.dumps(data, separators=(",", ":")).encode("utf-8")) + compressor.flush()
+                    blocks.append((key, block))
+                    info[key.decode("utf-8")] = data.get("GameInfo", {})
+                    os.remove(file_path)
+
+        offset = 6 + sum(1 + len(key) + 8 for key, _ in blocks)
+        catalog = {}
+        output_path = os.path.join(config_dir, "games.bin")
         with open(output_path, "wb") as outfile:
-            for root, dirs, files in os.walk(config_dir):
-                for file in files:
-                    if file.endswith(".json"):
-                        file_path = os.path.join(root, file)
-                        with open(file_path, "r") as f:
-                            data = json.load(f)
-                        file_name = os.path.splitext(file)[0]
-                        line = f"{file_name}{json.dumps(data, separators=(',',':'))}\n"
-                        outfile.write(compressor.compress(line.encode("utf-8")))
-                        os.remove(file_path)
-            outfile.write(compressor.flush())
+            outfile.write(b"VGA1" + struct.pack("<H", len(blocks)))
+            for key, block in blocks:
+                outfile.write(struct.pack("<B", len(key)) + key + struct.pack("<II", offset, len(block)))
+                name = key.decode("utf-8")
+                game_info = info[name]
+                # aliases show their own name but run (and report the system of) their target
+                system = info[game_info["LinkTo"]].get("System") if "LinkTo" in game_info else game_info.get("System")
+                catalog[name] = [game_info["GameName"], name.split("_")[-1], system, offset]
+                offset += len(block)
+            for _, block in blocks:
+                outfile.write(block)
+
+        with open(os.path.join(config_dir, "catalog.json"), "w", encoding="utf-8") as f:
+            json.dump(catalog, f, separators=(",", ":"))
+        print(f"Wrote {len(blocks)} game configs to {output_path}")
 
     @step_report
     def zip_files(self):
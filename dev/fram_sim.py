@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Host-side FRAM stand-in for exercising and benchmarking ``SPI_Store`` on Linux.
+
+The real driver talks to the FRAM through ``machine.SPI`` and a chip select pin.
+This module models the FRAM SPI protocol (WREN / WRITE / READ with a 16 bit
+address) behind fake ``machine``, ``uctypes`` and ``Shadow_Ram_Definitions``
+modules, loads ``src/common/SPI_Store.py`` against it, and counts what crosses
+the bus so the burst driver can be compared to the legacy 16 byte chunked one.
+
+Run ``python dev/fram_sim.py`` for a throughput table.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+import types
+
+SPI_STORE_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "common", "SPI_Store.py")
+FRAM_MIRROR_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "common", "FramMirror.py")
+
+OPCODE_WREN = 0x06
+OPCODE_READ = 0x03
+OPCODE_WRITE = 0x02
+
+# MicroPython cost of one SPI / Pin method call on an RP2040, used for the time estimate
+CALL_OVERHEAD_S = 25e-6
+
+
+class FramChip:
+    """Byte accurate model of an SPI FRAM with a 16 bit address."""
+
+    def __init__(self, size=32768, max_baudrate=20000000):
+        self.mem = bytearray(size)
+        self.size = size
+        self.max_baudrate = max_baudrate
+        self.baudrate = 1000000
+        self.transactions = 0
+        self.bytes_clocked = 0
+        self.calls = 0
+        self.bus_seconds = 0.0
+        self._selected = False
+        self._rx = bytearray()
+        self._address = None
+        self._write_enabled = False
+
+    def reset_stats(self):
+        self.transactions = 0
+        self.bytes_clocked = 0
+        self.calls = 0
+        self.bus_seconds = 0.0
+
+    def estimated_seconds(self):
+        return self.bus_seconds + self.calls * CALL_OVERHEAD_S
+
+    def select(self):
+        self._selected = True
+        self._rx = bytearray()
+        self._address = None
+        self.transactions += 1
+
+    def deselect(self):
+        if self._selected and self._rx and self._rx[0] == OPCODE_WRITE:
+            # WRITE clears the write enable latch at the end of the transaction
+            self._write_enabled = False
+        elif self._selected and self._rx and self._rx[0] == OPCODE_WREN:
+            self._write_enabled = True
+        self._selected = False
+
+    def _clock(self, nbytes):
+        self.bytes_clocked += nbytes
+        self.bus_seconds += nbytes * 8 / self.baudrate
+
+    def _header_complete(self):
+        if self._address is None and len(self._rx) >= 3 and self._rx[0] in (OPCODE_READ, OPCODE_WRITE):
+            self._address = ((self._rx[1] << 8) | self._rx[2]) % self.size
+        return self._address is not None
+
+    def shift_out(self, data):
+        """bytes from the controller to the FRAM"""
+        if not self._selected:
+            raise RuntimeError("SPI write with chip select high")
+        self._clock(len(data))
+        for b in bytes(data):
+            if self._header_complete() and self._rx[0] == OPCODE_WRITE:
+                if self._write_enabled:
+                    self.mem[self._address] = b
+                self._address = (self._address + 1) % self.size
+            else:
+                self._rx.append(b)
+
+    def shift_in(self, buf):
+        """bytes from the FRAM to the controller"""
+        if not self._selected:
+            raise RuntimeError("SPI read with chip select high")
+        self._clock(len(buf))
+        if not (self._header_complete() and self._rx[0] == OPCODE_READ):
+            buf[:] = b"\xff" * len(buf)
+            return
+        for i in range(len(buf)):
+            b = self.mem[self._address]
+            if self.baudrate > self.max_baudrate:
+                # too fast for the board: sampled one bit late
+                b = (b >> 1) | 0x80
+            buf[i] = b
+            self._address = (self._address + 1) % self.size
+
+
+def make_machine_module(chip):
+    """fake ``machine`` module wired to ``chip``"""
+    machine = types.ModuleType("machine")
+
+    class Pin:
+        OUT = 1
+        IN = 0
+
+        def __init__(self, pin_id, mode=None, value=None):
+            self.pin_id = pin_id
+            self._value = 1
+
+        def value(self, v=None):
+            if v is None:
+                return self._value
+            chip.calls += 1
+            if v == 0 and self._value != 0:
+                chip.select()
+            elif v != 0 and self._value == 0:
+                chip.deselect()
+            self._value = v
+
+    class SPI:
+        MSB = 0
+        LSB = 1
+
+        def __init__(self, bus_id, baudrate=1000000, **kwargs):
+            chip.baudrate = baudrate
+
+        def init(self, baudrate=None, **kwargs):
+            if baudrate is not None:
+                chip.baudrate = baudrate
+
+        def write(self, data):
+            chip.calls += 1
+            chip.shift_out(data)
+
+        def read(self, nbytes, write=0x00):
+            chip.calls += 1
+            buf = bytearray(nbytes)
+            chip.shift_in(buf)
+            return bytes(buf)
+
+        def readinto(self, buf, write=0x00):
+            chip.calls += 1
+            chip.shift_in(buf)
+
+    machine.Pin = Pin
+    machine.SPI = SPI
+    return machine
+
+
+def make_ram_modules(ram):
+    """fake ``uctypes`` and ``Shadow_Ram_Definitions`` over a host bytearray"""
+    uctypes = types.ModuleType("uctypes")
+    uctypes.bytearray_at = lambda address, length: memoryview(ram)[address : address + length]
+
+    shadow = types.ModuleType("Shadow_Ram_Definitions")
+    shadow.SRAM_DATA_BASE = 0
+    shadow.SRAM_DATA_LENGTH = len(ram)
+    shadow.shadowRam = memoryview(ram)
+    return uctypes, shadow
+
+
+def load_spi_store(chip, ram=None, path=SPI_STORE_PATH):
+    """import SPI_Store against the simulated FRAM, returns the module"""
+    if ram is None:
+        ram = bytearray(0x800)
+    uctypes, shadow = make_ram_modules(ram)
+    fakes = {"machine": make_machine_module(chip), "uctypes": uctypes, "Shadow_Ram_Definitions": shadow}
+    saved = {name: sys.modules.get(name) for name in fakes}
+    sys.modules.update(fakes)
+    try:
+        spec = importlib.util.spec_from_file_location("SPI_Store_sim", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        for name, original in saved.items():
+            if original is None:
+                del sys.modules[name]
+            else:
+                sys.modules[name] = original
+    module.shadow_ram = ram
+    return module
+
+
+def _next_dirty_block(live, mirror, start, end, block):
+    """host version of FramMirror_viper.next_dirty_block"""
+    for pos in range(start, end, block):
+        stop = min(pos + block, end)
+        if live[pos:stop] != mirror[pos:stop]:
+            return pos
+    return end
+
+
+def _next_clean_block(live, mirror, start, end, block):
+    """host version of FramMirror_viper.next_clean_block"""
+    for pos in range(start, end, block):
+        stop = min(pos + block, end)
+        if live[pos:stop] == mirror[pos:stop]:
+            return pos
+    return end
+
+
+def load_fram_mirror(chip, ram, gdata=None, path=FRAM_MIRROR_PATH):
+    """import FramMirror over ``ram`` and the simulated FRAM, returns the module"""
+    store = load_spi_store(chip, ram)
+    uctypes, shadow = make_ram_modules(ram)
+
+    viper = types.ModuleType("FramMirror_viper")
+    viper.next_dirty_block = _next_dirty_block
+    viper.next_clean_block = _next_clean_block
+    micropython = types.ModuleType("micropython")
+    micropython.const = lambda value: value
+    shared = types.ModuleType("SharedState")
+    shared.gdata = gdata or {}
+    faults = types.ModuleType("faults")
+    faults.toggle_board_LED = lambda **kwargs: None
+    faults.ALL_HDWR = "HDWR"
+    faults.fault_is_raised = lambda fault: False
+
+    fakes = {"SPI_Store": store, "uctypes": uctypes, "Shadow_Ram_Definitions": shadow, "FramMirror_viper": viper, "micropython": micropython, "SharedState": shared, "faults": faults}
+    saved = {name: sys.modules.get(name) for name in fakes}
+    sys.modules.update(fakes)
+    try:
+        spec = importlib.util.spec_from_file_location("FramMirror_sim", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        for name, original in saved.items():
+            if original is None:
+                del sys.modules[name]
+            else:
+                sys.modules[name] = original
+    return module
+
+
+def legacy_mem_read(spi, cs, address, nbytes):
+    """the previous driver: 16 byte chunks, each with its own opcode, address and CS cycle"""
+    data = bytearray()
+    offset = 0
+    while offset < nbytes:
+        read_size = min(16, nbytes - offset)
+        msg = bytearray([OPCODE_READ, (address >> 8) & 0xFF, address & 0xFF])
+        cs.value(0)
+        spi.write(msg)
+        data.extend(spi.read(read_size))
+        cs.value(1)
+        address += 16
+        offset += 16
+    return data
+
+
+def legacy_mem_write(spi, cs, address, data):
+    """the previous driver: WREN plus one CS cycle per 16 byte chunk"""
+    cs.value(0)
+    spi.write(bytearray([OPCODE_WREN]))
+    cs.value(1)
+    for i in range(0, len(data), 16):
+        chunk = data[i : i + 16]
+        cs.value(0)
+        spi.write(bytearray([OPCODE_WREN]))
+        cs.value(1)
+        msg = bytearray([OPCODE_WRITE, (address >> 8) & 0xFF, address & 0xFF])
+        msg.extend(chunk)
+        cs.value(0)
+        spi.write(msg)
+        cs.value(1)
+        address += 16
+
+
+SCENARIOS = (
+    ("restore 2K shadow ram", "read", 0x0000, 0x800),
+    ("restore 8K shadow ram", "read", 0x0000, 0x2000),
+    ("store 2K shadow ram", "write", 0x0000, 0x800),
+    ("leaderboard record", "read", 0x7A00, 35),
+    ("60 byte log line", "write", 0x2400, 60),
+)
+
+
+def _measure(chip, func):
+    chip.reset_stats()
+    start = time.perf_counter()
+    func()
+    host = time.perf_counter() - start
+    return {"transactions": chip.transactions, "bytes": chip.bytes_clocked, "device_ms": chip.estimated_seconds() * 1000, "host_ms": host * 1000}
+
+
+def benchmark(max_baudrate=20000000):
+    """run each scenario through the legacy and burst drivers, returns a list of result rows"""
+    chip = FramChip(max_baudrate=max_baudrate)
+    for i in range(len(chip.mem)):
+        chip.mem[i] = (i * 7 + 3) & 0xFF
+    store = load_spi_store(chip, bytearray(0x2000))
+    negotiated = store.baudrate
+
+    rows = []
+    for name, kind, address, length in SCENARIOS:
+        payload = bytes(length)
+        buf = bytearray(length)
+        if kind == "read":
+            legacy = lambda: legacy_mem_read(store.spi, store.cs, address, length)  # noqa: E731
+            burst = lambda: store.readinto(address, buf)  # noqa: E731
+        else:
+            legacy = lambda: legacy_mem_write(store.spi, store.cs, address, payload)  # noqa: E731
+            burst = lambda: store.write(address, payload)  # noqa: E731
+
+        store.spi.init(baudrate=store.BASE_BAUDRATE)
+        old = _measure(chip, legacy)
+        store.spi.init(baudrate=negotiated)
+        new = _measure(chip, burst)
+        rows.append({"scenario": name, "legacy": old, "burst": new, "baudrate": negotiated})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SPI_Store burst driver against the legacy chunked driver on a simulated FRAM.")
+    parser.add_argument("--max-baudrate", type=int, default=20000000, help="fastest clock the simulated board wiring tolerates")
+    args = parser.parse_args()
+
+    rows = benchmark(args.max_baudrate)
+    print(f"negotiated baudrate: {rows[0]['baudrate']}")
+    print(f"{'scenario':<24}{'legacy txn':>11}{'burst txn':>10}{'legacy ms':>11}{'burst ms':>10}{'speedup':>9}")
+    for row in rows:
+        old, new = row["legacy"], row["burst"]
+        speedup = old["device_ms"] / new["device_ms"] if new["device_ms"] else float("inf")
+        print(f"{row['scenario']:<24}{old['transactions']:>11}{new['transactions']:>10}{old['device_ms']:>11.2f}{new['device_ms']:>10.2f}{speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import json
+import struct
+import zlib
+
+import pytest
+
+from dev.build import Builder, normalize_game_config
+
+
+def _read_archive(path):
+    data = path.read_bytes()
+    assert data[:4] == b"VGA1"
+    count = struct.unpack_from("<H", data, 4)[0]
+    pos = 6
+    games = {}
+    for _ in range(count):
+        size = data[pos]
+        key = data[pos + 1 : pos + 1 + size].decode()
+        offset, length = struct.unpack_from("<II", data, pos + 1 + size)
+        pos += 1 + size + 8
+        games[key] = json.loads(zlib.decompress(data[offset : offset + length]))
+    return games
+
+
+def _write_configs(tmp_path, configs):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    for name, data in configs.items():
+        (config_dir / f"{name}.json").write_text(json.dumps(data), encoding="utf-8")
+    return config_dir
+
+
+def test_configs_become_independent_blocks(tmp_path):
+    configs = {
+        "Pinbot_L1": {"GameInfo": {"GameName": "Pinbot", "System": "11"}, "HighScores": {"Type": 1, "ScoreAdr": 4096}},
+        "Pinbot_L2": {"GameInfo": {"GameName": "Pinbot", "LinkTo": "Pinbot_L1"}},
+        "Taxi_L4": {"GameInfo": {"GameName": "Taxi", "System": "11"}},
+    }
+    config_dir = _write_configs(tmp_path, configs)
+
+    Builder(str(tmp_path), "src").combine_json_configs()
+
+    assert sorted(p.name for p in config_dir.iterdir()) == ["catalog.json", "games.bin"]
+    assert _read_archive(config_dir / "games.bin") == configs
+
+
+def test_catalog_points_at_blocks(tmp_path):
+    configs = {
+        "Pinbot_L1": {"GameInfo": {"GameName": "Pinbot", "System": "11"}},
+        "Pinbot_L2": {"GameInfo": {"GameName": "Pinbot", "LinkTo": "Pinbot_L1"}},
+        "Taxi_L4": {"GameInfo": {"GameName": "Taxi", "System": "11B"}},
+    }
+    config_dir = _write_configs(tmp_path, configs)
+
+    Builder(str(tmp_path), "src").combine_json_configs()
+
+    catalog = json.loads((config_dir / "catalog.json").read_text())
+    assert {key: entry[:3] for key, entry in catalog.items()} == {
+        "Pinbot_L1": ["Pinbot", "L1", "11"],
+        "Pinbot_L2": ["Pinbot", "L2", "11"],
+        "Taxi_L4": ["Taxi", "L4", "11B"],
+    }
+    archive = (config_dir / "games.bin").read_bytes()
+    for key, entry in catalog.items():
+        assert json.loads(zlib.decompressobj().decompress(archive[entry[3] :])) == configs[key]
+
+
+def test_broken_link_is_rejected(tmp_path):
+    _write_configs(tmp_path, {"Pinbot_L2": {"GameInfo": {"LinkTo": "Pinbot_L1"}}})
+
+    with pytest.raises(ValueError):
+        Builder(str(tmp_path), "src").combine_json_configs()
+
+
+def test_configs_are_precompiled():
+    data = {
+        "GameInfo": {"GameName": "Pinbot", "System": "11", "FileVer": 3},
+        "Memory": {"Start": "0x0000"},
+        "HighScores": {"ScoreAdr": "0x1A0", "Names": ["0x2", "LEFT"]},
+        "Modes": {"Fish Caught": {"Address": "0x515", "Format": "u8"}},
+    }
+
+    assert normalize_game_config(data) == {
+        "GameInfo": {"GameName": "Pinbot", "System": "11"},
+        "HighScores": {"ScoreAdr": 0x1A0, "Names": [2, "LEFT"]},
+        "Modes": {"Fish Caught": {"Address": 0x515, "Format": "u8"}},
+    }
@@ -0,0 +1,88 @@
+from dev.fram_sim import FramChip, benchmark, legacy_mem_read, load_fram_mirror, load_spi_store
+
+
+def _patterned_chip(**kwargs):
+    chip = FramChip(**kwargs)
+    for i in range(len(chip.mem)):
+        chip.mem[i] = (i * 7 + 3) & 0xFF
+    return chip
+
+
+def test_burst_write_and_read_round_trip_in_one_transaction():
+    chip = _patterned_chip()
+    store = load_spi_store(chip)
+    payload = bytes(range(200))
+
+    chip.reset_stats()
+    store.write(0x2400, payload)
+    # WREN plus a single write transaction regardless of length
+    assert chip.transactions == 2
+
+    buf = bytearray(len(payload))
+    chip.reset_stats()
+    store.readinto(0x2400, memoryview(buf))
+    assert chip.transactions == 1
+    assert bytes(buf) == payload
+    assert store.read(0x2400, 200) == payload
+
+
+def test_burst_read_matches_legacy_driver():
+    chip = _patterned_chip()
+    store = load_spi_store(chip)
+    assert store.read(0x7A00, 35) == legacy_mem_read(store.spi, store.cs, 0x7A00, 35)
+
+
+def test_restore_mem_fills_shadow_ram():
+    chip = _patterned_chip()
+    ram = bytearray(0x800)
+    store = load_spi_store(chip, ram)
+    store.Restore_Mem(store.shadow_ram, len(ram))
+    assert ram == chip.mem[: len(ram)]
+
+
+def test_negotiation_picks_fastest_reliable_rate():
+    assert load_spi_store(_patterned_chip(max_baudrate=20000000)).baudrate == 20000000
+    assert load_spi_store(_patterned_chip(max_baudrate=12000000)).baudrate == 10000000
+    assert load_spi_store(_patterned_chip(max_baudrate=2000000)).baudrate == 1000000
+
+
+def test_negotiation_stays_slow_on_blank_part():
+    assert load_spi_store(FramChip()).baudrate == 1000000
+
+
+def test_benchmark_reduces_transactions():
+    for row in benchmark():
+        assert row["burst"]["transactions"] < row["legacy"]["transactions"]
+        assert row["burst"]["device_ms"] < row["legacy"]["device_ms"]
+
+
+def test_mirror_writes_only_changed_blocks():
+    chip = FramChip()
+    ram = bytearray(0x800)
+    mirror = load_fram_mirror(chip, ram)
+    mirror.sync()
+    assert mirror.stats["bytes"] == 0
+
+    ram[0x100:0x104] = b"\x01\x02\x03\x04"
+    ram[0x110] = 5
+    ram[0x400] = 6
+    chip.reset_stats()
+    mirror.sync()
+    # two adjacent dirty blocks merge into one burst, WREN plus write per burst
+    assert mirror.stats == {"bytes": 48, "bursts": 2}
+    assert chip.transactions == 4
+    assert chip.mem[: len(ram)] == ram
+
+
+def test_mirror_priority_regions_ignore_budget():
+    chip = FramChip()
+    ram = bytearray(0x800)
+    mirror = load_fram_mirror(chip, ram, {"Adjustments": {"ChecksumStartAdr": 0x780, "ChecksumResultAdr": 0x79F}})
+    mirror.sync()
+
+    ram[:] = b"\x55" * len(ram)
+    mirror.sync()
+    assert chip.mem[0x780:0x7A0] == ram[0x780:0x7A0]
+    assert chip.mem[0x7C0] == 0
+    mirror.flush()
+    assert chip.mem[: len(ram)] == ram
@@ -0,0 +1,49 @@
+import importlib.util
+import os
+
+METRICS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "src", "common", "phew", "metrics.py")
+
+
+def _load_metrics():
+    spec = importlib.util.spec_from_file_location("metrics", METRICS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_percentiles_cover_the_rolling_window_only():
+    metrics = _load_metrics()
+    for ms in range(100):
+        metrics.record_route("/api/leaders", ms, sent=10, alloc=5)
+
+    report = metrics.report()["routes"]["/api/leaders"]
+    # the window holds the last 32 samples, 68..99
+    assert report["count"] == 100
+    assert report["p50_ms"] == 83
+    assert report["p95_ms"] == 98
+    assert report["max_ms"] == 99
+    assert report["bytes"] == 1000
+    assert report["alloc"] == 500
+
+
+def test_negative_alloc_and_errors():
+    metrics = _load_metrics()
+    metrics.record_task("poll_fast", 4, alloc=-64, error=True)
+
+    report = metrics.report()["tasks"]["poll_fast"]
+    assert report["errors"] == 1
+    assert report["alloc"] == 0
+    assert report["p50_ms"] == report["p95_ms"] == 4
+
+
+def test_key_count_is_bounded():
+    metrics = _load_metrics()
+    for i in range(metrics.MAX_KEYS + 10):
+        metrics.record_route(f"/r{i}", 1)
+
+    routes = metrics.report()["routes"]
+    assert len(routes) == metrics.MAX_KEYS + 1
+    assert routes["other"]["count"] == 10
+
+    metrics.reset()
+    assert metrics.report()["routes"] == {}
@@ -0,0 +1,62 @@
+import importlib.util
+import os
+import struct
+
+CODEC_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "src", "common", "RecordCodec.py")
+
+
+def _load_codec():
+    spec = importlib.util.spec_from_file_location("RecordCodec", CODEC_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _compiled(score="I", flags=None):
+    codec = _load_codec()
+    names = ("names", "leaders", "tournament", "individual", "configuration", "extras", "switches", "MapVersion")
+    memory_map = {name: {} for name in names}
+    codec.compile(memory_map, score=score, flags=flags or codec.EXTRAS_FLAGS)
+    return codec, memory_map
+
+
+def test_layouts_match_stored_formats():
+    _, memory_map = _compiled()
+    leader = {"initials": "ABC", "full_name": "Alice", "date": "01/02/2025", "score": 123456}
+    assert bytes(memory_map["leaders"]["codec"].pack(leader)) == struct.pack("<3s16s10sI", b"ABC", b"Alice", b"01/02/2025", 123456)
+
+    _, memory_map = _compiled(score="Q")
+    entry = {"initials": "XY", "score": 2**40, "game": 4, "index": 7}
+    assert bytes(memory_map["tournament"]["codec"].pack(entry)) == struct.pack("<3sQBB", b"XY", 2**40, 4, 7)
+
+
+def test_round_trip_and_single_field_decode():
+    _, memory_map = _compiled()
+    codec = memory_map["leaders"]["codec"]
+    leader = {"initials": "ABC", "full_name": "Alice", "date": "01/02/2025", "score": 99}
+    data = bytes(codec.pack(leader))
+    assert codec.unpack(data) == leader
+    assert codec.field("score", data) == 99
+    assert codec.field("full_name", data) == "Alice"
+
+
+def test_extras_flags_use_variant_names():
+    codec_module, memory_map = _compiled()
+    _, wpc_map = _compiled(score="Q", flags=codec_module.WPC_EXTRAS_FLAGS)
+    extras = {"enter_initials_on_game": False, "claim_scores": True, "tournament_mode": True, "WPCTimeOn": False, "other": 1, "lastIP": "1.2.3.4", "message": "hi"}
+
+    data = bytes(wpc_map["extras"]["codec"].pack(extras))
+    assert struct.unpack_from("<I", data)[0] == 0x02 | 0x04 | 0x08 | 0x20
+    record = wpc_map["extras"]["codec"].unpack(data)
+    assert record["MM_Always"] is True and record["WPCTimeOn"] is False
+    assert wpc_map["extras"]["codec"].field("tournament_mode", data) is True
+    assert "flag5" in memory_map["extras"]["codec"].unpack(data)
+
+
+def test_fallback_is_a_fresh_copy():
+    _, memory_map = _compiled()
+    codec = memory_map["switches"]["codec"]
+    first = codec.default()
+    first["switches"][0] = 9
+    assert codec.default()["switches"][0] == 0
+    assert memory_map["leaders"]["codec"].default() is None
@@ -154,19 +154,13 @@ def get_active_adjustment():
         return None
 
     matches = []
-    # try to do this 16 bytes at a time for speed - (one SPI read cycle)
+    # one burst read per profile into a reused buffer
+    active_data = shadowRam[cpyStart:end_address]
+    stored_data = bytearray(end_address - cpyStart)
     for i in range(4):
         fram_adr = ADJ_FRAM_START + ADJ_FRAM_RECORD_SIZE * i
-        active_data = shadowRam[cpyStart:end_address]
-        match = True
-        for offset in range(0, end_address - cpyStart, 16):
-            length = min(16, end_address - cpyStart - offset)
-            stored_data = fram.read(fram_adr + offset, length)
-
-            if stored_data != active_data[offset : offset + 16]:
-                match = False
-                break
-        if match:
+        fram.readinto(fram_adr, stored_data)
+        if stored_data == active_data:
             matches.append(i)
 
     if not matches:
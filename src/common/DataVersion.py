@@ -0,0 +1,34 @@
+"""
+Data Version
+    a counter per data domain, bumped whenever that data is written.
+    routes build an ETag from the counters of the domains they read so an
+    If-None-Match request can be answered with 304 before any fram read or
+    json encode.
+
+    domains: leaders, tournament, names, individual, formats, config
+"""
+from urandom import getrandbits
+
+# counters restart at boot, the nonce keeps tags from before a reboot from matching
+_boot = getrandbits(24)
+_versions = {}
+
+
+def bump(domain=None):
+    """mark a domain (every domain if None) as changed"""
+    global _boot
+    if domain is None:
+        _boot = getrandbits(24)
+    else:
+        _versions[domain] = _versions.get(domain, 0) + 1
+
+
+def etag(domains, extra=""):
+    """quoted ETag for the current versions of domains (tuple).  extra is mixed in for
+    content that also depends on something else (the day, for relative dates)"""
+    tag = "%x" % _boot
+    for domain in domains:
+        tag += "-%d" % _versions.get(domain, 0)
+    if extra:
+        tag += "-" + str(extra)
+    return '"' + tag + '"'
@@ -5,7 +5,6 @@ V12/9/2024 support for software download
 import gc
 import json
 
-import SPI_DataStore as DataStore
 from logger import logger_instance
 
 Log = logger_instance
@@ -47,17 +46,18 @@ score_version_upgrades = {0: score_export_0_to_1}
 
 
 def _get_scores_no_zeros(list):
-    result = []
-    for i in range(DataStore.memory_map[list]["count"]):
-        row = DataStore.read_record(list, i)
-        if row["score"] > 0:
-            result.append(row)
-    return result
+    from ScoreIndex import board
+
+    # lazy, rows are read from the resident board as they are encoded
+    return (row for row in board(list) if row["score"] > 0)
 
 
 def download_scores():
+    """generator of the score export json, records are encoded one at a time"""
+    from JsonStream import stream
+
     data = {"version": current_score_version, "scores": {"leaders": _get_scores_no_zeros("leaders"), "tournament": _get_scores_no_zeros("tournament")}}
-    return json.dumps(data)
+    return stream(data, depth=3)
 
 
 def import_scores(data):
@@ -81,7 +81,9 @@ def download_names(request):
     print("download names - - - ")
     try:
         # Collect player names data
-        names_data = [DataStore.read_record("names", i) for i in range(DataStore.memory_map["names"]["count"])]
+        from ScoreIndex import board
+
+        names_data = board("names")
 
         response_body = [{"FileType": "names", "contents": names_data}]
         # Prepare the final response
@@ -105,19 +107,23 @@ def download_names(request):
         )
 
 
-def download_log():
+def download_log(since=None):
+    """stream the log, since is a cursor from a previous download's X-Log-Cursor header"""
     try:
+        cursor = logger_instance.cursor()
+
         # Prepare the response headers
         headers = {
             "Content-Type": "text/plain",
             "Content-Disposition": "attachment; filename=log.txt",
             "Connection": "close",
+            "X-Log-Cursor": cursor,
         }
 
         # Generator function to stream
         def log_stream_generator():
-            for line in logger_instance.get_logs_stream():
-                yield line
+            for block in logger_instance.get_logs_stream(since=since, until=cursor):
+                yield block
 
         return log_stream_generator(), 200, headers
 
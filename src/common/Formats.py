@@ -8,7 +8,9 @@ This module provides functions to retrieve and manage different game formats
 (e.g., Standard, Practice, Golf, etc.) from game configuration files.
 """
 import SharedState as S
+import DataVersion
 import DataMapper
+import GameEvents
 import Switches
 from logger import logger_instance
 log = logger_instance
@@ -253,10 +255,10 @@ def practice_run():
     global next_format
 
     if next_format.get("Id", 0) != MODE_ID_PRACTICE :  # end on next ball drain
-        if DataMapper.get_game_active() == True:
+        if GameEvents.game_active() == True:
             DataMapper.write_ball_in_play(5)
             DataMapper.write_live_scores([1, 1, 1, 1])
-    elif DataMapper.get_ball_in_play() > 1:
+    elif GameEvents.ball_in_play() > 1:
         DataMapper.write_ball_in_play(1)
 
     max_score = S.active_format.get("Options", {}).get("MaxScore", {}).get("Value", 0)
@@ -268,7 +270,7 @@ def practice_run():
                 DataMapper.write_live_scores(scores)
                 break
 
-    return DataMapper.get_game_active() 
+    return GameEvents.game_active() 
 
 
 # ============================================================================
@@ -288,11 +290,11 @@ def lowball_init():
 def lowball_run():
     global mode_ball_in_play, mode_player_up, player_scores, lowball_scores   
 
-    ball_in_play = DataMapper.get_ball_in_play()
+    ball_in_play = GameEvents.ball_in_play()
 
     #copy all players scores to lowball
     if ball_in_play > 0:
-        lowball_scores[ball_in_play - 1] = DataMapper.get_live_scores(use_format=False)
+        lowball_scores[ball_in_play - 1] = GameEvents.scores()
 
     # Update player_scores with the lowest non-zero score for each player
     for player_idx in range(4):
@@ -305,7 +307,7 @@ def lowball_run():
         DataMapper.write_live_scores([0,0,0,0])
     mode_ball_in_play=ball_in_play
 
-    game_over=DataMapper.get_game_active()
+    game_over=GameEvents.game_active()
     if game_over is True:
         print("FORMAT: end of game lowball scores:",lowball_scores)
     return game_over
@@ -352,8 +354,8 @@ def golf_run():
     """Run golf mode during gameplay"""
     global golf_ball_in_play, golf_player_up, golf_player_complete, player_scores
 
-    ball_in_play = DataMapper.get_ball_in_play()
-    player_up = DataMapper.get_player_up()
+    ball_in_play = GameEvents.ball_in_play()
+    player_up = GameEvents.player_up()
     players_in_game = DataMapper.get_players_in_game()
 
     #new players join
@@ -398,7 +400,7 @@ def golf_run():
     
     #always re-write scores - 
     DataMapper.write_live_scores(player_scores)
-    return DataMapper.get_game_active()
+    return GameEvents.game_active()
 
 
 def golf_close():
@@ -422,9 +424,9 @@ def golf_hit_callback(switch_idx):
         return
 
     try:
-        player_up = DataMapper.get_player_up()       
+        player_up = GameEvents.player_up()       
 
-        if DataMapper.get_ball_in_play()==1 or DataMapper.get_ball_in_play()==5:
+        if GameEvents.ball_in_play()==1 or GameEvents.ball_in_play()==5:
             if  player_scores[player_up - 1]<=1_000_000 and player_scores[player_up - 1]>250_000 and golf_player_complete[player_up - 1] is True:
                 #reduce score on first ball, from 1,000,000->750,000->500,00->250,000
                 player_scores[player_up - 1] -= 250_000 
@@ -454,8 +456,8 @@ def golf_hit_callback(switch_idx):
 # ============================================================================
 def limbo_run():
     global player_scores
-    player_scores = DataMapper.get_live_scores(use_format=False)
-    return DataMapper.get_game_active()
+    player_scores = GameEvents.scores()
+    return GameEvents.game_active()
 
 
 
@@ -481,10 +483,10 @@ def half_life_run():
     """Half Life run handler - reduce scores by percentage if above 10000"""
     global player_scores
 
-    current_scores = DataMapper.get_live_scores(use_format=False)
+    current_scores = GameEvents.scores()
     
-    if DataMapper.get_game_active() is True:
-        player_up = DataMapper.get_player_up()-1
+    if GameEvents.game_active() is True:
+        player_up = GameEvents.player_up()-1
         if current_scores[player_up] > 10000:           
             decay_amount = (current_scores[player_up] * score_half_life_percent) // 100
             current_scores[player_up] -= decay_amount
@@ -493,7 +495,7 @@ def half_life_run():
             DataMapper.write_live_scores(current_scores)
 
     player_scores = current_scores
-    return DataMapper.get_game_active()
+    return GameEvents.game_active()
 
 # ============================================================================
 # Longest Ball Mode Handlers
@@ -520,8 +522,8 @@ def longest_ball_run():
     global flipper_up_counter, score_static_counter, longest_ball_scores, player_game_scores
     global player_scores
 
-    player_up = DataMapper.get_player_up()
-    ball_in_play = DataMapper.get_ball_in_play()
+    player_up = GameEvents.player_up()
+    ball_in_play = GameEvents.ball_in_play()
 
     # flipper held?
     left,right = DataMapper.get_flipper_state()
@@ -531,7 +533,7 @@ def longest_ball_run():
         flipper_up_counter=0   
 
     # game score incrementing?
-    score_now = DataMapper.get_live_scores(use_format=False)
+    score_now = GameEvents.scores()
     if score_now[player_up-1] == player_game_scores[player_up-1]:
         score_static_counter += 1
     else:
@@ -544,7 +546,7 @@ def longest_ball_run():
         player_scores[player_up-1] = longest_ball_scores[ball_in_play-1][player_up-1]    
 
     #if game is ending - put the best single ball times in 
-    if DataMapper.get_game_active() is False:
+    if GameEvents.game_active() is False:
         print("FORMAT: Longest Ball scores:",longest_ball_scores)    
         # Find the highest (best) score for each player across all balls
         for player_idx in range(4):
@@ -561,9 +563,9 @@ def one_ball_run():
     one ball only - just end the game after one ball
     """
     global player_scores
-    ball_in_play = DataMapper.get_ball_in_play()
-    current_scores = DataMapper.get_live_scores(use_format=False)
-    game_active = DataMapper.get_game_active()
+    ball_in_play = GameEvents.ball_in_play()
+    current_scores = GameEvents.scores()
+    game_active = GameEvents.game_active()
     
     # Only end game if ball 1 is in play and player 1 has scored
     if ball_in_play < 5 and current_scores[0] > 0 and game_active==True:
@@ -583,7 +585,7 @@ def empty_init():
 
 def empty_run():
     """Empty run handler"""
-    return DataMapper.get_game_active()
+    return GameEvents.game_active()
 
 def empty_close():
     """Empty close handler"""
@@ -620,8 +622,9 @@ def formats_run():
     active_id = S.active_format.get("Id", 0)
     next_id = next_format.get("Id", 0) 
     if active_id != next_id:        
-        if DataMapper.get_game_active() is False and game_state==0:                   
+        if GameEvents.game_active() is False and game_state==0:                   
             S.active_format = next_format.copy()
+            DataVersion.bump("formats")
             print("FORMAT: Engage the waiting format:",S.active_format.get("Id"))
             return                        
             
@@ -630,7 +633,7 @@ def formats_run():
  
     #waiting for game to start
     if game_state == 0:
-        if DataMapper.get_game_active() is True:  #game started
+        if GameEvents.game_active() is True:  #game started
             game_state=1
             #S.gameCounter = (S.gameCounter + 1) % 100
             
@@ -657,7 +660,7 @@ def formats_run():
             game_active = handlers[HANDLER_RUN]()
         except Exception as e:
             log.log(f"FORMAT: Error running format {active_id}: {e}")
-            game_active = DataMapper.get_game_active()
+            game_active = GameEvents.game_active()
 
         if game_active is False:              
             game_state = 2
@@ -669,7 +672,7 @@ def formats_run():
         get_player_id = S.active_format.get("Options", {}).get("GetPlayerID", {}).get("Value", False)
         if get_player_id:
             GameEndCount -= 1    #wait for intials   
-            if DataMapper.get_game_active() is True:
+            if GameEvents.game_active() is True:
                    game_state = 3  
                    log.log("FORMAT: game started while waiting for intials")
             else:
@@ -775,6 +778,6 @@ def initialize():
     next_format["Name"] = "Standard"
   
     # Schedule periodic format tasks
-    from phew.server import schedule
-    schedule(formats_run, 12000, CALL_TIMER)
+    from phew.server import PRIORITY_HIGH, schedule
+    schedule(formats_run, 12000, CALL_TIMER, priority=PRIORITY_HIGH)
 
@@ -0,0 +1,105 @@
+# This file is part of the Warped Pinball SYS11Wifi Project.
+# https://creativecommons.org/licenses/by-nc/4.0/
+# This work is licensed under CC BY-NC 4.0
+"""
+    Shadow RAM to FRAM mirroring
+
+    keeps a copy of what the FRAM holds and writes back only the blocks
+    of shadow ram that changed, merged into bursts.  adjustment and
+    high score regions are checked (and written) in full on every pass,
+    the rest of shadow ram shares a per pass byte budget.
+"""
+import faults
+import SharedState as S
+import SPI_Store as fram
+import uctypes
+from FramMirror_viper import next_clean_block, next_dirty_block
+from micropython import const
+from Shadow_Ram_Definitions import SRAM_DATA_BASE, SRAM_DATA_LENGTH
+
+BLOCK_SIZE = const(16)
+BYTES_PER_PASS = const(512)  # non priority bytes written per call
+_LED_PASSES = const(128)  # heartbeat led toggles every this many full passes
+
+_live = uctypes.bytearray_at(SRAM_DATA_BASE, SRAM_DATA_LENGTH)
+_live_view = memoryview(_live)
+_mirror = None
+_mirror_view = None
+_priority = None
+_cursor = 0
+_passes = 0
+
+# bytes and bursts written since boot
+stats = {"bytes": 0, "bursts": 0}
+
+
+def init():
+    """load the mirror with what the FRAM currently holds (shadow ram offset == fram address)"""
+    global _mirror, _mirror_view
+    _mirror = bytearray(SRAM_DATA_LENGTH)
+    _mirror_view = memoryview(_mirror)
+    fram.readinto(0, _mirror)
+
+
+def _priority_ranges():
+    """block aligned (start, end) spans covering every address in the adjustment and high score definitions"""
+    ranges = []
+    for section in ("Adjustments", "HighScores"):
+        addresses = [v for k, v in S.gdata.get(section, {}).items() if k.endswith("Adr") and isinstance(v, int) and 0 <= v < SRAM_DATA_LENGTH]
+        if addresses:
+            start = min(addresses) & ~(BLOCK_SIZE - 1)
+            end = min((max(addresses) + 2 * BLOCK_SIZE) & ~(BLOCK_SIZE - 1), SRAM_DATA_LENGTH)
+            ranges.append((start, end))
+    return ranges
+
+
+def _sync(start, end, budget):
+    """write the dirty blocks of [start, end) to fram, returns (offset reached, bytes written)"""
+    written = 0
+    pos = start
+    while pos < end and written < budget:
+        pos = next_dirty_block(_live, _mirror, pos, end, BLOCK_SIZE)
+        if pos >= end:
+            break
+        stop = min(next_clean_block(_live, _mirror, pos, end, BLOCK_SIZE), pos + budget - written)
+
+        # snapshot into the mirror first, the fram then gets exactly what the mirror records
+        _mirror_view[pos:stop] = _live_view[pos:stop]
+        fram.write(pos, _mirror_view[pos:stop])
+        written += stop - pos
+        stats["bursts"] += 1
+        pos = stop
+    stats["bytes"] += written
+    return pos, written
+
+
+def sync():
+    """scheduled: mirror changed shadow ram to fram"""
+    global _cursor, _passes, _priority
+    if _mirror is None:
+        init()
+    if _priority is None and S.gdata:
+        _priority = _priority_ranges()
+
+    for start, end in _priority or ():
+        _sync(start, end, SRAM_DATA_LENGTH)
+
+    _cursor, _ = _sync(_cursor, SRAM_DATA_LENGTH, BYTES_PER_PASS)
+    if _cursor >= SRAM_DATA_LENGTH:
+        _cursor = 0
+        _passes += 1
+        if _passes % _LED_PASSES == 0:
+            print("FRAM: mirror bytes written", stats["bytes"])
+            faults.toggle_board_LED()
+
+
+def flush():
+    """write every changed block now, no budget.  called right before a reboot so nothing pending is lost"""
+    global _cursor
+    if faults.fault_is_raised(faults.ALL_HDWR):
+        # sync is not scheduled either, fram can not be trusted
+        return
+    if _mirror is None:
+        init()
+    _sync(0, SRAM_DATA_LENGTH, SRAM_DATA_LENGTH)
+    _cursor = 0
@@ -0,0 +1,45 @@
+# This file is part of the Warped Pinball SYS11Wifi Project.
+# https://creativecommons.org/licenses/by-nc/4.0/
+# This work is licensed under CC BY-NC 4.0
+"""
+    block compare helpers for FramMirror
+
+    uses viper - so isolated from FramMirror
+"""
+import micropython
+
+
+@micropython.viper
+def next_dirty_block(live: ptr8, mirror: ptr8, start: int, end: int, block: int) -> int:  # noqa: F821 (viper pointer types)
+    """offset of the first block in [start, end) that differs from the mirror, end if none"""
+    pos: int = start
+    while pos < end:
+        stop: int = pos + block
+        if stop > end:
+            stop = end
+        i: int = pos
+        while i < stop:
+            if live[i] != mirror[i]:
+                return pos
+            i += 1
+        pos = stop
+    return end
+
+
+@micropython.viper
+def next_clean_block(live: ptr8, mirror: ptr8, start: int, end: int, block: int) -> int:  # noqa: F821 (viper pointer types)
+    """offset of the first block in [start, end) that matches the mirror, end if none"""
+    pos: int = start
+    while pos < end:
+        stop: int = pos + block
+        if stop > end:
+            stop = end
+        i: int = pos
+        while i < stop:
+            if live[i] != mirror[i]:
+                break
+            i += 1
+        if i == stop:
+            return pos
+        pos = stop
+    return end
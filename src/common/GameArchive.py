@@ -0,0 +1,56 @@
+"""
+Game Archive
+    config/games.bin holds every game definition of the build as its own
+    zlib block, so one title is read by seeking to its block without
+    inflating any of the others.  definitions are precompiled: hex addresses
+    are already integers and unused keys are gone.
+
+        b"VGA1"  <H count
+        count x  <B key length, key, <I offset, <I length
+        blocks   (offsets from the start of the file)
+
+    config/catalog.json lists every game as key -> [name, rom, system, offset]
+    so games can be listed and found without touching the archive.
+
+    both written by dev/build.py (combine_json_configs)
+"""
+import json
+
+import deflate
+
+PATH = "config/games.bin"
+CATALOG_PATH = "config/catalog.json"
+
+# catalog fields
+NAME = 0
+ROM = 1
+SYSTEM = 2
+OFFSET = 3
+
+_catalog = None
+
+
+def catalog():
+    """key -> [name, rom, system, offset] for every game, read on first use and kept"""
+    global _catalog
+    if _catalog is None:
+        with open(CATALOG_PATH) as f:
+            _catalog = json.load(f)
+    return _catalog
+
+
+def release():
+    """drop the kept catalog, it is read again the next time it is needed"""
+    global _catalog
+    _catalog = None
+
+
+def load(key):
+    """parsed definition for key, None if the archive does not hold it"""
+    entry = catalog().get(key)
+    if entry is None:
+        return None
+    with open(PATH, "rb") as f:
+        f.seek(entry[OFFSET])
+        with deflate.DeflateIO(f, deflate.ZLIB, 8) as block:
+            return json.load(block)
@@ -0,0 +1,105 @@
+"""
+Game Events
+    the shadow ram fields every game poller watches are sampled here once per
+    tick instead of by each poller on its own.  GameStatus.poll_fast runs
+    sample() every 250ms, everything else reads the snapshot (game_active(),
+    ball_in_play(), player_up(), scores()) and subscribes to the changes it
+    acts on:
+
+        GAME_START / GAME_END   game active flag changed
+        BALL                    ball in play changed (0 = no game)
+        PLAYER_UP               player up changed
+        SCORES                  a live score changed, scores are only sampled around a game
+
+    subscribers are called as callback(event, value) after the whole snapshot
+    is updated, so a callback sees every field of the same sample.  the first
+    sample only sets the baseline and publishes nothing.
+"""
+import DataMapper
+import SharedState as S
+from logger import logger_instance
+
+log = logger_instance
+
+GAME_START = "game_start"
+GAME_END = "game_end"
+BALL = "ball"
+PLAYER_UP = "player_up"
+SCORES = "scores"
+
+_subscribers = {}
+
+_sampled = False
+_active = False
+_ball = 0
+_player = 0
+_scores = [0, 0, 0, 0]
+
+
+def subscribe(event, callback):
+    callbacks = _subscribers.setdefault(event, [])
+    if callback not in callbacks:
+        callbacks.append(callback)
+
+
+def unsubscribe(event, callback):
+    callbacks = _subscribers.get(event)
+    if callbacks and callback in callbacks:
+        callbacks.remove(callback)
+
+
+def _publish(event, value):
+    for callback in _subscribers.get(event, ()):
+        try:
+            callback(event, value)
+        except Exception as e:
+            log.log(f"EVENTS: Error in {event} subscriber: {e}")
+
+
+def sample():
+    """read the watched fields once and publish what changed since the last sample"""
+    global _sampled, _active, _ball, _player, _scores
+
+    active = DataMapper.get_game_active()
+    ball = DataMapper.get_ball_in_play()
+    player = DataMapper.get_player_up()
+
+    # scores only move during a game, the sample after it ends keeps the final ones
+    scores = _scores
+    if (active or ball or _active or _ball or not _sampled) and "InPlay" in S.gdata:
+        scores = DataMapper.get_live_scores(use_format=False)
+
+    baseline = not _sampled
+    was_active, last_ball, last_player, last_scores = _active, _ball, _player, _scores
+    _active, _ball, _player, _scores = active, ball, player, scores
+    _sampled = True
+    if baseline:
+        return
+
+    if active != was_active:
+        _publish(GAME_START if active else GAME_END, active)
+    if ball != last_ball:
+        _publish(BALL, ball)
+    if player != last_player:
+        _publish(PLAYER_UP, player)
+    if scores is not last_scores and scores != last_scores:
+        _publish(SCORES, list(scores))
+
+
+def game_active():
+    return _active if _sampled else DataMapper.get_game_active()
+
+
+def ball_in_play():
+    return _ball if _sampled else DataMapper.get_ball_in_play()
+
+
+def player_up():
+    return _player if _sampled else DataMapper.get_player_up()
+
+
+def scores():
+    """live scores (no format applied) from the last sample, so up to one poll_fast period (250ms) old.
+    a copy the caller may change, shadow ram is only read directly before the first sample
+    """
+    return list(_scores) if _sampled else DataMapper.get_live_scores(use_format=False)
@@ -3,9 +3,12 @@
 import time
 
 import DataMapper
+import GameEvents
 import SharedState as S
 from logger import logger_instance
 from origin import push_game_state
+from phew.sse import EventStream
+from ujson import dumps as json_dumps
 
 log = logger_instance
 
@@ -18,6 +21,10 @@ S.game_status["poll_state"] = 0
 # from web request rate and avoiding per-request allocations (GC pressure).
 _last_report = None
 
+# /api/game/stream clients, sent the report only when it changes.  encoded once for all of them
+stream = EventStream()
+_last_streamed = None
+
 
 def cached_report():
     """Return the most recent game report from poll_fast.
@@ -30,6 +37,25 @@ def cached_report():
     return _last_report
 
 
+def _stream_report(report, force=False):
+    global _last_streamed
+    if not (stream.clients or force):
+        # nobody listening, skip the encode
+        _last_streamed = None
+        return
+    data = json_dumps(report)
+    if data != _last_streamed:
+        _last_streamed = data
+        stream.publish(data)
+
+
+def game_stream():
+    """EventStream of game reports, brought up to date for a new client"""
+    if not stream.clients:
+        _stream_report(cached_report(), force=True)
+    return stream
+
+
 def game_report():
     """Generate a report of the current game status, return dict"""
 
@@ -58,18 +84,21 @@ def game_report():
 # this is called at 4 calls per second
 def poll_fast():
     """
-    Poll for game start and end time.
+    Sample the game fields for everyone (GameEvents), then
+    poll for game start and end time.
     """
+    GameEvents.sample()
+
     ps = S.game_status["poll_state"]
     if ps == 0:
         S.game_status["game_active"] = False
-        if DataMapper.get_ball_in_play() != 0:
+        if GameEvents.ball_in_play() != 0:
             S.game_status["time_game_start"] = time.ticks_ms()
             S.game_status["game_active"] = True
             print("GSTAT: start game @ time=", S.game_status["time_game_start"])
             S.game_status["poll_state"] = 1
     elif ps == 1:
-        if DataMapper.get_ball_in_play() == 0:
+        if GameEvents.ball_in_play() == 0:
             S.game_status["time_game_end"] = time.ticks_ms()
             print("GSTAT: end game @ time=", S.game_status["time_game_end"])
             S.game_status["game_active"] = False
@@ -80,3 +109,4 @@ def poll_fast():
     global _last_report
     _last_report = game_report()
     push_game_state(_last_report)
+    _stream_report(_last_report)
@@ -0,0 +1,47 @@
+"""
+JSON Stream
+    encode a large response as a generator of small byte chunks so it is
+    never held as one big string.  containers down to `depth` are walked,
+    anything deeper (a record) is encoded on its own with ujson.  pieces
+    are batched up to CHUNK_SIZE before they are handed to the socket.
+
+    routes return  stream(value), 200, "application/json"
+"""
+from ujson import dumps
+
+CHUNK_SIZE = 512
+
+
+def _parts(value, depth):
+    if depth <= 0 or isinstance(value, (str, int, float, bool)) or value is None:
+        yield dumps(value)
+    elif isinstance(value, dict):
+        sep = "{"
+        for key, item in value.items():
+            yield sep + dumps(str(key)) + ":"
+            yield from _parts(item, depth - 1)
+            sep = ","
+        yield "}" if sep == "," else "{}"
+    else:
+        # lists, tuples and generators
+        sep = "["
+        for item in value:
+            yield sep
+            yield from _parts(item, depth - 1)
+            sep = ","
+        yield "]" if sep == "," else "[]"
+
+
+def stream(value, depth=1, chunk_size=CHUNK_SIZE):
+    """generator of utf-8 chunks that together are the json for value"""
+    pending = []
+    size = 0
+    for part in _parts(value, depth):
+        pending.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield "".join(pending).encode()
+            pending = []
+            size = 0
+    if pending:
+        yield "".join(pending).encode()
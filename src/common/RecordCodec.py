@@ -0,0 +1,130 @@
+"""
+Record Codec
+    table driven pack / unpack for the SPI_DataStore records.
+
+    one layout table is shared by every SPI_DataStore variant (WPC and Data East
+    only change the score width and the names of two extras flags).  compile()
+    attaches a Codec to each memory_map entry.  a codec owns one preallocated
+    buffer, records are packed into it with struct.pack_into and fram reads land
+    in it directly, single fields can be decoded without building the whole dict.
+"""
+import struct
+
+# extras "enable" word, bit 0 upwards
+EXTRAS_FLAGS = ("enter_initials_on_game", "claim_scores", "show_ip_address", "tournament_mode", "flag5", "flag6")
+WPC_EXTRAS_FLAGS = ("enter_initials_on_game", "claim_scores", "show_ip_address", "tournament_mode", "WPCTimeOn", "MM_Always")
+
+_INT = 0
+_STR = 1
+_LIST = 2
+
+
+def layouts(score="I"):
+    """(fields, fallback) per structure.  fields are (name, struct code), fallback is returned when a record will not decode"""
+    return {
+        "MapVersion": ((("version", "16s"),), None),
+        "names": ((("initials", "3s"), ("full_name", "16s")), {"initials": " ", "full_name": " "}),
+        "leaders": ((("initials", "3s"), ("full_name", "16s"), ("date", "10s"), ("score", score)), None),
+        "tournament": ((("initials", "3s"), ("score", score), ("game", "B"), ("index", "B")), None),
+        "individual": ((("score", score), ("date", "10s")), {"score": 1, "date": "9"}),
+        "configuration": ((("ssid", "32s"), ("password", "32s"), ("gamename", "16s"), ("Gpassword", "16s")), None),
+        "extras": (
+            (("enable", "I"), ("other", "I"), ("lastIP", "20s"), ("message", "20s")),
+            {"enable": 5, "other": 1, "lastIP": "none", "message": "none", "enter_initials_on_game": True, "claim_scores": False, "show_ip_address": True, "tournament_mode": False},
+        ),
+        "switches": ((("switches", "72B"),), {"switches": [0] * 72}),
+    }
+
+
+class Codec:
+    def __init__(self, fields, fallback=None, flags=None):
+        self.names = tuple(name for name, _ in fields)
+        self.fields = {}
+        offset = 0
+        for name, code in fields:
+            fmt = "<" + code
+            size = struct.calcsize(fmt)
+            kind = _STR if code.endswith("s") else (_LIST if len(code) > 1 else _INT)
+            self.fields[name] = (offset, fmt, kind, size)
+            offset += size
+        self.length = offset
+        self.buf = bytearray(offset)
+        self.view = memoryview(self.buf)
+        self.fallback = fallback
+        # flag name -> bit, carried in the "enable" field
+        self.flags = {flag: 1 << bit for bit, flag in enumerate(flags)} if flags else None
+
+    def _enable(self, record):
+        enable = record.get("enable")
+        if enable is not None:
+            return enable
+        enable = 0
+        for flag, bit in self.flags.items():
+            if record.get(flag, True):
+                enable |= bit
+        return enable
+
+    def pack(self, record):
+        """pack record into the codec buffer, returns a view of it (valid until the next pack or read)"""
+        buf = self.buf
+        for name in self.names:
+            offset, fmt, kind, size = self.fields[name]
+            if self.flags and name == "enable":
+                value = self._enable(record)
+            elif kind == _LIST:
+                value = record.get(name) or bytes(size)
+            else:
+                value = record[name]
+
+            if kind == _STR:
+                struct.pack_into(fmt, buf, offset, value.encode() if isinstance(value, str) else value)
+            elif kind == _LIST:
+                struct.pack_into(fmt, buf, offset, *value)
+            else:
+                struct.pack_into(fmt, buf, offset, value)
+        return self.view
+
+    def field(self, name, buf=None):
+        """decode one field (or one extras flag) without building the record"""
+        if buf is None:
+            buf = self.buf
+        if self.flags and name in self.flags:
+            return bool(self.field("enable", buf) & self.flags[name])
+        offset, fmt, kind, size = self.fields[name]
+        if kind == _STR:
+            return bytes(buf[offset : offset + size]).decode().strip("\0")
+        if kind == _LIST:
+            return list(struct.unpack_from(fmt, buf, offset))
+        return struct.unpack_from(fmt, buf, offset)[0]
+
+    def unpack(self, buf=None):
+        """decode a whole record (from buf or the codec buffer) into a new dict"""
+        if buf is None:
+            buf = self.buf
+        record = {}
+        for name in self.names:
+            if self.flags and name == "enable":
+                enable = self.field(name, buf)
+                for flag, bit in self.flags.items():
+                    record[flag] = bool(enable & bit)
+            else:
+                record[name] = self.field(name, buf)
+        return record
+
+    def default(self):
+        """fresh copy of the fallback record"""
+        if self.fallback is None:
+            return None
+        return {k: (list(v) if isinstance(v, list) else v) for k, v in self.fallback.items()}
+
+
+def compile(memory_map, score="I", flags=EXTRAS_FLAGS):
+    """attach a codec to every memory_map entry with a known layout"""
+    for name, (fields, fallback) in layouts(score).items():
+        if name in memory_map:
+            if name == "extras":
+                fallback = dict(fallback)
+                for flag in flags:
+                    fallback.setdefault(flag, False)
+            memory_map[name]["codec"] = Codec(fields, fallback, flags if name == "extras" else None)
+    return memory_map
@@ -29,10 +29,15 @@ STATUS_REG_VAL = 0x82  # wrill write this val i
 cs = machine.Pin(5, machine.Pin.OUT)
 cs.value(1)
 
+# SPI clock: start at a rate every board tolerates, then step up (see negotiate_baudrate)
+BASE_BAUDRATE = 1000000
+FAST_BAUDRATES = (20000000, 10000000, 5000000)
+baudrate = BASE_BAUDRATE
+
 # Initialize SPI Port
 spi = machine.SPI(
     0,
-    baudrate=1000000, 
+    baudrate=BASE_BAUDRATE,
     polarity=1,
     phase=1,
     bits=8,
@@ -42,13 +47,16 @@ spi = machine.SPI(
     miso=machine.Pin(4),
 )
 
+# preallocated command buffers, reused by every transfer
+_cmd = bytearray(1)
+_hdr = bytearray(3)
+
 
 # FRAM write just one byte cmd
 def reg_cmd(spi, cs, reg):
-    msg = bytearray()
-    msg.append(0x00 | reg)
+    _cmd[0] = reg
     cs.value(0)
-    spi.write(msg)
+    spi.write(_cmd)
     cs.value(1)
 
 
@@ -62,30 +70,26 @@ def reg_write(spi, cs, reg, data):
     cs.value(1)
 
 
-# FRAM
+def _set_header(opcode, address):
+    _hdr[0] = opcode
+    _hdr[1] = (address & 0xFF00) >> 8
+    _hdr[2] = address & 0x00FF
+
+
+# FRAM burst write
 def mem_write(spi, cs, address, data):
+    """write any length in a single CS transaction.
+    FRAM has no page boundaries, the address auto increments for the whole burst.
+    data can be bytes, bytearray or memoryview (no copy is made)
+    """
     # Enable write operations
     reg_cmd(spi, cs, OPCODE_WREN)
 
-    # Split data into chunks of 16 bytes
-    chunk_size = 16
-    for i in range(0, len(data), chunk_size):
-        # print("x",i)
-        chunk = data[i : i + chunk_size]
-        # print(chunk)
-        reg_cmd(spi, cs, OPCODE_WREN)
-
-        msg = bytearray()
-        msg.append(0x00 | OPCODE_WRITE)
-        msg.append((address & 0xFF00) >> 8)
-        msg.append(address & 0x00FF)
-        msg.extend(chunk)
-        # print(msg)
-
-        cs.value(0)
-        spi.write(msg)
-        cs.value(1)
-        address += chunk_size
+    _set_header(OPCODE_WRITE, address)
+    cs.value(0)
+    spi.write(_hdr)
+    spi.write(data)
+    cs.value(1)
 
 
 # FRAM
@@ -93,31 +97,20 @@ def write(address, data):
     mem_write(spi, cs, address, data)
 
 
+# FRAM burst read into a caller supplied buffer
+def mem_readinto(spi, cs, address, buf):
+    """fill buf (bytearray or memoryview) from address in a single CS transaction"""
+    _set_header(OPCODE_READ, address)
+    cs.value(0)
+    spi.write(_hdr)
+    spi.readinto(buf)
+    cs.value(1)
+
+
 # FRAM
 def mem_read(spi, cs, address, nbytes):
-    data = bytearray()
-    chunk_size = 16
-    offset = 0
-
-    while offset < nbytes:
-        remaining = nbytes - offset
-        read_size = min(chunk_size, remaining)
-
-        # Prepare the message
-        msg = bytearray()
-        msg.append(OPCODE_READ)
-        msg.append((address & 0xFF00) >> 8)
-        msg.append(address & 0x00FF)
-
-        # Send the message and read the data
-        cs.value(0)
-        spi.write(msg)
-        data.extend(spi.read(read_size))
-        cs.value(1)
-
-        # Update the address and offset for the next chunk
-        address += chunk_size
-        offset += chunk_size
+    data = bytearray(nbytes)
+    mem_readinto(spi, cs, address, data)
     return data
 
 
@@ -126,6 +119,12 @@ def read(address, nbytes):
     return mem_read(spi, cs, address, nbytes)
 
 
+# FRAM
+def readinto(address, buf):
+    mem_readinto(spi, cs, address, buf)
+    return buf
+
+
 # FRAM read a register
 def reg_read(spi, cs, reg, nbytes=1):
     msg = bytearray()
@@ -147,11 +146,7 @@ def rbit8(v):
 
 # FRAM restore ram from fram (called generally at power up)
 def Restore_Mem(ram_address, byte_length):
-    for st in range(0, byte_length, 16):
-        dat = mem_read(spi, cs, st, 16)
-        # print("restore rd ",st," ",ram_address[st])
-        for index in range(0, 16, 1):
-            ram_address[index + st] = dat[index]
+    mem_readinto(spi, cs, 0, memoryview(ram_address)[:byte_length])
 
 
 # FRAM write 16 bytes ram to fram - NO DMA Usage
@@ -164,14 +159,42 @@ def write_16_fram(ram_address, fram_address):
 
 # FRAM
 def write_all_fram_now():
-    MemIndex = 0
-    while True:
-        write_16_fram(SRAM_DATA_BASE + MemIndex, MemIndex)
-        MemIndex = MemIndex + 16
-        # print(".",end="")
-        if MemIndex >= SRAM_DATA_LENGTH:
-            print("FRAM: complete store done")
-            return
-
-
-
+    mem_write(spi, cs, 0, uctypes.bytearray_at(SRAM_DATA_BASE, SRAM_DATA_LENGTH))
+    print("FRAM: complete store done")
+
+
+# FRAM clock speed
+def negotiate_baudrate(probe_address=0x7FC0, probe_length=64):
+    """raise the SPI clock to the fastest rate that reads back identical to the base rate.
+    read only probe (top of the data store), so nothing in the FRAM is disturbed
+    """
+    global baudrate
+    spi.init(baudrate=BASE_BAUDRATE)
+    reference = mem_read(spi, cs, probe_address, probe_length)
+    probe = bytearray(probe_length)
+
+    # a blank (uniform) part can not tell a good read from a shifted one, stay slow until initialized
+    if len(set(reference)) < 2:
+        baudrate = BASE_BAUDRATE
+        return BASE_BAUDRATE
+
+    for rate in FAST_BAUDRATES:
+        spi.init(baudrate=rate)
+        ok = True
+        for _ in range(3):
+            mem_readinto(spi, cs, probe_address, probe)
+            if probe != reference:
+                ok = False
+                break
+        if ok:
+            baudrate = rate
+            print("FRAM: SPI baudrate", rate)
+            return rate
+
+    spi.init(baudrate=BASE_BAUDRATE)
+    baudrate = BASE_BAUDRATE
+    print("FRAM: SPI baudrate fallback", BASE_BAUDRATE)
+    return BASE_BAUDRATE
+
+
+negotiate_baudrate()
@@ -0,0 +1,152 @@
+"""
+Score Index
+    resident copies of the leaders, tournament and names boards.
+    loaded from fram once (initialize_leaderboard), every change goes through put/store
+    so the copy always matches fram and read endpoints never touch the SPI bus.
+    list index == fram record index
+
+    names also get an initials -> player id lookup for score attribution,
+    and each player's best individual score is kept in a small table
+
+    individual sets are not resident, store_set() takes the list as it was read
+    and writes back only the slots that changed after an insert or delete
+"""
+
+import DataVersion
+import SPI_DataStore as DataStore
+
+_boards = {}
+_players = None
+_bests = None  # per player id: (score, date) or None
+
+
+def load(name):
+    """(re)read a whole board from fram"""
+    _boards[name] = [DataStore.read_record(name, i) for i in range(DataStore.memory_map[name]["count"])]
+    if name == "names":
+        _index_players()
+    return _boards[name]
+
+
+def board(name):
+    """resident list for a board, loaded on first use.  read only - copy records before changing them"""
+    records = _boards.get(name)
+    if records is None:
+        records = load(name)
+    return records
+
+
+def _normal(name, record):
+    # round trip through the codec so a record compares equal to what fram holds (no extra keys, truncated strings)
+    return DataStore.deserialize(DataStore.serialize(record, name), name)
+
+
+def put(name, index, record):
+    """write one record through to fram, only if it differs from what is stored.  returns True if written"""
+    records = board(name)
+    record = _normal(name, record)
+    if records[index] == record:
+        return False
+    DataStore.write_record(name, record, index)
+    records[index] = record
+    DataVersion.bump(name)
+    if name == "names":
+        _index_players()
+    return True
+
+
+def store(name, records):
+    """write a full board, only the slots that changed reach fram.  returns the number of records written"""
+    written = 0
+    for index, record in enumerate(records):
+        if put(name, index, record):
+            written += 1
+    return written
+
+
+def store_set(name, old, new, set=0):
+    """write a non resident list (an individual set), old is the list as read from fram.
+    only slots that differ reach fram.  returns the number of records written
+    """
+    written = 0
+    for index, record in enumerate(new):
+        record = _normal(name, record)
+        if index < len(old) and old[index] == record:
+            continue
+        DataStore.write_record(name, record, index, set)
+        written += 1
+    if written:
+        DataVersion.bump(name)
+    return written
+
+
+def invalidate(name=None):
+    """drop resident copies after fram was changed behind our back (blankStruct)"""
+    global _players, _bests
+    DataVersion.bump(name)
+    if name is None:
+        _boards.clear()
+    else:
+        _boards.pop(name, None)
+    if name in (None, "names"):
+        _players = None
+    if name in (None, "individual"):
+        _bests = None
+
+
+def _index_players():
+    global _players
+    _players = {}
+    for index, record in enumerate(board("names")):
+        initials = record.get("initials") if record else None
+        # first match wins, same as the old linear scan
+        if initials and initials not in _players:
+            _players[initials] = index
+    return _players
+
+
+def find_player(initials):
+    """(full name, player id) registered with these initials, ("", -1) if none"""
+    if not initials:
+        return ("", -1)
+    players = _players if _players is not None else _index_players()
+    index = players.get(initials)
+    if index is None:
+        return ("", -1)
+    return (board("names")[index]["full_name"].strip("\x00"), index)
+
+
+def personal_bests():
+    """best individual score per player id, (score, date) or None.
+    individual sets are kept sorted high to low, so only record 0 of each set is read (once)
+    """
+    global _bests
+    if _bests is None:
+        # building the table changes no data, so no version bump (a tag computed before this stays valid)
+        _bests = [_best(DataStore.read_record("individual", 0, player_id)) for player_id in range(DataStore.memory_map["individual"]["sets"])]
+    return _bests
+
+
+def _best(record):
+    if record and record.get("score", 0) > 0:
+        return (record["score"], record["date"].strip().replace("\x00", " "))
+    return None
+
+
+def set_best(player_id, record):
+    """record the new top of a players individual set (None or a zero score clears it).
+    bumps the individual version only if the best changed, the fram write bumped it already otherwise
+    """
+    if _bests is None:
+        # built on first read, which picks this up from fram
+        return
+    best = _best(record)
+    if _bests[player_id] != best:
+        _bests[player_id] = best
+        DataVersion.bump("individual")
+
+
+def clear_set(player_id):
+    """a players individual set was blanked in fram directly (blankIndPlayerScores), nothing bumped for the writes"""
+    DataVersion.bump("individual")
+    set_best(player_id, None)
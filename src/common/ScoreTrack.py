@@ -8,7 +8,9 @@ Score Track
 """
 import displayMessage
 import SharedState as S
-import DataMapper
+import GameEvents
+import ScoreIndex
+import Settings
 import SPI_DataStore as DataStore
 from logger import logger_instance
 from machine import RTC
@@ -42,7 +44,7 @@ def reset_scores():
 
 def get_claim_score_list():
     result = []
-    if DataStore.read_record("extras", 0)["claim_scores"] is True:
+    if Settings.get().claim_scores is True:
         for game in recent_scores[:4]:
             # if there are any unclaimed non zero scores, add them to the list
             if any(score[0] == "" and score[1] != 0 for score in game[1:]):
@@ -63,7 +65,7 @@ def claim_score(initials, player_index, score):
             log.log(f"SCORE: claim new score: {initials}, {score}, {game_index}, {player_index}")
             recent_scores[game_index][player_index + 1] = (initials, score)
             new_score = {"initials": initials, "full_name": None, "score": score, "game": game[0]}
-            if DataStore.read_record("extras", 0)["tournament_mode"]:
+            if Settings.get().tournament_mode:
                 update_tournament(new_score)
             else:
                 update_leaderboard(new_score)
@@ -79,9 +81,10 @@ def _place_game_in_claim_list(game):
     print("SCORE: add to claims list: ", recent_scores)
 
 
-def _read_machine_score(HighScores):
+def _read_machine_score(HighScores, in_play=None):
     """read machine scores
     and if HighScores is True try to get intials from highscore area
+    in_play: the four in-play scores if already known (kept from the end of the game), else read from shadow ram
     """
     high_scores = [["", 0], ["", 0], ["", 0], ["", 0]]
     in_play_scores = [["", 0], ["", 0], ["", 0], ["", 0]]
@@ -90,6 +93,9 @@ def _read_machine_score(HighScores):
     try:
         if S.gdata["InPlay"]["Type"] == 1:
             for idx in range(4):
+                if in_play is not None:
+                    in_play_scores[idx][1] = in_play[idx]
+                    continue
                 score_start = S.gdata["InPlay"]["ScoreAdr"] + idx * 4
                 in_play_score_bytes = shadowRam[score_start : score_start + 4]
                 in_play_scores[idx][1] = _bcd_to_int(in_play_score_bytes)
@@ -223,7 +229,7 @@ def place_machine_scores():
 
 def _remove_machine_scores():
     """remove machine scores"""
-    if S.gdata["HighScores"]["Type"] == 1 and DataStore.read_record("extras", 0)["enter_initials_on_game"]:  # system 11 type 1
+    if S.gdata["HighScores"]["Type"] == 1 and Settings.get().enter_initials_on_game:  # system 11 type 1
         log.log("SCORE: Remove machine scores type 1")
         for index in range(4):
             score_start = S.gdata["HighScores"]["ScoreAdr"] + index * 4
@@ -234,7 +240,7 @@ def _remove_machine_scores():
                 shadowRam[initial_start + i] = 0x3F  # intials
             shadowRam[score_start + 2] = 5 - index
 
-    elif S.gdata["HighScores"]["Type"] == 3 and DataStore.read_record("extras", 0)["enter_initials_on_game"]:  # system 11, type 3
+    elif S.gdata["HighScores"]["Type"] == 3 and Settings.get().enter_initials_on_game:  # system 11, type 3
         log.log("SCORE: Remove machine scores type 3")
         for index in range(4):
             score_start = S.gdata["HighScores"]["ScoreAdr"] + index * 4
@@ -252,18 +258,8 @@ def _remove_machine_scores():
 
 
 def find_player_by_initials(new_entry):
-    """find players name from list of intials with names from storage"""
-    findInitials = new_entry["initials"]
-    if findInitials == "" or findInitials is None:
-        return ("", -1)
-    count = DataStore.memory_map["names"]["count"]
-    for index in range(count):
-        rec = DataStore.read_record("names", index)
-        if rec is not None:
-            if rec["initials"] == findInitials:
-                player_name = rec["full_name"].strip("\x00")
-                return (player_name, index)
-    return ("", -1)
+    """find players name from list of intials with names from storage (resident initials index)"""
+    return ScoreIndex.find_player(new_entry["initials"])
 
 
 def update_individual_score(new_entry):
@@ -288,13 +284,14 @@ def update_individual_score(new_entry):
     for i in range(num_scores):
         scores.append(DataStore.read_record("individual", i, playernum))
 
+    stored = list(scores)
     scores.append(new_entry)
     scores.sort(key=lambda x: x["score"], reverse=True)
     scores = scores[:num_scores]
 
-    # Save the updated scores
-    for i in range(num_scores):
-        DataStore.write_record("individual", scores[i], i, playernum)
+    # Save the updated scores, only the slots at and below the new entry moved
+    ScoreIndex.store_set("individual", stored, scores, playernum)
+    ScoreIndex.set_best(playernum, scores[0])
 
     print(f"Updated scores for {initials}")
     return True
@@ -325,15 +322,15 @@ def update_leaderboard(new_entry):
         if new_entry["full_name"] is None:
             new_entry["full_name"] = ""
 
-    # Load scores
-    top_scores = [DataStore.read_record("leaders", i) for i in range(DataStore.memory_map["leaders"]["count"])]
+    # working copy of the resident board
+    top_scores = [dict(entry) for entry in ScoreIndex.board("leaders")]
 
     # if matches a record without initials in top_scores (score claim) - just add initials
     for entry in top_scores:
         if entry["initials"] == "" and entry["score"] == new_entry["score"]:
             entry["initials"] = new_entry["initials"]
             entry["full_name"] = new_entry["full_name"]
-            DataStore.write_record("leaders", entry, top_scores.index(entry))
+            ScoreIndex.put("leaders", top_scores.index(entry), entry)
             return True
 
     # Check if the score already exists in the top_scores list
@@ -346,8 +343,8 @@ def update_leaderboard(new_entry):
 
     count = DataStore.memory_map["leaders"]["count"]
     top_scores = top_scores[:count]
-    for i in range(count):
-        DataStore.write_record("leaders", top_scores[i], i)
+    # only the slots that moved are written
+    ScoreIndex.store("leaders", top_scores)
 
     return True
 
@@ -359,18 +356,20 @@ def initialize_leaderboard():
 
     # init gameCounter, find highest # in tournament board
     n = 0
-    for i in range(DataStore.memory_map["tournament"]["count"]):
+    for i, rec in enumerate(ScoreIndex.load("tournament")):
         try:
-            game_value = DataStore.read_record("tournament", i)["game"]
+            game_value = rec["game"]
             n = max(game_value, n)
         except (KeyError, TypeError):
             log.log(f"SCORE: Error reading game value at index {i}")
             continue
     S.gameCounter = n
 
+    # names and the initials -> player lookup
+    ScoreIndex.load("names")
+
     # load up top scores from fram
-    count = DataStore.memory_map["leaders"]["count"]
-    top_scores = [DataStore.read_record("leaders", i) for i in range(count)]
+    top_scores = [dict(entry) for entry in ScoreIndex.load("leaders")]
 
 
 def check_for_machine_high_scores():
@@ -396,8 +395,8 @@ def update_tournament(new_entry):
         return False
 
     count = DataStore.memory_map["tournament"]["count"]
-    rec = DataStore.read_record("tournament", 0)
-    nextIndex = rec["index"]
+    tournament = ScoreIndex.board("tournament")
+    nextIndex = tournament[0]["index"]
 
     # check for a match in the tournament board, for Claim Score function
     #   look back 6 games x 4 scores = 24 places for a match
@@ -407,30 +406,44 @@ def update_tournament(new_entry):
             ind = nextIndex - 1 - i
             if ind < 0:
                 ind += count
-            rec = DataStore.read_record("tournament", ind)
+            rec = tournament[ind]
             if rec["game"] == new_entry["game"] and rec["score"] == new_entry["score"]:
+                rec = dict(rec)
                 rec["initials"] = new_entry["initials"]
-                DataStore.write_record("tournament", rec, ind)
+                ScoreIndex.put("tournament", ind, rec)
         return
 
     new_entry["game"] = S.gameCounter
     new_entry["full_name"] = ""
     new_entry["index"] = nextIndex
-    DataStore.write_record("tournament", new_entry, nextIndex)
+    ScoreIndex.put("tournament", nextIndex, new_entry)
     log.log(f"SCORE: tournament new score {new_entry}")
 
     nextIndex += 1
     if nextIndex >= count:
         nextIndex = 0
-    rec = DataStore.read_record("tournament", 0)
+    rec = dict(tournament[0])
     rec["index"] = nextIndex
-    DataStore.write_record("tournament", rec, 0)
+    ScoreIndex.put("tournament", 0, rec)
     return
 
 
+# set by GameEvents when ball in play drops to 0, so a game end between two checks is not missed.
+# the in-play scores are kept from that sample, a new game may have reset them by the next check
+_game_ended = False
+_final_scores = None
+
+
+def _on_ball(event, ball):
+    global _game_ended, _final_scores
+    if ball == 0:
+        _game_ended = True
+        _final_scores = GameEvents.scores()
+
+
 def CheckForNewScores(nState=[0]):
     """called by scheduler every 5 seconds"""
-    global nGameIdleCounter, push_game_count, last_pushed_game
+    global nGameIdleCounter, push_game_count, last_pushed_game, _game_ended
 
     if push_game_count>0:
         from origin import push_end_of_game
@@ -441,14 +454,15 @@ def CheckForNewScores(nState=[0]):
 
     if nState[0] == 0:  # power up init
         displayMessage.refresh_9()
-        if DataStore.read_record("extras", 0)["show_ip_address"] is False or S.gdata["HighScores"]["Type"] in [1, 2, 3]:
+        if Settings.get().show_ip_address is False or S.gdata["HighScores"]["Type"] in [1, 2, 3]:
             place_machine_scores()
+        GameEvents.subscribe(GameEvents.BALL, _on_ball)
         nState[0] = 1
 
     if S.gdata["BallInPlay"]["Type"] in [2,3]: 
 
 
-        print(" BALL IN PLAY:",DataMapper.get_ball_in_play())
+        print(" BALL IN PLAY:",GameEvents.ball_in_play())
 
         if nState[0] == 1:  # waiting for a game to start
 
@@ -465,29 +479,31 @@ def CheckForNewScores(nState=[0]):
                 print("SCORE: game list 10 minute expire")
 
             print("SCORE: game start check ", nGameIdleCounter)
-            if  DataMapper.get_game_active() == True:
+            if  GameEvents.game_active() == True:
                 nState[0] = 2
                 # Game Started!
                 log.log("SCORE: Game Started")
                 nGameIdleCounter = 0
+                _game_ended = False
                 _remove_machine_scores()
 
         elif nState[0] == 2:  # waiting for game to end
             print("SCORE: game end check")
             #if  DataMapper.get_game_active() == False:
-            if DataMapper.get_ball_in_play() == 0:
+            if _game_ended:
                 # game over, get new scores
+                _game_ended = False
                 nState[0] = 1
-                if (S.gdata["HighScores"]["Type"] == 9) or (DataStore.read_record("extras", 0)["enter_initials_on_game"] is False):
+                if (S.gdata["HighScores"]["Type"] == 9) or (Settings.get().enter_initials_on_game is False):
                     # in play scores
                     log.log("SCORE: end, use in-play scores")
-                    scores = _read_machine_score(False)
+                    scores = _read_machine_score(False, _final_scores)
                 else:
                     # high scores
                     log.log("SCORE: end, use high scores")
-                    scores = _read_machine_score(True)
+                    scores = _read_machine_score(True, _final_scores)
 
-                if DataStore.read_record("extras", 0)["tournament_mode"]:
+                if Settings.get().tournament_mode:
                     for i in range(0, 4):
                         update_tournament({"initials": scores[i][0], "score": scores[i][1]})
                 else:
@@ -3,6 +3,7 @@ Score Track Common
     Score Track Logic that is the same between system versions
 """
 
+import ScoreIndex
 import SPI_DataStore as DataStore
 from logger import logger_instance as log
 
@@ -51,9 +52,12 @@ def remove_score_entry(initials, score, list="leaders"):
 
     # Look for record in top scores and wipe it
     count = DataStore.memory_map[list]["count"]
-    list_scores = []  # [DataStore.read_record(list, i, data_set) for i in range(count)]
+    # leaders and tournament live in ram, individual sets are read from fram
+    resident = None if list == "individual" else ScoreIndex.board(list)
+    stored = resident if resident else [DataStore.read_record(list, i, data_set) for i in range(count)]
+    list_scores = []
     for i in range(count):
-        entry = DataStore.read_record(list, i, data_set)
+        entry = dict(stored[i])
         if list == "leaders":
             if entry["initials"] == initials and entry["score"] == score:
                 log.log(f"SCORE: Deleting from '{list}' {entry}")
@@ -78,27 +82,19 @@ def remove_score_entry(initials, score, list="leaders"):
 
         list_scores.append(entry)
 
-    # Sort and prune the list before saving again.
+    if list == "tournament":
+        # tournament is a ring (record 0 "index" holds the next slot to write), blank in place
+        # so nothing moves and only the deleted slots are written
+        ScoreIndex.store(list, list_scores)
+        return
+
+    # Sort and prune the list before saving again, only slots that moved are written
     list_scores.sort(key=lambda x: x["score"], reverse=True)
     list_scores = list_scores[:count]
-    next_index = None
-    for i in range(count):
-        if list == "tournament":
-            # Re-index tournament scores as we write. Index 0 Holds the next index
-            print(f"Writing '{list}' record... at ", i)
-            list_scores[i]["index"] = i
-            print(list_scores[i])
-            print(data_set)
-            next_index = i + 1
-
-        DataStore.write_record(list, list_scores[i], i, data_set)
-
-    # If next index was set, set it at the 0 slot (Only for tournament)
-    if next_index != None:
-        if next_index >= count:
-            next_index = 0
-        rec = DataStore.read_record(list, 0, data_set)
-        rec["index"] = next_index
-        DataStore.write_record(list, rec, 0, data_set)
+    if resident:
+        ScoreIndex.store(list, list_scores)
+    else:
+        ScoreIndex.store_set(list, stored, list_scores, data_set)
+        ScoreIndex.set_best(data_set, list_scores[0])
 
     return
@@ -0,0 +1,54 @@
+"""
+Settings
+    resident copy of the extras record.  read from fram once, the hot loop then
+    checks flags as plain attributes with no SPI traffic:
+
+        Settings.get().tournament_mode
+
+    changes go through update() so fram and the resident copy stay in step.
+    attributes are the extras flags (enter_initials_on_game, claim_scores,
+    show_ip_address, tournament_mode, WPCTimeOn / MM_Always on wpc and data east)
+    plus lastIP, message and other
+"""
+
+import SPI_DataStore as DataStore
+
+_settings = None
+
+
+class Values:
+    def __init__(self, record):
+        # decoded record, read only - use update() to change it
+        self.record = record
+        for key, value in record.items():
+            setattr(self, key, value)
+
+
+def get():
+    """the resident settings, read from fram on first use"""
+    global _settings
+    if _settings is None:
+        _settings = Values(DataStore.read_record("extras", 0))
+    return _settings
+
+
+def update(**changes):
+    """write changed settings to fram, returns the new settings.  nothing is written if no value changes"""
+    global _settings
+    current = get()
+    if all(getattr(current, key, None) == value for key, value in changes.items()):
+        return current
+
+    record = dict(current.record)
+    # flags are packed from their names, a stale "enable" word (fallback record) would override them
+    record.pop("enable", None)
+    record.update(changes)
+    DataStore.write_record("extras", record, 0)
+    _settings = Values(DataStore.deserialize(DataStore.serialize(record, "extras"), "extras"))
+    return _settings
+
+
+def invalidate():
+    """drop the resident copy after fram was changed behind our back (blankStruct)"""
+    global _settings
+    _settings = None
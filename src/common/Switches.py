@@ -14,6 +14,7 @@ Scheduled tasks don't preempt each other, so no synchronization is needed.
 """
 import SPI_DataStore
 import DataMapper
+import GameEvents
 import SharedState as S
 from logger import logger_instance
 log = logger_instance
@@ -21,11 +22,9 @@ log = logger_instance
 # Local storage for 72 switch counts
 switch_counts = [0] * 72
 
-# Poll counter and game state tracking
-poll_counter = 0
+# Game state tracking, ball / player changes arrive as GameEvents
 last_ball_in_play = 0
 last_player_up = 0
-last_game_active = False
 
 #switch system enable
 switch_system_on = False
@@ -35,7 +34,6 @@ switch_subscriptions = {}
 
 
 POLL_SWITCHES_mS = 1700 #5000
-POLL_GAME_STATE_CNT = 17
 
 
 def initialize():
@@ -55,13 +53,17 @@ def initialize():
         switch_counts = record.get("switches", [0] * 72)   #max len is 72, most dont use all
         log.log(f"SWITCHES: Loaded {len(switch_counts)} switches from storage")
 
-        last_ball_in_play = DataMapper.get_ball_in_play()
-        last_player_up = DataMapper.get_player_up()
+        last_ball_in_play = GameEvents.ball_in_play()
+        last_player_up = GameEvents.player_up()
         switch_system_on = True
 
+        GameEvents.subscribe(GameEvents.BALL, _on_turn_change)
+        GameEvents.subscribe(GameEvents.PLAYER_UP, _on_turn_change)
+        GameEvents.subscribe(GameEvents.GAME_END, _on_game_end)
+
         # Schedule polling
-        from phew.server import schedule
-        schedule(poll_switches, 15000, POLL_SWITCHES_mS)
+        from phew.server import PRIORITY_HIGH, schedule
+        schedule(poll_switches, 15000, POLL_SWITCHES_mS, priority=PRIORITY_HIGH)
 
     except Exception as e:
         log.log(f"SWITCHES: Error loading switch counts: {e}")
@@ -75,11 +77,8 @@ def poll_switches():
     
     When a switch is detected as tripped (True from get_switches_tripped),
     its local count is reset to zero.
-    
-    Every X calls, also checks for game state changes (ball_in_play, player_up, game over).
     """
-    global switch_counts, poll_counter, last_ball_in_play
-    global switch_system_on, last_player_up, last_game_active
+    global switch_counts
     
     if switch_system_on is False:
         return
@@ -105,37 +104,36 @@ def poll_switches():
                         callback(switch_idx)
                     except Exception as e:
                         log.log(f"SWITCHES: Error in callback for switch {switch_idx}: {e}")
-        
-        # Every X calls, check for game state changes (low impact)
-        poll_counter += 1
-        if poll_counter > POLL_GAME_STATE_CNT:
-            poll_counter = 0
-            
-            # Check for ball_in_play and player_up changes
-            current_ball = DataMapper.get_ball_in_play()
-            current_player = DataMapper.get_player_up()
-            
-            if current_ball != last_ball_in_play or  current_player != last_player_up:
-                print(f"SWITCHES: Ball change detected. Inc switch counts.")
-                last_ball_in_play = current_ball                                   
-                last_player_up = current_player
-                if last_ball_in_play !=0:
-                    switch_counts = [min(count + 1, 251) for count in switch_counts]
-                    #for idx in range(len(switch_counts)):
-                    #    if switch_counts[idx] < 251:
-                    #        switch_counts[idx] += 1
-
-            # game over? time to save to fram?
-            game_active=DataMapper.get_game_active()
-            if last_game_active is True and game_active is False:
-                log.log(f"SWITCHES: Game over, save switches")
-                save_switches()
-            last_game_active=game_active    
-                      
+
     except Exception as e:
         log.log(f"SWITCHES: Error in poll_switches: {e}")
 
 
+def _on_turn_change(event, value):
+    """
+    GameEvents BALL / PLAYER_UP subscriber, a new ball or player ages every switch count.
+    Both can change in the same sample, the pair is compared so that counts once.
+    """
+    global switch_counts, last_ball_in_play, last_player_up
+
+    current_ball = GameEvents.ball_in_play()
+    current_player = GameEvents.player_up()
+    if current_ball == last_ball_in_play and current_player == last_player_up:
+        return
+
+    print(f"SWITCHES: Ball change detected. Inc switch counts.")
+    last_ball_in_play = current_ball
+    last_player_up = current_player
+    if last_ball_in_play != 0:
+        switch_counts = [min(count + 1, 251) for count in switch_counts]
+
+
+def _on_game_end(event, value):
+    """GameEvents GAME_END subscriber, time to save to fram"""
+    log.log(f"SWITCHES: Game over, save switches")
+    save_switches()
+
+
 
 def save_switches():
     """
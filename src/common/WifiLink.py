@@ -0,0 +1,154 @@
+"""
+Wifi Link
+    keeps the station interface connected without blocking the scheduler.
+    tick() is scheduled every TICK_MS and only ever polls the radio, a
+    connect attempt started on one tick is checked on the following ones.
+
+        connected  --link lost-->  connecting  --timeout / failed-->  waiting  --backoff over-->  connecting
+
+    failed attempts back off exponentially (BACKOFF_MIN_MS doubling up to
+    BACKOFF_MAX_MS).  after MAX_ATTEMPTS failures in a row a fault is raised
+    from the driver status (wrong password or no signal), no blocking scan.
+"""
+import time
+
+import network
+import Pico_Led
+from phew import logging
+
+TICK_MS = 1000
+ATTEMPT_TIMEOUT_MS = 10000
+BACKOFF_MIN_MS = 5000
+BACKOFF_MAX_MS = 120000
+MAX_ATTEMPTS = 2
+
+_IDLE = 0
+_CONNECTING = 1
+_WAITING = 2
+_CONNECTED = 3
+
+_state = _IDLE
+_deadline = 0
+_failures = 0
+_wlan = None
+
+
+def _interface():
+    global _wlan
+    if _wlan is None:
+        _wlan = network.WLAN(network.STA_IF)
+    return _wlan
+
+
+def connected():
+    return _state == _CONNECTED
+
+
+def _start_attempt(now):
+    global _state, _deadline
+    from SPI_DataStore import read_record
+
+    credentials = read_record("configuration", 0)
+    ssid = credentials["ssid"]
+    if not ssid:
+        # nothing to join, look again much later
+        _state = _WAITING
+        _deadline = time.ticks_add(now, BACKOFF_MAX_MS)
+        return
+
+    print(f"Connecting to SSID: {ssid}")
+    Pico_Led.start_slow_blink()
+    wlan = _interface()
+    try:
+        wlan.active(True)
+        wlan.config(pm=0xA11140)  # disable power save; dozing radio drops packets
+        wlan.connect(ssid, credentials["password"])
+    except Exception as e:
+        logging.error(f"Wifi connect failed to start: {e}")
+    _state = _CONNECTING
+    _deadline = time.ticks_add(now, ATTEMPT_TIMEOUT_MS)
+
+
+def _on_connected():
+    global _state, _failures
+    from displayMessage import init as init_display
+    from faults import ALL_WIFI, clear_fault, fault_is_raised
+    from phew.server import PRIORITY_LOW, initialize_timedate, schedule
+    from SPI_DataStore import writeIP
+
+    _state = _CONNECTED
+    _failures = 0
+    ip_address = _interface().ifconfig()[0]
+    mac = _interface().config("mac")
+    print("Server:  MAC Address ", ":".join("{:02x}".format(b) for b in mac))
+
+    # TODO remove ip address args and move to scheduler
+    writeIP(ip_address)
+    init_display(ip_address)
+    print(f"Connected to wifi with IP address: {ip_address}")
+
+    # clear any wifi related faults
+    if fault_is_raised(ALL_WIFI):
+        clear_fault(ALL_WIFI)
+
+    schedule(initialize_timedate, 5000, log="Server: Initialize time & date", priority=PRIORITY_LOW)
+    Pico_Led.on()
+
+
+def _on_failed(now, status):
+    global _state, _deadline, _failures
+    _failures += 1
+    backoff = min(BACKOFF_MIN_MS << min(_failures - 1, 8), BACKOFF_MAX_MS)
+    print(f"Wifi attempt {_failures} failed (status {status}), retry in {backoff // 1000}s")
+
+    if _failures == MAX_ATTEMPTS:
+        from faults import WIFI01, WIFI02, raise_fault
+        from SPI_DataStore import read_field
+
+        ssid = read_field("configuration", "ssid")
+        if status == network.STAT_WRONG_PASSWORD:
+            raise_fault(WIFI01, f"Invalid wifi credentials for ssid: {ssid}")
+        else:
+            raise_fault(WIFI02, f"No wifi signal for ssid: {ssid}")
+
+    try:
+        # stop the radio retrying on its own between our attempts
+        _interface().disconnect()
+    except Exception:
+        pass
+    _state = _WAITING
+    _deadline = time.ticks_add(now, backoff)
+
+
+def tick():
+    """advance the connection state machine, never waits on the radio"""
+    now = time.ticks_ms()
+    wlan = _interface()
+
+    if _state == _CONNECTED:
+        if not wlan.isconnected():
+            print("Wifi link lost")
+            _start_attempt(now)
+    elif _state == _CONNECTING:
+        status = wlan.status()
+        if wlan.isconnected() and status == network.STAT_GOT_IP:
+            _on_connected()
+        elif status in (network.STAT_WRONG_PASSWORD, network.STAT_NO_AP_FOUND, network.STAT_CONNECT_FAIL) or time.ticks_diff(now, _deadline) >= 0:
+            _on_failed(now, status)
+    elif _state == _WAITING:
+        if time.ticks_diff(now, _deadline) >= 0:
+            _start_attempt(now)
+    elif wlan.isconnected():
+        # already associated (e.g. after a soft reboot, where the wifi chip keeps its connection)
+        _on_connected()
+    else:
+        _start_attempt(now)
+
+
+def connect_blocking():
+    """drive tick() until connected or the first round of attempts has failed, for boot before the scheduler runs"""
+    tick()
+    while _state == _CONNECTING or (_state == _WAITING and 0 < _failures < MAX_ATTEMPTS):
+        time.sleep_ms(250)
+        tick()
+    return connected()
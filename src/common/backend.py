@@ -5,15 +5,18 @@ from hashlib import sha256 as hashlib_sha256
 from time import sleep, time
 
 import Pico_Led
+import Settings
 import SharedState as S
 import Switches
 import uctypes
+from JsonStream import stream as json_stream
 from ls import ls
 from micropython import const
 from phew.server import add_route as phew_add_route
 from phew.server import schedule, unschedule
 from Shadow_Ram_Definitions import SRAM_DATA_BASE, SRAM_DATA_LENGTH
 from SPI_DataStore import memory_map as ds_memory_map
+from SPI_DataStore import read_field as ds_read_field
 from SPI_DataStore import read_record as ds_read_record
 from SPI_DataStore import write_record as ds_write_record
 from ujson import dumps as json_dumps
@@ -21,12 +24,20 @@ from ujson import dumps as json_dumps
 #
 # Constants
 #
-_WIFI_MAX_ATTEMPTS = const(2)
 _AP_NAME = const("Warped Pinball")
 # Authentication variables
 challenges = {}
 _CHALLENGE_EXPIRATION_SECONDS = const(60)
 
+# session id -> [hmac pads, expires, uses left, highest sequence number, used bits below it]
+sessions = {}
+_SESSION_SECONDS = const(300)
+_SESSION_MAX_USES = const(200)
+_MAX_SESSIONS = const(4)
+# requests can overtake each other (several connections), an unused sequence this far below the highest is still accepted.
+# bit n of the used mask is highest - n, 30 bits keeps it a small int
+_SEQUENCE_WINDOW = const(30)
+
 
 #
 # Standardized Route Functions
@@ -85,13 +96,18 @@ def route_wrapper(func):
     return wrapped_route
 
 
-def add_route(path, auth=False, cool_down_seconds=0, single_instance=False):
-    """Decorator to add a route to the server with gc_collect() and error handling"""
+def add_route(path, auth=False, cool_down_seconds=0, single_instance=False, etag=None, daily=False):
+    """Decorator to add a route to the server with gc_collect() and error handling
+    etag: tuple of DataVersion domains the response is built from, enables 304 responses (daily: content also changes each day)
+    """
     # If auth is True only allow a single instance of the route to run at a time
     if auth:
         single_instance = True
 
     def decorator(func):
+        if etag:
+            func = conditional(etag, daily)(func)
+
         if cool_down_seconds > 0 or single_instance:
             func = cool_down(cool_down_seconds, single_instance)(func)
 
@@ -164,7 +180,6 @@ def create_file_handler(file_path):
 
         headers = {
             "Content-Type": get_content_type(served_path),
-            "Connection": "close",
             "Cache-Control": "public, max-age=31536000, immutable",
             "ETag": etag,
         }
@@ -186,6 +201,36 @@ def create_file_handler(file_path):
     return route_wrapper(file_handler)
 
 
+def conditional(domains, daily=False):
+    """Decorator to answer If-None-Match with 304 while the data domains are unchanged, without running the route"""
+    from DataVersion import etag
+
+    def decorator(func):
+        def wrapped_route(request):
+            tag = etag(domains, int(time() // 86400) if daily else "")
+            # no-cache (not no-store) so browsers keep the body and revalidate with the tag
+            headers = {"ETag": tag, "Cache-Control": "no-cache"}
+            if request.headers.get("if-none-match") == tag:
+                return "", 304, headers
+
+            response = func(request)
+            if isinstance(response, dict) or isinstance(response, list):
+                response = json_dumps(response)
+            if not isinstance(response, tuple):
+                response = response, 200
+            if response[1] != 200:
+                # errors pass through untagged
+                return response
+            extra = response[2] if len(response) > 2 else {}
+            if isinstance(extra, str):
+                extra = {"Content-Type": extra}
+            return response[0], 200, extra | headers
+
+        return wrapped_route
+
+    return decorator
+
+
 def cool_down(cool_down_seconds=0, single_instance=False):
     """Decorator to prevent a route from being called more than once within a given time period and optionally ensuring the previous call has completed before another can be made"""
 
@@ -238,11 +283,8 @@ def random_hex(n):
     return hexlify(output).decode()
 
 
-def hmac_sha256(key, message):
-    """
-    Compute HMAC-SHA256 using the given key and message.
-    key and message should be bytes.
-    """
+def hmac_pads(key):
+    """inner and outer padded keys for HMAC-SHA256, key is bytes"""
     BLOCK_SIZE = 64  # block size for SHA-256
 
     # If key longer than block size, hash it
@@ -256,8 +298,15 @@ def hmac_sha256(key, message):
         key = key + b"\x00" * (BLOCK_SIZE - len(key))
 
     # Create inner and outer pads
-    o_key_pad = bytes([b ^ 0x5C for b in key])
-    i_key_pad = bytes([b ^ 0x36 for b in key])
+    return bytes([b ^ 0x36 for b in key]), bytes([b ^ 0x5C for b in key])
+
+
+def hmac_sha256(key, message, pads=None):
+    """
+    Compute HMAC-SHA256 using the given key and message.
+    key and message should be bytes.  pads from hmac_pads(key) skip the key setup
+    """
+    i_key_pad, o_key_pad = pads or hmac_pads(key)
 
     # Inner hash
     h_inner = hashlib_sha256()
@@ -270,6 +319,41 @@ def hmac_sha256(key, message):
     return h_outer.digest()
 
 
+def _check_session(request, session_id):
+    """None if the request is signed by a live session, otherwise the reason it is not"""
+    session = sessions.get(session_id)
+    if session is None:
+        return "Invalid session"
+    pads, expires, uses_left, highest, used = session
+    if time() > expires or uses_left <= 0:
+        del sessions[session_id]
+        return "Session expired"
+
+    # every sequence number is accepted once, a captured request can not be replayed
+    try:
+        sequence = int(request.headers.get("x-auth-sequence", ""))
+    except ValueError:
+        return "Missing session sequence"
+    if sequence <= highest:
+        below = highest - sequence
+        if below >= _SEQUENCE_WINDOW or (used >> below) & 1:
+            return "Stale session sequence"
+
+    message_str = session_id + ":" + str(sequence) + request.path + request.query_string + (request.raw_data or "")
+    expected_hmac = hexlify(hmac_sha256(None, message_str.encode("utf-8"), pads)).decode()
+    if request.headers.get("x-auth-hmac") != expected_hmac:
+        return "Bad Credentials"
+
+    session[2] = uses_left - 1
+    if sequence > highest:
+        shift = sequence - highest
+        session[3] = sequence
+        session[4] = ((used << shift) | 1) & ((1 << _SEQUENCE_WINDOW) - 1) if shift < _SEQUENCE_WINDOW else 1
+    else:
+        session[4] = used | (1 << below)
+    return None
+
+
 def require_auth(handler):
     """Decorator to require authentication using HMAC-SHA256"""
 
@@ -291,6 +375,14 @@ def require_auth(handler):
             print(request.headers)
             return msg
 
+        # requests signed with a session key skip the challenge round trip
+        session_id = request.headers.get("x-auth-session")
+        if session_id:
+            reason = _check_session(request, session_id)
+            if reason:
+                return deny_access(reason)
+            return handler(request, *args, **kwargs)
+
         # Get the HMAC from the request headers
         client_hmac = request.headers.get("x-auth-hmac")
         if not client_hmac:
@@ -315,7 +407,7 @@ def require_auth(handler):
         stored_password = credentials["Gpassword"].encode("utf-8")
 
         # Construct the message string
-        path = request.path
+        path = request.path + request.query_string
         body_str = request.raw_data or ""
         message_str = client_challenge + path + body_str
         message_bytes = message_str.encode("utf-8")
@@ -377,6 +469,50 @@ def get_challenge(request):
     return json_dumps({"challenge": new_challenge}), 200
 
 
+@add_route("/api/auth/session", auth=True)
+def open_session(request):
+    """
+    @api
+    summary: Open a short lived session so a burst of authenticated requests can skip the challenge round trip
+    auth: true
+    response:
+      status_codes:
+        - code: 200
+          description: Session opened
+        - code: 401
+          description: Credentials rejected
+      body:
+        description: >
+          Session id with its lifetime.  The session key is never sent, both sides derive it as
+          HMAC-SHA256(password, "session:" + session).  Requests then carry X-Auth-Session, an increasing
+          X-Auth-Sequence and X-Auth-HMAC = HMAC-SHA256(key, session + ":" + sequence + path + query + body)
+        example:
+            {
+                "session": "0123456789abcdef0123456789abcdef",
+                "expires_in": 300,
+                "max_uses": 200
+            }
+    @end
+    """
+    now = time()
+    for session_id, session in list(sessions.items()):
+        if now > session[1]:
+            del sessions[session_id]
+
+    # bounded, the oldest session makes room
+    while len(sessions) >= _MAX_SESSIONS:
+        oldest = min(sessions, key=lambda k: sessions[k][1])
+        del sessions[oldest]
+
+    session_id = random_hex(16)
+    password = ds_read_record("configuration", 0)["Gpassword"].encode("utf-8")
+    key = hmac_sha256(password, ("session:" + session_id).encode("utf-8"))
+    # sequence 0 counts as used, clients start at 1
+    sessions[session_id] = [hmac_pads(key), now + _SESSION_SECONDS, _SESSION_MAX_USES, 0, 1]
+
+    return {"session": session_id, "expires_in": _SESSION_SECONDS, "max_uses": _SESSION_MAX_USES}
+
+
 @add_route("/api/auth/password_check", auth=True)
 def check_password(request):
     """
@@ -437,7 +573,7 @@ def app_reboot_game(request):
     phew_restart_schedule()
 
 
-@add_route("/api/game/name")
+@add_route("/api/game/name", etag=("config",))
 def app_game_name(request):
     """
     @api
@@ -456,7 +592,7 @@ def app_game_name(request):
     return SharedState.gdata["GameInfo"]["GameName"], 200
 
 
-@add_route("/api/game/active_config")
+@add_route("/api/game/active_config", etag=("config",))
 def app_game_config_filename(request):
     """
     @api
@@ -478,11 +614,11 @@ def app_game_config_filename(request):
     if SharedState.gdata["GameInfo"]["System"] == "EM":
         return {"active_config": SharedState.gdata["GameInfo"]["GameName"]}
 
-    return {"active_config": ds_read_record("configuration", 0)["gamename"]}
+    return {"active_config": ds_read_field("configuration", "gamename")}
     # TODO make this use configured game name on EM
 
 
-@add_route("/api/game/configs_list")
+@add_route("/api/game/configs_list", etag=("config",))
 def app_game_configs_list(request):
     """
     @api
@@ -535,15 +671,38 @@ def app_game_status(request):
     return cached_report()
 
 
+@add_route("/api/game/stream")
+def app_game_stream(request):
+    """
+    @api
+    summary: Stream the game status as server-sent events, a new event is sent only when the status changes
+    response:
+      status_codes:
+        - code: 200
+          description: Event stream opened, each event's data is the same JSON object as /api/game/status
+        - code: 503
+          description: Too many clients already streaming, poll /api/game/status instead
+      body:
+        description: text/event-stream of game status objects
+        example: 'data: {"GameActive": true, "BallInPlay": 2, "Scores": [1000, 0, 0, 0]}'
+    @end
+    """
+    from GameStatus import game_stream
+
+    stream = game_stream()
+    if stream.full():
+        return "Too many streams", 503
+    return stream, 200, {"Content-Type": "text/event-stream"}
+
+
 #
 # Leaderboard
 #
 def get_scoreboard(key, sort_by="score", reverse=False):
-    rows = []
-    for i in range(ds_memory_map[key]["count"]):
-        row = ds_read_record(key, i)
-        if row.get("score", 0) > 0:
-            rows.append(row)
+    from ScoreIndex import board
+
+    # served from the resident board, copies so rank/ago never leak into it
+    rows = [dict(row) for row in board(key) if row and row.get("score", 0) > 0]
 
     # sort the rows by score
     rows.sort(key=lambda x: x[sort_by], reverse=reverse)
@@ -563,7 +722,7 @@ def get_scoreboard(key, sort_by="score", reverse=False):
     return rows
 
 
-@add_route("/api/leaders")
+@add_route("/api/leaders", etag=("leaders",), daily=True)
 def app_leaderBoardRead(request):
     """
     @api
@@ -585,7 +744,7 @@ def app_leaderBoardRead(request):
             ]
     @end
     """
-    return get_scoreboard("leaders", reverse=True)
+    return json_stream(get_scoreboard("leaders", reverse=True)), 200, "application/json"
 
 
 @add_route("/api/score/delete", auth=True)
@@ -636,7 +795,7 @@ def app_scoreDelete(request):
     return {"success": True}
 
 
-@add_route("/api/tournament")
+@add_route("/api/tournament", etag=("tournament",), daily=True)
 def app_tournamentRead(request):
     """
     @api
@@ -657,7 +816,7 @@ def app_tournamentRead(request):
             ]
     @end
     """
-    return get_scoreboard("tournament", sort_by="game")
+    return json_stream(get_scoreboard("tournament", sort_by="game")), 200, "application/json"
 
 
 @add_route("/api/leaders/reset", auth=True)
@@ -762,7 +921,7 @@ def app_claimScore(request):
 #
 # Players
 #
-@add_route("/api/players")
+@add_route("/api/players", etag=("names",))
 def app_getPlayers(request):
     """
     @api
@@ -782,16 +941,16 @@ def app_getPlayers(request):
             }
     @end
     """
+    from ScoreIndex import board
+
     players = {}
-    count = ds_memory_map["names"]["count"]
-    # Iterate through the player records
-    for i in range(count):
-        record = ds_read_record("names", i)
+    # Iterate through the resident player records
+    for i, record in enumerate(board("names")):
         initials = record["initials"].replace("\x00", " ").strip("\0")
         full_name = record["full_name"].replace("\x00", " ").strip("\0")
         if initials or full_name:  # ensure that at least one field is not empty
             players[str(i)] = {"initials": initials, "name": full_name}
-    return players
+    return json_stream(players), 200, "application/json"
 
 
 @add_route("/api/player/update", auth=True)
@@ -825,7 +984,7 @@ def app_updatePlayer(request):
     body = request.data
 
     index = int(body["id"])
-    if index < 0 or index > ds_memory_map["names"]["count"]:
+    if index < 0 or index >= ds_memory_map["names"]["count"]:
         raise ValueError(f"Invalid index: {index}")
 
     initials = body["initials"].upper()  # very particular intials conditioning
@@ -846,7 +1005,10 @@ def app_updatePlayer(request):
 
     print(f"Updating record {index} with {initials} and {name}")
 
-    ds_write_record("names", {"initials": initials, "full_name": name}, index)
+    # writes through to fram and re-indexes initials for score attribution
+    from ScoreIndex import put
+
+    put("names", index, {"initials": initials, "full_name": name})
 
 
 @add_route("/api/player/scores")
@@ -887,7 +1049,9 @@ def app_getScores(request):
     player_id = int(data["id"])
 
     # get player initials and name
-    player_record = ds_read_record("names", player_id)
+    from ScoreIndex import board
+
+    player_record = board("names")[player_id]
 
     scores = []
     numberOfScores = ds_memory_map["individual"]["count"]
@@ -939,7 +1103,7 @@ def app_getModeChamps(request):
     return json_dumps(mode_champs), 200
 
 
-@add_route("/api/personal/bests")
+@add_route("/api/personal/bests", etag=("individual", "names"), daily=True)
 def app_personal_bests(request):
     """
     @api
@@ -965,35 +1129,23 @@ def app_personal_bests(request):
 
     from phew.ntp import time_ago
 
-    now_seconds = time()
+    from ScoreIndex import board, personal_bests
 
-    bests = {}
-    # total players and individual scores
-    total_players = ds_memory_map["names"]["count"]
-    total_scores = ds_memory_map["individual"]["count"]
+    now_seconds = time()
 
-    for player_id in range(total_players):
-        player = ds_read_record("names", player_id)
+    # maintained best-per-player table, no individual records are read here
+    names = board("names")
+    records = []
+    for player_id, best in enumerate(personal_bests()):
+        if best is None or player_id >= len(names):
+            continue
+        player = names[player_id]
         if not player["initials"].strip():
             continue
+        score, date = best
+        records.append({"player_id": player_id, "initials": player["initials"], "full_name": player["full_name"], "score": score, "date": date, "ago": time_ago(date, now_seconds)})
 
-        for score_idx in range(total_scores):
-            record = ds_read_record("individual", score_idx, player_id)
-            if record["score"] > 0:
-                if player_id not in bests or record["score"] > bests[player_id]["score"]:
-                    bests[player_id] = {
-                        "initials": player["initials"],
-                        "full_name": player["full_name"],
-                        "score": record["score"],
-                        "date": record["date"].strip().replace("\x00", " "),
-                        "ago": time_ago(record["date"].strip().replace("\x00", " "), now_seconds),
-                    }
-
-    records = sorted(
-        ({"player_id": pid, "initials": d["initials"], "full_name": d["full_name"], "score": d["score"], "date": d["date"], "ago": d["ago"]} for pid, d in bests.items()),
-        key=lambda x: x["score"],
-        reverse=True,
-    )
+    records.sort(key=lambda x: x["score"], reverse=True)
     for idx, rec in enumerate(records, start=1):
         rec["rank"] = idx
     return records
@@ -1159,10 +1311,10 @@ def app_getScoreCap(request):
             }
     @end
     """
-    record = ds_read_record("extras", 0)
+    settings = Settings.get()
     return {
-        "on-machine": record["enter_initials_on_game"],
-        "web-ui": record["claim_scores"],
+        "on-machine": settings.enter_initials_on_game,
+        "web-ui": settings.claim_scores,
     }
 
 
@@ -1191,12 +1343,12 @@ def app_setScoreCap(request):
     @end
     """
     json_data = request.data
-    record = ds_read_record("extras", 0)
+    changes = {}
     if "on-machine" in json_data:
-        record["enter_initials_on_game"] = bool(json_data["on-machine"])
+        changes["enter_initials_on_game"] = bool(json_data["on-machine"])
     if "web-ui" in json_data:
-        record["claim_scores"] = bool(json_data["web-ui"])
-    ds_write_record("extras", record, 0)
+        changes["claim_scores"] = bool(json_data["web-ui"])
+    Settings.update(**changes)
 
 
 @add_route("/api/settings/get_tournament_mode")
@@ -1213,8 +1365,7 @@ def app_getTournamentMode(request):
         example: {"tournament_mode": true}
     @end
     """
-    tournament_mode = ds_read_record("extras", 0)["tournament_mode"]
-    return {"tournament_mode": tournament_mode}
+    return {"tournament_mode": Settings.get().tournament_mode}
 
 
 @add_route("/api/settings/set_tournament_mode", auth=True)
@@ -1239,9 +1390,7 @@ def app_setTournamentMode(request):
     """
     json_data = request.data
     if "tournament_mode" in json_data:
-        info = ds_read_record("extras", 0)
-        info["tournament_mode"] = bool(json_data["tournament_mode"])
-        ds_write_record("extras", info, 0)
+        Settings.update(tournament_mode=bool(json_data["tournament_mode"]))
 
 
 @add_route("/api/settings/get_show_ip")
@@ -1258,7 +1407,7 @@ def app_getShowIP(request):
         example: {"show_ip": true}
     @end
     """
-    return {"show_ip": ds_read_record("extras", 0)["show_ip_address"]}
+    return {"show_ip": Settings.get().show_ip_address}
 
 
 @add_route("/api/settings/set_show_ip", auth=True)
@@ -1282,9 +1431,7 @@ def app_setShowIP(request):
     @end
     """
     data = request.data
-    info = ds_read_record("extras", 0)
-    info["show_ip_address"] = bool(data["show_ip"])
-    ds_write_record("extras", info, 0)
+    Settings.update(show_ip_address=bool(data["show_ip"]))
     import displayMessage
 
     displayMessage.refresh()
@@ -1328,10 +1475,10 @@ def app_getMidnightMadness(request):
             }
     @end
     """
-    record = ds_read_record("extras", 0)
+    settings = Settings.get()
     return {
-        "enabled": record.get("WPCTimeOn", False),
-        "always": record.get("MM_Always", False),
+        "enabled": getattr(settings, "WPCTimeOn", False),
+        "always": getattr(settings, "MM_Always", False),
     }
 
 
@@ -1360,10 +1507,7 @@ def app_setMidnightMadness(request):
     @end
     """
     data = request.data
-    info = ds_read_record("extras", 0)
-    info["MM_Always"] = bool(data["always"])
-    info["WPCTimeOn"] = bool(data["enabled"])
-    ds_write_record("extras", info, 0)
+    Settings.update(MM_Always=bool(data["always"]), WPCTimeOn=bool(data["enabled"]))
 
 
 @add_route("/api/time/trigger_midnight_madness")
@@ -1412,7 +1556,7 @@ def app_factoryReset(request):
     Log.delete_log()
     D_blank()
     A_blank()
-    Log.log("BKD: Factory Reset")
+    Log.log("BKD: Factory Reset", flush=True)
 
     # corrupt adjustments to force game factory reset on next boot
     for i in range(1930, 1970):
@@ -1437,11 +1581,15 @@ def app_reboot(request):
         example: "ok"
     @end
     """
+    import FramMirror
     import reset_control
+    from logger import logger_instance
     from machine import reset
 
     reset_control.reset()
+    logger_instance.flush()
     sleep(2)
+    FramMirror.flush()  # the game is stopped, shadow ram is final
     reset()
 
 
@@ -1462,7 +1610,7 @@ def app_getLastIP(request):
         example: {"ip": "192.168.0.10"}
     @end
     """
-    ip_address = ds_read_record("extras", 0)["lastIP"]
+    ip_address = Settings.get().lastIP
     return {"ip": ip_address}
 
 
@@ -1488,7 +1636,7 @@ def app_getWifiStatus(request):
     import network
     from phew import is_connected_to_wifi
 
-    ssid = ds_read_record("configuration", 0)["ssid"]
+    ssid = ds_read_field("configuration", "ssid")
     connected = is_connected_to_wifi()
     rssi = None
 
@@ -1660,7 +1808,7 @@ def app_export_leaderboard(request):
     """
     from FileIO import download_scores
 
-    return download_scores()
+    return download_scores(), 200, "application/json"
 
 
 @add_route("/api/import/scores", auth=True)
@@ -1844,17 +1992,33 @@ def app_getLogs(request):
     @api
     summary: Download the system log file
     auth: true
+    request:
+      query:
+        - name: since
+          type: int
+          required: false
+          description: Cursor from a previous download's X-Log-Cursor header; only entries written after it are returned
     response:
       status_codes:
         - code: 200
-          description: Log download streaming
+          description: Log download streaming, the X-Log-Cursor header holds the cursor for the next incremental read
+        - code: 400
+          description: since is not a cursor
       body:
         description: Log file content
     @end
     """
     from FileIO import download_log
 
-    return download_log()
+    since = request.args.get("since") or None
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            since = -1
+        if since < 0:
+            return {"error": "Invalid since cursor"}, 400
+    return download_log(since)
 
 
 #
@@ -1863,7 +2027,7 @@ def app_getLogs(request):
 
 
 # 0 will always be default
-@add_route("/api/formats/available")
+@add_route("/api/formats/available", etag=("config",))
 def app_list_available_formats(request):
     """
     @api
@@ -1946,7 +2110,7 @@ def app_set_current_format(request):
 
 
 # get active format(s)
-@add_route("/api/formats/active")
+@add_route("/api/formats/active", etag=("formats",))
 def app_get_active_formats(request):
     """
     @api
@@ -2006,7 +2170,55 @@ def app_get_switch_diagnostics(request):
             ]
     @end
     """
-    return Switches.get_diagnostics()
+    return json_stream(Switches.get_diagnostics()), 200, "application/json"
+
+
+@add_route("/api/metrics")
+def app_get_metrics(request):
+    """
+    @api
+    summary: Get per route and per scheduled task timing since boot (or the last reset)
+    response:
+      status_codes:
+        - code: 200
+          description: Metrics returned
+      body:
+        description: Totals and latency percentiles over the last `window` calls for every route and task. alloc is heap bytes allocated, bytes is bytes sent.
+            schedule lists every live task with its overruns (runs over budget) and missed (periods skipped because the loop was late)
+        example:
+            {
+                "window": 32,
+                "routes": {"/api/leaders": {"count": 12, "errors": 0, "p50_ms": 41, "p95_ms": 95, "max_ms": 120, "avg_ms": 48, "bytes": 18240, "alloc": 51200}},
+                "tasks": {"poll_fast": {"count": 4800, "errors": 0, "p50_ms": 3, "p95_ms": 9, "max_ms": 22, "avg_ms": 4, "bytes": 0, "alloc": 96000}},
+                "schedule": {"poll_fast": {"freq_ms": 250, "next_in_ms": 120, "runs": 4800, "overruns": 0, "missed": 2}}
+            }
+    @end
+    """
+    from phew import metrics
+    from phew.server import schedule_report
+
+    report = metrics.report()
+    report["schedule"] = schedule_report()
+    return json_stream(report, depth=2), 200, "application/json"
+
+
+@add_route("/api/metrics/reset", auth=True)
+def app_reset_metrics(request):
+    """
+    @api
+    summary: Clear the route and task timing counters
+    auth: true
+    response:
+      status_codes:
+        - code: 200
+          description: Counters cleared
+      body:
+        example: "ok"
+    @end
+    """
+    from phew import metrics
+
+    metrics.reset()
 
 
 #
@@ -2159,12 +2371,10 @@ def add_ap_mode_routes():
             example: "ok"
         @end
         """
-        from GameDefsLoad import list_game_configs
-
-        all_game_configs = list_game_configs().keys()
+        from GameArchive import catalog
 
         data = request.data
-        if data["game_config_filename"] not in all_game_configs:
+        if data["game_config_filename"] not in catalog():
             return f"Invalid game config filename {data['game_config_filename']}", 400
 
         ds_write_record(
@@ -2203,7 +2413,7 @@ def add_ap_mode_routes():
         import scanwifi
 
         available_networks = scanwifi.scan_wifi2()
-        ssid = ds_read_record("configuration", 0)["ssid"]
+        ssid = ds_read_field("configuration", "ssid")
 
         for network in available_networks:
             if network["ssid"] == ssid:
@@ -2214,67 +2424,10 @@ def add_ap_mode_routes():
 
 
 def connect_to_wifi():
-    from phew import is_connected_to_wifi as phew_is_connected
-    from phew.server import initialize_timedate, schedule
-
-    if phew_is_connected():
-        # Already associated (e.g. after a soft reboot, where the wifi chip
-        # keeps its connection). Still report the IP so it shows on the terminal.
-        from phew import get_ip_address
-
-        print(f"Connected to wifi with IP address: {get_ip_address()}")
-        return True
-
-    Pico_Led.start_slow_blink()
-
-    from displayMessage import init as init_display
-    from faults import (
-        ALL_WIFI,
-        WIFI01,
-        WIFI02,
-        clear_fault,
-        fault_is_raised,
-        raise_fault,
-    )
-    from phew import connect_to_wifi as phew_connect
-    from SPI_DataStore import writeIP
+    """join the configured network at boot, the scheduler keeps the link up after that (WifiLink.tick)"""
+    import WifiLink
 
-    wifi_credentials = ds_read_record("configuration", 0)
-    ssid = wifi_credentials["ssid"]
-    password = wifi_credentials["password"]
-    print("Connecting to SSID: {ssid}")
-
-    if not ssid:
-        return False
-
-    # Try a few times before raising a fault
-    for i in range(_WIFI_MAX_ATTEMPTS):
-        ip_address = phew_connect(ssid, password, timeout_seconds=10)
-        if phew_is_connected():
-            # TODO remove ip address args and move to scheduler
-            writeIP(ip_address)
-            init_display(ip_address)
-            print(f"Connected to wifi with IP address: {ip_address}")
-
-            # clear any wifi related faults
-            if fault_is_raised(ALL_WIFI):
-                clear_fault(ALL_WIFI)
-
-            schedule(initialize_timedate, 5000, log="Server: Initialize time & date")
-            Pico_Led.on()
-            return True
-
-    # If there's signal that means the credentials are wrong
-    import scanwifi
-
-    networks = scanwifi.scan_wifi2()
-    for network in networks:
-        if network["ssid"] == ssid:
-            raise_fault(WIFI01, f"Invalid wifi credentials for ssid: {ssid}")
-            return False
-
-    raise_fault(WIFI02, f"No wifi signal for ssid: {ssid}")
-    return False
+    return WifiLink.connect_blocking()
 
 
 try:
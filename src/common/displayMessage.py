@@ -9,7 +9,7 @@ updated for system 9 - optionally shows IP address in high score display
 
 from Shadow_Ram_Definitions import shadowRam
 import SharedState as S
-import SPI_DataStore as DataStore
+import Settings
 from logger import logger_instance
 log = logger_instance
 
@@ -215,7 +215,7 @@ def init(ipAddress):
     """
     global localCopyIp, show_ip_last_state
     localCopyIp = ipAddress
-    show_ip_last_state = DataStore.read_record("extras", 0)["show_ip_address"]
+    show_ip_last_state = Settings.get().show_ip_address
 
     log.log(f"MSG: init ip address {ipAddress}")
     refresh_9()    #here at boot up, cannot be in scheduler or might mess up a game
@@ -228,15 +228,15 @@ def refresh():
     """
     global localCopyIp, show_ip_last_state
 
-    if show_ip_last_state and DataStore.read_record("extras", 0)["show_ip_address"]:
+    if show_ip_last_state and Settings.get().show_ip_address:
         if S.gdata["HighScores"]["Type"] in [1, 2, 3]:
             # turn off custom message
             shadowRam[S.gdata["DisplayMessage"]["EnableByteAddress"]] = 1
             fixAdjustmentChecksum()
 
-    show_ip_last_state = DataStore.read_record("extras", 0)["show_ip_address"]
+    show_ip_last_state = Settings.get().show_ip_address
 
-    if S.gdata["HighScores"]["Type"] in [1, 2, 3] and DataStore.read_record("extras", 0)["show_ip_address"]:
+    if S.gdata["HighScores"]["Type"] in [1, 2, 3] and Settings.get().show_ip_address:
         _set(localCopyIp)
         print("MSG: refreshed ", localCopyIp)
         return
@@ -249,7 +249,7 @@ def refresh_9():
     """called from score track
     refresh ip address in highscore display for system 9
     """
-    if (S.gdata["DisplayMessage"]["Type"] == 9) and (DataStore.read_record("extras", 0)["show_ip_address"]):
+    if (S.gdata["DisplayMessage"]["Type"] == 9) and (Settings.get().show_ip_address):
         global localCopyIp
         _set(localCopyIp)
         print("MSG: 9 refreshed ", localCopyIp)
@@ -60,7 +60,7 @@ def raise_fault(fault, msg=None):
 
     from logger import logger_instance as Log
 
-    Log.log(f"Fault raised: {full_fault}")
+    Log.log(f"Fault raised: {full_fault}", flush=True)
     update_led_sequence()
 
 
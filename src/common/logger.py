@@ -1,5 +1,9 @@
 # event / message/ fault logger - goes to serial FRAM
 import gc
+import time
+
+from micropython import const
+
 import SPI_Store as fram
 
 # FRAM map configuration
@@ -23,6 +27,11 @@ AddressEnd = AddressStart + LoggerLength - 16
 AddressPointer = AddressStart + LoggerLength - 6
 LogEndMarker = "\n"
 
+# messages are collected in RAM and written to FRAM in bursts
+_BUFFER_SIZE = const(256)
+_PAGE_SIZE = const(64)  # flush as soon as a page worth of text is waiting
+_MAX_HOLD_MS = const(1000)  # never hold text in RAM longer than this
+
 
 class Logger:
     def __init__(self):
@@ -31,62 +40,119 @@ class Logger:
         if self.NextWriteAddress < AddressStart or self.NextWriteAddress >= AddressEnd:
             self.NextWriteAddress = AddressStart
 
+        self._buffer = bytearray(_BUFFER_SIZE)
+        self._pending = 0
+        self._pending_since = 0
+        self._pointer_bytes = bytearray(4)
+
     def delete_log(self):
+        self._pending = 0
         self.NextWriteAddress = AddressStart
 
-        clear_data = b"\x00" * 16
+        clear_data = bytes(256)
         current_address = AddressStart
         while current_address <= AddressEnd:
-            fram.write(current_address, clear_data)
+            fram.write(current_address, clear_data[: min(len(clear_data), AddressEnd + 16 - current_address)])
             current_address += len(clear_data)
 
         address_bytes = self.NextWriteAddress.to_bytes(4, "big")
         fram.write(AddressPointer, address_bytes)
-        self.log("LOG: Delete All")
+        self.log("LOG: Delete All", flush=True)
         print("address after delete is ", self.NextWriteAddress)
 
-    def log(self, message):
+    def log(self, message, flush=False):
+        """queue a message for the FRAM log, flush=True writes it out before returning (faults)"""
         print(message)
-        message += LogEndMarker  # Append the end marker
-        for char in message:
-            
-            # Safety: validate address before every write
-            if self.NextWriteAddress < AddressStart or self.NextWriteAddress >= AddressEnd:
-                print(f"LOG: Address corruption detected 0x{self.NextWriteAddress:04X}, resetting")
-                self.NextWriteAddress = AddressStart
-            
-            fram.write(self.NextWriteAddress, char.encode("utf-8"))
-            self.NextWriteAddress += 1
+        data = (message + LogEndMarker).encode("utf-8")
+
+        if self._pending + len(data) > _BUFFER_SIZE:
+            self.flush()
+
+        if len(data) > _BUFFER_SIZE:
+            # oversize message, goes straight out
+            self._write_ring(data)
+            self._write_pointer()
+            return
+
+        if self._pending == 0:
+            self._pending_since = time.ticks_ms()
+        self._buffer[self._pending : self._pending + len(data)] = data
+        self._pending += len(data)
+
+        if flush or self._pending >= _PAGE_SIZE or time.ticks_diff(time.ticks_ms(), self._pending_since) >= _MAX_HOLD_MS:
+            self.flush()
+
+    def flush(self):
+        """write any buffered messages to FRAM, one burst (two on wrap) plus the pointer"""
+        if self._pending == 0:
+            return
+        pending = self._pending
+        self._pending = 0
+        self._write_ring(memoryview(self._buffer)[:pending])
+        self._write_pointer()
+
+    def _write_ring(self, data):
+        # Safety: validate address before every write
+        if self.NextWriteAddress < AddressStart or self.NextWriteAddress >= AddressEnd:
+            print(f"LOG: Address corruption detected 0x{self.NextWriteAddress:04X}, resetting")
+            self.NextWriteAddress = AddressStart
+
+        data = memoryview(data)
+        while len(data):
+            length = min(len(data), AddressEnd - self.NextWriteAddress)
+            fram.write(self.NextWriteAddress, data[:length])
+            data = data[length:]
+            self.NextWriteAddress += length
             if self.NextWriteAddress >= AddressEnd:
                 self.NextWriteAddress = AddressStart  # Wrap around if end is reached
 
+    def _write_pointer(self):
         # Save the updated NextWriteAddress back to the fram
-        address_bytes = self.NextWriteAddress.to_bytes(4, "big")
-        fram.write(AddressPointer, address_bytes)
-
-    def get_logs_stream(self):
+        address = self.NextWriteAddress
+        for i in range(4):
+            self._pointer_bytes[3 - i] = address & 0xFF
+            address >>= 8
+        fram.write(AddressPointer, self._pointer_bytes)
+
+    def cursor(self):
+        """current write pointer, pass back as since= to read only newer entries"""
+        self.flush()
+        return self.NextWriteAddress
+
+    def get_logs_stream(self, since=None, until=None, block_size=256):
+        """yield the log in blocks with the NUL padding removed, oldest first.
+        since / until are write pointer values (see cursor); without since the whole ring is returned
+        """
+        self.flush()
         gc.collect()
 
         if self.NextWriteAddress < AddressStart or self.NextWriteAddress > AddressEnd:
             self.NextWriteAddress = AddressStart
-        current_address = self.NextWriteAddress
-        read_size = 16
-        remaining_bytes = AddressEnd - AddressStart  # whole logger space
-
-        while True:
-            bytes_to_read = min(read_size, remaining_bytes)
-            data = fram.read(current_address, bytes_to_read)
-
-            for byte in data:
-                yield chr(byte).encode("utf-8")
-                current_address += 1
-                remaining_bytes -= 1
-                if current_address >= AddressEnd:
-                    current_address = AddressStart
-                    break
-
-            if remaining_bytes < 1:
-                return
+        if until is None or until < AddressStart or until >= AddressEnd:
+            until = self.NextWriteAddress
+
+        ring_size = AddressEnd - AddressStart
+        if since is None or since < AddressStart or since >= AddressEnd:
+            current_address = until
+            remaining_bytes = ring_size  # whole logger space
+        else:
+            current_address = since
+            remaining_bytes = (until - since) % ring_size
+
+        buffer = bytearray(block_size)
+        while remaining_bytes > 0:
+            bytes_to_read = min(block_size, remaining_bytes, AddressEnd - current_address)
+            data = memoryview(buffer)[:bytes_to_read]
+            fram.readinto(current_address, data)
+
+            block = bytes(data).replace(b"\x00", b"")
+            if block:
+                yield block
+
+            remaining_bytes -= bytes_to_read
+            current_address += bytes_to_read
+            if current_address >= AddressEnd:
+                current_address = AddressStart
 
 
 # Singleton instance
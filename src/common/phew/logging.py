@@ -10,11 +10,11 @@ def datetime_string():
     return "{0:04d}-{1:02d}-{2:02d} {4:02d}:{5:02d}:{6:02d}".format(*dt)
 
 
-def enter_log(level, text, log_and_print=False):
+def enter_log(level, text, log_and_print=False, flush=False):
     datetime = datetime_string()
     log_entry = "{0} [{1:8}] {2}".format(datetime, level, text)
     if log_and_print:
-        log.log(log_entry)
+        log.log(log_entry, flush=flush)
     else:
         print(log_entry)
 
@@ -28,7 +28,7 @@ def warn(*items):
 
 
 def error(*items):
-    enter_log("error", " ".join(map(str, items)), True)
+    enter_log("error", " ".join(map(str, items)), True, True)
 
 
 def debug(*items):
@@ -36,4 +36,4 @@ def debug(*items):
 
 
 def exception(*items):
-    enter_log("exception", " ".join(map(str, items)), True)
+    enter_log("exception", " ".join(map(str, items)), True, True)
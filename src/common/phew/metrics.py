@@ -0,0 +1,88 @@
+"""
+    request and task metrics
+
+    every route and scheduled task gets a slot with running totals and a
+    rolling window of its last WINDOW latencies in a fixed size array, so
+    recording a sample never allocates.  percentiles are worked out from the
+    window only when the report is asked for (/api/metrics)
+"""
+from array import array
+
+WINDOW = 32
+MAX_KEYS = 64  # routes + tasks, anything past this is counted under "other"
+
+
+class Slot:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0
+        self.max_ms = 0
+        self.bytes = 0
+        self.alloc = 0
+        self.samples = array("H", bytes(2 * WINDOW))
+        self.next = 0
+
+    def record(self, ms, sent=0, alloc=0, error=False):
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        self.bytes += sent
+        # a collection during the call makes the delta negative, it then says nothing about the call
+        if alloc > 0:
+            self.alloc += alloc
+        self.samples[self.next] = ms if ms < 0xFFFF else 0xFFFF
+        self.next = (self.next + 1) % WINDOW
+
+    def report(self):
+        window = sorted(self.samples[: min(self.count, WINDOW)])
+        n = len(window)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "p50_ms": window[(n - 1) // 2] if n else 0,
+            "p95_ms": window[(n * 95 - 1) // 100] if n else 0,
+            "max_ms": self.max_ms,
+            "avg_ms": self.total_ms // self.count if self.count else 0,
+            "bytes": self.bytes,
+            "alloc": self.alloc,
+        }
+
+
+routes = {}
+tasks = {}
+
+
+def _slot(table, key):
+    slot = table.get(key)
+    if slot is None:
+        if len(routes) + len(tasks) >= MAX_KEYS:
+            key = "other"
+            slot = table.get(key)
+        if slot is None:
+            slot = table[key] = Slot()
+    return slot
+
+
+def record_route(path, ms, sent=0, alloc=0, error=False):
+    _slot(routes, path).record(ms, sent, alloc, error)
+
+
+def record_task(name, ms, alloc=0, error=False):
+    _slot(tasks, name).record(ms, 0, alloc, error)
+
+
+def report():
+    return {
+        "window": WINDOW,
+        "routes": {key: slot.report() for key, slot in routes.items()},
+        "tasks": {key: slot.report() for key, slot in tasks.items()},
+    }
+
+
+def reset():
+    routes.clear()
+    tasks.clear()
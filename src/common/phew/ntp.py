@@ -2,42 +2,127 @@ import struct
 import time
 
 import machine
+import uasyncio
 import usocket
 
+NTP_HOST = "pool.ntp.org"
+NTP_DELTA = 2208988800  # 1900 to 1970 - selected by Chris - blame him. :-D
+ADDRESS_TTL_MS = 6 * 3600 * 1000  # pool.ntp.org rotates servers, look the name up again now and then
+MAX_FAILURES = 4  # unanswered queries in a row before the server is looked up again
+
+_QUERY = b"\x1b" + bytes(47)
+
+# resolved server address and when it was looked up.  getaddrinfo blocks, so it is only called when this is empty or stale
+_address = None
+_resolved_at = 0
+_failures = 0
+
+
+def _resolve():
+    global _address, _resolved_at
+    if _address is None or time.ticks_diff(time.ticks_ms(), _resolved_at) > ADDRESS_TTL_MS:
+        _address = usocket.getaddrinfo(NTP_HOST, 123)[0][-1]
+        _resolved_at = time.ticks_ms()
+    return _address
+
+
+def _failed(unreachable=False):
+    """a query got no usable answer.  a lost packet keeps the address, only an unreachable
+    server or MAX_FAILURES misses in a row send the next query through getaddrinfo again"""
+    global _address, _failures
+    _failures += 1
+    if unreachable or _failures >= MAX_FAILURES:
+        _address = None
+        _failures = 0
 
-def fetch(synch_with_rtc=True, timeout=10):
-    ntp_host = "pool.ntp.org"
 
-    timestamp = None
+def _send(socket):
+    """send the query, False (and the address dropped) if the server can not be reached at all"""
+    try:
+        socket.sendto(_QUERY, _resolve())
+    except OSError:
+        _failed(unreachable=True)
+        return False
+    return True
+
+
+def _decode(data):
+    if len(data) < 48:
+        raise ValueError("short ntp reply")
+    seconds = struct.unpack("!I", data[40:44])[0]
+    if not seconds:
+        raise ValueError("empty ntp timestamp")
+    return time.gmtime(seconds - NTP_DELTA)
+
+
+def _set_rtc(timestamp):
+    machine.RTC().datetime(
+        (
+            timestamp[0],
+            timestamp[1],
+            timestamp[2],
+            timestamp[6],
+            timestamp[3],
+            timestamp[4],
+            timestamp[5],
+            0,
+        )
+    )
+
+
+def fetch(synch_with_rtc=True, timeout=10):
+    """blocking fetch, returns the time tuple or None"""
+    global _failures
     try:
-        query = bytearray(48)
-        query[0] = 0x1B
-        address = usocket.getaddrinfo(ntp_host, 123)[0][-1]
         socket = usocket.socket(usocket.AF_INET, usocket.SOCK_DGRAM)
-        socket.settimeout(timeout)
-        socket.sendto(query, address)
-        data = socket.recv(48)
-        socket.close()
-        local_epoch = 2208988800  # selected by Chris - blame him. :-D
-        timestamp = struct.unpack("!I", data[40:44])[0] - local_epoch
-        timestamp = time.gmtime(timestamp)
+        try:
+            socket.settimeout(timeout)
+            if not _send(socket):
+                return None
+            timestamp = _decode(socket.recv(48))
+        finally:
+            socket.close()
     except Exception:
+        _failed()
         return None
+    _failures = 0
 
     # if requested set the machines RTC to the fetched timestamp
     if synch_with_rtc:
-        machine.RTC().datetime(
-            (
-                timestamp[0],
-                timestamp[1],
-                timestamp[2],
-                timestamp[6],
-                timestamp[3],
-                timestamp[4],
-                timestamp[5],
-                0,
-            )
-        )
+        _set_rtc(timestamp)
+
+    return timestamp
+
+
+async def fetch_async(synch_with_rtc=True, timeout_ms=2000):
+    """fetch without holding up the event loop, returns the time tuple or None after at most timeout_ms"""
+    global _failures
+    try:
+        socket = usocket.socket(usocket.AF_INET, usocket.SOCK_DGRAM)
+        try:
+            socket.setblocking(False)
+            if not _send(socket):
+                return None
+            deadline = time.ticks_add(time.ticks_ms(), timeout_ms)
+            while True:
+                try:
+                    data = socket.recv(48)
+                    break
+                except OSError:
+                    # nothing yet
+                    if time.ticks_diff(deadline, time.ticks_ms()) <= 0:
+                        raise
+                    await uasyncio.sleep_ms(25)
+        finally:
+            socket.close()
+        timestamp = _decode(data)
+    except Exception:
+        _failed()
+        return None
+    _failures = 0
+
+    if synch_with_rtc:
+        _set_rtc(timestamp)
 
     return timestamp
 
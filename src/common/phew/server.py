@@ -1,31 +1,38 @@
+import gc
 import time
 
-import faults
-import ntptime
+import FramMirror
+import SharedState as S
 import uasyncio
+from logger import logger_instance as Log
 from ScoreTrack import (
     CheckForNewScores,
     check_for_machine_high_scores,
     initialize_leaderboard,
 )
-from Shadow_Ram_Definitions import SRAM_DATA_BASE, SRAM_DATA_LENGTH
-from SPI_Store import write_16_fram
 
-from . import logging
+from . import logging, metrics
+from .sse import EventStream
 
 # from SPI_UpdateStore import initialize as sflash_initialize
 # from SPI_UpdateStore import tick as sflash_tick
 
 
-ntptime.host = "pool.ntp.org"  # Setting a specific NTP server
-
-
 _routes = {}
 catchall_handler = None
 loop = uasyncio.get_event_loop()
 monitor_count = 0
 
 
+def _parse_query_string(query_string):
+    args = {}
+    for pair in query_string.split("&"):
+        if pair:
+            key_value = pair.split("=", 1)
+            args[key_value[0]] = key_value[1] if len(key_value) > 1 else ""
+    return args
+
+
 class Request:
     def __init__(self, method, uri, protocol):
         self.method = method
@@ -35,6 +42,8 @@ class Request:
         self.raw_data = None  # Will hold the raw JSON body if present
         query_string_start = uri.find("?") if uri.find("?") != -1 else len(uri)
         self.path = uri[:query_string_start]
+        self.query_string = uri[query_string_start:]  # includes the leading "?", signed by authenticated clients
+        self.args = _parse_query_string(uri[query_string_start + 1 :])
 
     def __str__(self):
         return "\n".join([f"request: {self.method} {self.path} {self.protocol}", f"headers: {self.headers}", f"data: {self.data}"])
@@ -79,35 +88,123 @@ async def _parse_json_body(reader, headers):
     return body_str, json.loads(body_str)
 
 
-# handle an incoming request to the web server
-async def _handle_request(reader, writer):
+# persistent connections: a connection is kept open for further requests until it
+# idles, hits the request cap, or the pool of kept connections is full
+KEEP_ALIVE_TIMEOUT_MS = 5000
+KEEP_ALIVE_MAX_REQUESTS = 25
+KEEP_ALIVE_MAX_CONNECTIONS = 3
+
+_open_connections = 0
+
+
+def _wants_keep_alive(request):
+    connection = request.headers.get("connection", "").lower()
+    if request.protocol == "HTTP/1.1":
+        return connection != "close"
+    return connection == "keep-alive"
+
+
+# handle an incoming connection, serving requests until it is closed
+async def _handle_connection(reader, writer):
+    global _open_connections
+    _open_connections += 1
+    served = 0
+    try:
+        while True:
+            try:
+                request_line = await uasyncio.wait_for_ms(reader.readline(), KEEP_ALIVE_TIMEOUT_MS)
+            except uasyncio.TimeoutError:
+                break
+            if not request_line:
+                # client closed the connection
+                break
+
+            served += 1
+            # only connections within the pool are kept, the rest are served once
+            allow_keep_alive = served < KEEP_ALIVE_MAX_REQUESTS and _open_connections <= KEEP_ALIVE_MAX_CONNECTIONS
+            if not await _handle_request(request_line, reader, writer, allow_keep_alive):
+                break
+    except Exception as e:
+        logging.error(f"Error handling connection: {e}")
+    finally:
+        _open_connections -= 1
+        # Always close the writer, even on a mid-stream exception, so we
+        # don't leak the client socket/PCB after a truncated response.
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+
+# returns the number of bytes written
+def _write_head(writer, response):
+    # write status line
+    line = f"HTTP/1.1 {response.status} {response.status}\r\n".encode("ascii")
+    writer.write(line)
+    sent = len(line)
+
+    # write headers
+    for key, value in response.headers.items():
+        line = f"{key}: {value}\r\n".encode("ascii")
+        writer.write(line)
+        sent += len(line)
+
+    # blank line to denote end of headers
+    writer.write("\r\n".encode("ascii"))
+    return sent + 2
+
+
+async def _serve_event_stream(request, response, writer):
+    global _open_connections
+    response.add_header("Connection", "close")
+    _write_head(writer, response)
+    logging.info(f"> {request.method} {request.path} ({response.status}) stream open")
+
+    # streams do not hold one of the keep-alive slots
+    _open_connections -= 1
+    try:
+        await response.body.serve(writer)
+    except Exception as e:
+        logging.info(f"> {request.path} stream closed: {e}")
+    finally:
+        _open_connections += 1
+
+
+# handle one request on a connection, returns True if the connection can serve another
+async def _handle_request(request_line, reader, writer, allow_keep_alive=False):
     try:
         response = None
 
         request_start_time = time.ticks_ms()
+        alloc_start = gc.mem_alloc()
 
-        request_line = await reader.readline()
         try:
             method, uri, protocol = request_line.decode().split()
         except Exception as e:
             logging.error(e)
-            return
+            return False
 
         request = Request(method, uri, protocol)
 
         handler = catchall_handler
+        # metrics are kept per registered route, everything else shares one slot
+        route_key = request.path
         try:
             handler = _routes[request.path]
         except KeyError:
+            route_key = "*"
             logging.info(f"Route not found: {request.path}")
 
         # TODO make parsing json and headers lazy
         request.headers = await _parse_headers(reader)
+        body_pending = "content-length" in request.headers and int(request.headers["content-length"]) > 0
         if "content-length" in request.headers and "content-type" in request.headers:
             if request.headers["content-type"].startswith("application/json"):
                 raw_body, parsed_data = await _parse_json_body(reader, request.headers)
                 request.raw_data = raw_body
                 request.data = parsed_data
+                body_pending = False
 
         response = handler(request)
 
@@ -129,6 +226,10 @@ async def _handle_request(reader, writer):
             if isinstance(headers, str):
                 headers = {"Content-Type": headers}
 
+            # length on the wire is in bytes
+            if isinstance(body, str):
+                body = body.encode()
+
             response = Response(body, status=status)
 
             # Add all headers
@@ -138,47 +239,73 @@ async def _handle_request(reader, writer):
             if hasattr(body, "__len__"):
                 response.add_header("Content-Length", len(body))
 
-        try:
-            # write status line
-            writer.write(f"HTTP/1.1 {response.status} {response.status}\r\n".encode("ascii"))
-
-            # write headers
-            for key, value in response.headers.items():
-                writer.write(f"{key}: {value}\r\n".encode("ascii"))
-
-            # blank line to denote end of headers
-            writer.write("\r\n".encode("ascii"))
-
-            if type(response.body).__name__ == "generator":
-                # generator
-                try:
-                    for chunk in response.body:
-                        writer.write(chunk)
-                        await writer.drain()
-                except Exception as e:
-                    # Connection dropped mid-stream (e.g. WiFi/power blip). Log
-                    # the path so truncated asset transfers are identifiable,
-                    # then re-raise; the finally below still closes the socket.
-                    logging.error(f"Truncated streamed response for {request.path}: {e}")
-                    raise
-            else:
-                # string/bytes
-                writer.write(response.body)
-                await writer.drain()
-        finally:
-            # Always close the writer, even on a mid-stream exception, so we
-            # don't leak the client socket/PCB after a truncated response.
+        # long lived event stream, the connection is handed over until the client goes away
+        if isinstance(response.body, EventStream):
+            # only the set up is timed, the stream itself lasts as long as the client
+            metrics.record_route(route_key, time.ticks_diff(time.ticks_ms(), request_start_time), 0, gc.mem_alloc() - alloc_start)
+            await _serve_event_stream(request, response, writer)
+            return False
+
+        # generators of unknown length are sent chunked to http/1.1 clients, the end of the body is then marked in the stream
+        is_generator = type(response.body).__name__ == "generator"
+        chunked = is_generator and "Content-Length" not in response.headers and request.protocol == "HTTP/1.1"
+        if chunked:
+            response.add_header("Transfer-Encoding", "chunked")
+
+        # the connection can only carry another request if this response has a known length (or is chunked)
+        # and no unread request body is left in the stream
+        keep_alive = (
+            allow_keep_alive and not body_pending and _wants_keep_alive(request) and ("Content-Length" in response.headers or chunked) and response.headers.get("Connection", "").lower() != "close"
+        )
+        if keep_alive:
+            response.add_header("Connection", "keep-alive")
+            response.add_header("Keep-Alive", f"timeout={KEEP_ALIVE_TIMEOUT_MS // 1000}")
+        else:
+            response.add_header("Connection", "close")
+
+        sent = _write_head(writer, response)
+
+        if is_generator:
+            # generator
             try:
-                writer.close()
-                await writer.wait_closed()
-            except Exception:
-                pass
-
-        processing_time = time.ticks_ms() - request_start_time
+                for chunk in response.body:
+                    if chunked:
+                        if isinstance(chunk, str):
+                            chunk = chunk.encode()
+                        # an empty chunk would mark the end of the body
+                        if not chunk:
+                            continue
+                        writer.write(f"{len(chunk):x}\r\n".encode("ascii"))
+                        writer.write(chunk)
+                        writer.write(b"\r\n")
+                    else:
+                        writer.write(chunk)
+                    sent += len(chunk)
+                    await writer.drain()
+                if chunked:
+                    writer.write(b"0\r\n\r\n")
+                    await writer.drain()
+            except Exception as e:
+                # Connection dropped mid-stream (e.g. WiFi/power blip). Log
+                # the path so truncated asset transfers are identifiable,
+                # then drop the connection.
+                logging.error(f"Truncated streamed response for {request.path}: {e}")
+                metrics.record_route(route_key, time.ticks_diff(time.ticks_ms(), request_start_time), sent, gc.mem_alloc() - alloc_start, True)
+                return False
+        else:
+            # string/bytes
+            writer.write(response.body)
+            sent += len(response.body)
+            await writer.drain()
+
+        processing_time = time.ticks_diff(time.ticks_ms(), request_start_time)
+        metrics.record_route(route_key, processing_time, sent, gc.mem_alloc() - alloc_start, response.status >= 500)
         logging.info(f"> {request.method} {request.path} ({response.status}) [{processing_time}ms]")
+        return keep_alive
     except Exception as e:
         # last line of defense to keep server from crashing
         logging.error(f"Error handling request: {e}")
+        return False
 
 
 # adds a new route to the routing table
@@ -198,109 +325,256 @@ def redirect(url, status=301):
     return Response("", status, {"Location": url})
 
 
-# Function to update time from NTP server with retry mechanism
-def update_time(retry=1):
-    attempt = 0
-    print("Server: Date Update")
-    while attempt <= retry:
-        try:
-            ntptime.settime()  # This updates the RTC based on NTP server time
-            print("   Date update ok")
-            return
-        except Exception as e:
-            print("   Failed to update date:", e)
-            attempt += 1
-            time.sleep(0.2)
-    print("   Failed to update date after several attempts.")
-
+NTP_RETRY_MS = 25000
+NTP_RESYNC_MS = 6 * 3600 * 1000  # the rtc drifts a few seconds a day, pull it back every 6 hours
 
-def initialize_timedate():
-    from machine import RTC
+_timedate_task = None
 
-    rtc = RTC()
 
-    # Set the year to a known-invalid sentinel so we can reliably detect whether
-    # the NTP update succeeded, even if the clock was only slightly off beforehand.
-    _, month, day, weekday, hour, minute, second, subsecond = rtc.datetime()
-    rtc.datetime((2020, month, day, weekday, hour, minute, second, subsecond))
+# update time from NTP server with retry mechanism, returns True once the rtc is set
+async def update_time(retry=1):
+    from .ntp import fetch_async
 
-    update_time(1)
+    print("Server: Date Update")
+    for attempt in range(retry + 1):
+        timestamp = await fetch_async()
+        if timestamp is not None:
+            print("   Current UTC Date (Y/M/D): ", timestamp[0], timestamp[1], timestamp[2])
+            return True
+        print("   Failed to update date, attempt", attempt + 1)
+        await uasyncio.sleep_ms(200)
+    print("   Failed to update date after several attempts.")
+    return False
 
-    year, month, day, _, _, _, _, _ = rtc.datetime()
-    print("   Current UTC Date (Y/M/D): ", year, month, day)
 
-    if year == 2020:
-        print("   NTP sync failed, will retry.")
-        schedule(initialize_timedate, 25000)
+async def _keep_time():
+    while True:
+        synced = await update_time(1)
+        if not synced:
+            print("   NTP sync failed, will retry.")
+        await uasyncio.sleep_ms(NTP_RESYNC_MS if synced else NTP_RETRY_MS)
 
 
-MemIndex = 0
-poll_counter = 0
+def initialize_timedate():
+    """start keeping the rtc in step with ntp, in the background.  does nothing if that is already running"""
+    global _timedate_task
+    if _timedate_task is None:
+        _timedate_task = uasyncio.create_task(_keep_time())
 
 
-def copy_to_fram():
-    global MemIndex
-    write_16_fram(SRAM_DATA_BASE + MemIndex, MemIndex)
-    MemIndex += 16
-    if MemIndex >= SRAM_DATA_LENGTH:
-        MemIndex = 0
-        print("FRAM: cycle complete")
-        faults.toggle_board_LED()
+poll_counter = 0
 
 
+def _task_name(func):
+    # bound methods and functools style wrappers may not carry a name
+    return getattr(func, "__name__", None) or str(func)
+
+
+# a task running longer than this holds up every route and the other tasks
+TASK_BUDGET_MS = 100
+
+# priority classes for schedule().  high tasks go first when several are due together,
+# low (background) tasks are held back while a game is in progress and caught up after it
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+GAME_RECHECK_MS = 1000  # how often a held back task looks for the end of the game
+LOW_PRIORITY_MAX_DEFER_MS = 300000  # during a long game low tasks still run once every 5 minutes
+
+
+class Task:
+    """handle returned by schedule(), pass it to unschedule() to cancel just this task"""
+
+    def __init__(self, func, phase_ms, frequency_ms, log, seq, priority):
+        self.func = func
+        self.name = _task_name(func)
+        self.freq = frequency_ms
+        self.phase = phase_ms
+        self.log = log
+        self.priority = priority
+        self.seq = seq  # tasks due at the same time run in the order they were scheduled
+        self.next_run = time.ticks_add(time.ticks_ms(), phase_ms)
+        self.cancelled = False
+        self.runs = 0
+        self.overruns = 0
+        self.missed = 0
+        self.deferred = 0
+        self.deferred_since = None
+
+    def report(self):
+        return {
+            "freq_ms": self.freq,
+            "priority": self.priority,
+            "next_in_ms": time.ticks_diff(self.next_run, time.ticks_ms()),
+            "runs": self.runs,
+            "overruns": self.overruns,
+            "missed": self.missed,
+            "deferred": self.deferred,
+        }
+
+
+# every live task, and the same tasks as a binary heap on next_run
 _scheduled_tasks = []
+_heap = []
+_task_seq = 0
 
 # Use this to stop the schedule temporarily
 _halt_schedule = False
 
 
+def _before(a, b):
+    # ticks wrap, so due times are only compared through ticks_diff
+    diff = time.ticks_diff(a.next_run, b.next_run)
+    if diff:
+        return diff < 0
+    if a.priority != b.priority:
+        return a.priority < b.priority
+    return a.seq < b.seq
+
+
+def _heap_push(task):
+    _heap.append(task)
+    i = len(_heap) - 1
+    while i:
+        parent = (i - 1) >> 1
+        if not _before(task, _heap[parent]):
+            break
+        _heap[i] = _heap[parent]
+        i = parent
+    _heap[i] = task
+
+
+def _heap_pop():
+    top = _heap[0]
+    last = _heap.pop()
+    if _heap:
+        n = len(_heap)
+        i = 0
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and _before(_heap[child + 1], _heap[child]):
+                child += 1
+            if not _before(_heap[child], last):
+                break
+            _heap[i] = _heap[child]
+            i = child
+        _heap[i] = last
+    return top
+
+
 def restart_schedule():
-    for i, t in enumerate(_scheduled_tasks):  # Use index to update tuple
-        # t[2] is next_run, t[3] is phase
-        _scheduled_tasks[i] = (t[0], t[1], time.ticks_add(time.ticks_ms(), t[3]), t[3], t[4])
+    now = time.ticks_ms()
+    _heap.clear()
+    for task in _scheduled_tasks:
+        task.next_run = time.ticks_add(now, task.phase)
+        task.deferred_since = None
+        _heap_push(task)
 
 
-def schedule(func, phase_ms, frequency_ms=None, log=None):
-    # Tuple order: (func, freq, next_run, phase, log)
-    _scheduled_tasks.append((func, frequency_ms, time.ticks_add(time.ticks_ms(), phase_ms), phase_ms, log))
+def schedule(func, phase_ms, frequency_ms=None, log=None, priority=PRIORITY_NORMAL):
+    global _task_seq
+    _task_seq += 1
+    task = Task(func, phase_ms, frequency_ms, log, _task_seq, priority)
+    _scheduled_tasks.append(task)
+    _heap_push(task)
+    return task
 
 
 def unschedule(func):
+    """cancel a task handle, or every task running func"""
     global _scheduled_tasks
-    _scheduled_tasks = [t for t in _scheduled_tasks if t[0] != func]
+    keep = []
+    for task in _scheduled_tasks:
+        if task is func or task.func == func:
+            # left in the heap, it is dropped when it comes up
+            task.cancelled = True
+        else:
+            keep.append(task)
+    _scheduled_tasks = keep
+
+
+def schedule_report():
+    """overrun and missed deadline counts per live task"""
+    return {task.name: task.report() for task in _scheduled_tasks}
+
+
+def _hold_for_game(task, now):
+    """True if a low priority task should wait for the current game to end"""
+    if task.priority != PRIORITY_LOW or not S.game_status.get("game_active", False):
+        task.deferred_since = None
+        return False
+    if task.deferred_since is None:
+        task.deferred_since = now
+        task.deferred += 1
+        return True
+    if time.ticks_diff(now, task.deferred_since) < LOW_PRIORITY_MAX_DEFER_MS:
+        return True
+    # held back too long, let this one run and start waiting again
+    task.deferred_since = None
+    return False
+
+
+def _run_task(task):
+    if task.log is not None:
+        print(task.log)
+
+    start_time = time.ticks_ms()
+    alloc_start = gc.mem_alloc()
+    failed = False
+    try:
+        task.func()
+    except Exception as e:
+        failed = True
+        logging.error(f"Error running scheduled task: {task.name} {e}")
+    run_ms = time.ticks_diff(time.ticks_ms(), start_time)
+    metrics.record_task(task.name, run_ms, gc.mem_alloc() - alloc_start, failed)
+
+    task.runs += 1
+    if run_ms > TASK_BUDGET_MS or (task.freq and run_ms >= task.freq):
+        task.overruns += 1
+        logging.info(f"Scheduled task {task.name} overran: {run_ms}ms")
 
 
 async def run_scheduled():
-    global _halt_schedule
     while True:
-        # default to 1 second in the future
-        next_wake = time.ticks_add(time.ticks_ms(), 1000)
-        for i, t in enumerate(_scheduled_tasks):  # Use index to update tuple
-            if time.ticks_diff(time.ticks_ms(), t[2]) >= 0:  # t[2] is next_run
-                if t[4] is not None:  # t[4] is log
-                    print(t[4])
-
-                # run the task
-                try:
-                    # Uncomment the two lines below to print the time taken to run each task
-                    # start_time = time.ticks_ms()
-                    t[0]()  # t[0] is func
-                    # print(f"Task {t[0].__name__} took {time.ticks_diff(time.ticks_ms(), start_time)}ms")
-                except Exception as e:
-                    logging.error(f"Error running scheduled task: {str(t[0])} {e}")
-
-                # reschedule or remove tasks
-                if t[1] is None:  # t[1] is freq
-                    _scheduled_tasks.remove(t)
-                else:
-                    # Replace tuple with updated next_run (t[2])
-                    _scheduled_tasks[i] = (t[0], t[1], time.ticks_add(t[2], t[1]), t[3], t[4])
-
-            # track next wake up time
-            if time.ticks_diff(next_wake, t[2]) > 0:  # t[2] is next_run
-                next_wake = t[2]
-
-        delay = time.ticks_diff(next_wake, time.ticks_ms())
+        while _heap and time.ticks_diff(time.ticks_ms(), _heap[0].next_run) >= 0:
+            task = _heap_pop()
+            if task.cancelled:
+                continue
+
+            now = time.ticks_ms()
+            if _hold_for_game(task, now):
+                # look again shortly, the task runs (once) soon after the game ends
+                task.next_run = time.ticks_add(now, GAME_RECHECK_MS)
+                _heap_push(task)
+                continue
+
+            _run_task(task)
+
+            if task.cancelled:
+                continue
+            if task.freq is None:
+                task.cancelled = True
+                _scheduled_tasks.remove(task)
+                continue
+
+            # next slot on the original grid so periodic tasks do not drift.  slots that already passed
+            # are skipped and counted rather than run back to back, a slot due right now is on time
+            task.next_run = time.ticks_add(task.next_run, task.freq)
+            late = time.ticks_diff(time.ticks_ms(), task.next_run)
+            if task.freq > 0 and late > 0:
+                skipped = (late + task.freq - 1) // task.freq
+                task.missed += skipped
+                task.next_run = time.ticks_add(task.next_run, skipped * task.freq)
+            _heap_push(task)
+
+        # sleep until the next task is due, at most a second so tasks added meanwhile are picked up
+        delay = 1000
+        if _heap:
+            delay = min(delay, time.ticks_diff(_heap[0].next_run, time.ticks_ms()))
         if delay > 0:  # only sleep if we have time to sleep
             await uasyncio.sleep_ms(delay)
 
@@ -312,19 +586,20 @@ async def run_scheduled():
 def create_schedule(ap_mode: bool = False):
     from resource import go as resource_go
 
-    from backend import connect_to_wifi
     from discovery import broadcast_hello, listen, ping_random_peer
     from displayMessage import refresh
     from faults import ALL_HDWR, fault_is_raised
     from GameStatus import poll_fast
     from origin import push_reset
     from usb_comms import usb_request_handler
+    from WifiLink import TICK_MS as WIFI_TICK_MS
+    from WifiLink import tick as wifi_tick
 
     #
     # one time tasks
     #
     # set the display message
-    schedule(refresh, 30000)
+    schedule(refresh, 30000, priority=PRIORITY_LOW)
 
     # initialize the leader board right away
     schedule(initialize_leaderboard, 600, log="Server: Initialize Leader Board")
@@ -333,24 +608,27 @@ def create_schedule(ap_mode: bool = False):
     schedule(check_for_machine_high_scores, 9500, log="Server: Power up machine score check")
 
     # print out memory usage
-    schedule(resource_go, 5000, 10000)
+    schedule(resource_go, 5000, 10000, priority=PRIORITY_LOW)
+
+    # write buffered log messages to fram at least once a second
+    schedule(Log.flush, 0, 1000)
 
     #
     # reoccuring tasks
     #
     # check for new USB requests every 0.1 second
-    schedule(usb_request_handler, 1000, 100)
+    schedule(usb_request_handler, 1000, 100, priority=PRIORITY_HIGH)
 
     # update the game status every 0.25 second
-    schedule(poll_fast, 15000, 250)
+    schedule(poll_fast, 15000, 250, priority=PRIORITY_HIGH)
 
     # start checking scores every 5 seconds 15 seconds after boot
-    schedule(CheckForNewScores, 15000, 5000)
+    schedule(CheckForNewScores, 15000, 5000, priority=PRIORITY_HIGH)
 
     # only if there are no hardware faults
     if not fault_is_raised(ALL_HDWR):
-        # copy ram values to fram every 0.1 seconds
-        schedule(copy_to_fram, 0, 100)
+        # write changed ram blocks to fram every 0.1 seconds
+        schedule(FramMirror.sync, 0, 100, priority=PRIORITY_HIGH)
 
     # non AP mode only tasks
     if not ap_mode:
@@ -361,20 +639,20 @@ def create_schedule(ap_mode: bool = False):
         schedule(push_reset, 11000)
 
         # listen for others every 1.5 seconds
-        schedule(listen, 10500, 1500)
+        schedule(listen, 10500, 1500, priority=PRIORITY_LOW)
 
         # ping peers to detect offline devices every 15 seconds
-        schedule(ping_random_peer, 12000, 15000)
+        schedule(ping_random_peer, 12000, 15000, priority=PRIORITY_LOW)
 
-        # reconnect to wifi occasionally
-        schedule(connect_to_wifi, 0, 120000, log="Server: Check Wifi")
+        # watch the wifi link and reconnect with backoff, each tick only polls the radio
+        schedule(wifi_tick, 0, WIFI_TICK_MS)
 
     restart_schedule()
 
 
 def run(ap_mode: bool, host="0.0.0.0", port=80):
     logging.info("> starting web server on port {}".format(port))
-    loop.create_task(uasyncio.start_server(_handle_request, host, port, backlog=5))
+    loop.create_task(uasyncio.start_server(_handle_connection, host, port, backlog=5))
     create_schedule(ap_mode)
     loop.create_task(run_scheduled())
 
@@ -0,0 +1,52 @@
+"""
+    server-sent events
+
+    a publisher encodes each event once and every connected client is sent
+    the same bytes.  a route returns an EventStream as its response body and
+    phew.server hands the connection to serve() until the client goes away
+"""
+import uasyncio
+
+HEARTBEAT_MS = 15000  # comment line so dead clients are noticed and proxies keep the stream open
+RETRY_MS = 3000  # browser reconnect delay
+MAX_CLIENTS = 4
+
+
+class EventStream:
+    def __init__(self, max_clients=MAX_CLIENTS):
+        self.max_clients = max_clients
+        self.clients = 0
+        self.payload = None
+        self.version = 0
+        self._event = uasyncio.Event()
+
+    def full(self):
+        return self.clients >= self.max_clients
+
+    def publish(self, data):
+        """queue data (str, one line) for every client"""
+        self.payload = f"data: {data}\n\n".encode()
+        self.version += 1
+        # wakes every waiting client, they compare versions so clearing straight away is safe
+        self._event.set()
+        self._event.clear()
+
+    async def serve(self, writer):
+        """stream to one client until the connection fails"""
+        self.clients += 1
+        try:
+            writer.write(f"retry: {RETRY_MS}\n\n".encode())
+            version = 0
+            while True:
+                if version != self.version:
+                    version = self.version
+                    writer.write(self.payload)
+                else:
+                    try:
+                        await uasyncio.wait_for_ms(self._event.wait(), HEARTBEAT_MS)
+                        continue
+                    except uasyncio.TimeoutError:
+                        writer.write(b": ping\n\n")
+                await writer.drain()
+        finally:
+            self.clients -= 1
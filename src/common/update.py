@@ -239,11 +239,15 @@ def apply_update(url, skip_signature_check=False):
             "percent": 100,
         }
 
+        import FramMirror
+        from logger import logger_instance
         from machine import reset as machine_reset
         from reset_control import reset as reset_control
 
         reset_control()
+        logger_instance.flush()
         sleep(2)  # make sure the game fully shuts down and allow last messages to be finish sending
+        FramMirror.flush()  # the game is stopped, shadow ram is final
         machine_reset()
 
 
@@ -129,14 +129,13 @@ window.updateLeaderboardArticles = function () {
     return;
   }
 
-  fetch("/api/leaders")
-    .then(function (response) {
-      if (!response.ok) {
-        throw new Error("Network response was not ok: " + response.statusText);
-      }
-      return response.json();
-    })
-    .then(function (data) {
+  window
+    .fetchIfChanged("/api/leaders")
+    .then(function (result) {
+      // nothing changed and this board is already on screen
+      if (!result.changed && container.dataset.shown === "/api/leaders") return;
+      const data = result.data;
+      container.dataset.shown = "/api/leaders";
       localStorage.setItem("/api/leaders", JSON.stringify(data));
       window.renderFullArticleList(
         "leaderboardArticles",
@@ -175,14 +174,13 @@ window.updateTournamentArticles = function () {
     return;
   }
 
-  fetch("/api/tournament")
-    .then(function (response) {
-      if (!response.ok) {
-        throw new Error("Network response was not ok: " + response.statusText);
-      }
-      return response.json();
-    })
-    .then(function (data) {
+  window
+    .fetchIfChanged("/api/tournament")
+    .then(function (result) {
+      // nothing changed and this board is already on screen
+      if (!result.changed && container.dataset.shown === "/api/tournament") return;
+      const data = result.data;
+      container.dataset.shown = "/api/tournament";
       localStorage.setItem("/api/tournament", JSON.stringify(data));
       window.renderFullArticleList(
         "tournamentArticles",
@@ -228,16 +226,13 @@ window.updatePersonalArticles = function () {
       { header: "Date", key: "date" },
     ];
 
-    fetch("/api/personal/bests")
-      .then(function (response) {
-        if (!response.ok) {
-          throw new Error(
-            "Network response was not ok: " + response.statusText,
-          );
-        }
-        return response.json();
-      })
-      .then(function (data) {
+    window
+      .fetchIfChanged("/api/personal/bests")
+      .then(function (result) {
+        // nothing changed and this board is already on screen
+        if (!result.changed && container.dataset.shown === "/api/personal/bests") return;
+        const data = result.data;
+        container.dataset.shown = "/api/personal/bests";
         localStorage.setItem("/api/personal/bests", JSON.stringify(data));
         window.renderFullArticleList(
           "personalArticles",
@@ -271,6 +266,7 @@ window.updatePersonalArticles = function () {
       return response.json();
     })
     .then(function (data) {
+      container.dataset.shown = "/api/player/scores?id=" + player_id;
       localStorage.setItem(
         "/api/player/scores?id=" + player_id,
         JSON.stringify(data),
@@ -966,8 +962,14 @@ window.updateBallInPlay = function (data, showGameOver = false) {
  * Main function to get and display game status
  */
 window.getGameStatus = async function () {
-  // Fetch data from API
-  const data = await window.fetchGameStatus();
+  window.renderGameStatus(await window.fetchGameStatus());
+};
+
+/**
+ * Display a game status report
+ * @param {Object} data - Game status as returned by /api/game/status
+ */
+window.renderGameStatus = function (data) {
   const gameStatus = document.getElementById("game-status");
   const now = Date.now();
 
@@ -1182,9 +1184,72 @@ window.exitScoreEdit = function () {
   window.scoreEditMode = false;
 };
 
-// Initial call
-window.getGameStatus();
+/**
+ * Live game status over server-sent events. Reports only arrive when they
+ * change, so the latest one is re-rendered locally to run the post game hold.
+ * Falls back to polling if the browser or the board can't stream.
+ */
+window.latestGameStatus = null;
+
+window.startGameStatusPolling = function () {
+  window.getGameStatus();
+  window.gameStatusIntervalId = setInterval(window.getGameStatus, 1500);
+  window.claimableIntervalId = setInterval(window.getClaimableScores, 4000);
+};
+
+window.startGameStatusStream = function () {
+  if (window.gameStatusSource) window.gameStatusSource.close();
+  if (!window.EventSource) {
+    window.startGameStatusPolling();
+    return;
+  }
+
+  const source = new EventSource("/api/game/stream");
+  window.gameStatusSource = source;
+
+  source.onmessage = function (event) {
+    // stop streaming once we've navigated away from the scores page
+    if (!document.getElementById("game-status")) {
+      window.stopGameStatusStream();
+      return;
+    }
+    const data = JSON.parse(event.data);
+    const last = window.latestGameStatus;
+    // claimable scores only change when a game starts or ends
+    if (
+      !last ||
+      last.GameActive !== data.GameActive ||
+      last.game_num !== data.game_num
+    ) {
+      window.getClaimableScores();
+    }
+    window.latestGameStatus = data;
+    window.renderGameStatus(data);
+  };
+
+  source.onerror = function () {
+    // the browser retries on its own unless the board refused the stream
+    if (source.readyState === EventSource.CLOSED) {
+      window.stopGameStatusStream();
+      window.startGameStatusPolling();
+    }
+  };
+
+  window.gameStatusIntervalId = setInterval(function () {
+    if (window.latestGameStatus) {
+      window.renderGameStatus(window.latestGameStatus);
+    }
+  }, 1500);
+  // claims from other browsers still show up, just less often
+  window.claimableIntervalId = setInterval(window.getClaimableScores, 20000);
+};
+
+window.stopGameStatusStream = function () {
+  if (window.gameStatusSource) window.gameStatusSource.close();
+  window.gameStatusSource = null;
+  clearInterval(window.gameStatusIntervalId);
+  clearInterval(window.claimableIntervalId);
+};
 
-// Poll for updates
-setInterval(window.getGameStatus, 1500);
-setInterval(window.getClaimableScores, 4000);
+window.stopGameStatusStream();
+window.startGameStatusStream();
@@ -54,30 +54,112 @@ async function confirmAction(message, callback, cancelCallback = null) {
   modal.showModal();
 }
 
+// Authenticated calls: a one-time challenge signs the first request, which
+// opens a short lived session. Later calls sign with the session key (derived
+// from the password, never sent) and skip the challenge round trip.
+let authSession = null;
+// a session being opened, shared so concurrent calls do not each open one
+let authSessionOpening = null;
+
+async function signWithChallenge(password, url, data_str, headers) {
+  const cRes = await fetch("/api/auth/challenge");
+  if (!cRes.ok) throw new Error("Failed to get challenge.");
+  const { challenge } = await cRes.json();
+  const urlObj = new URL(url, window.location.origin);
+  const msg = challenge + urlObj.pathname + urlObj.search + data_str;
+  headers["X-Auth-HMAC"] = sha256.hmac(password, msg);
+  headers["X-Auth-challenge"] = challenge;
+}
+
+async function openAuthSession(password) {
+  const headers = { "Content-Type": "application/json" };
+  await signWithChallenge(password, "/api/auth/session", "", headers);
+  const response = await fetch("/api/auth/session", { headers });
+  if (!response.ok) return null;
+  const { session, expires_in, max_uses } = await response.json();
+  return {
+    id: session,
+    password,
+    key: sha256.hmac.array(password, "session:" + session),
+    sequence: 0,
+    usesLeft: max_uses,
+    // renew a little early so a request never races the expiry
+    expires: Date.now() + (expires_in - 10) * 1000,
+  };
+}
+
+function signWithSession(session, url, data_str, headers) {
+  const urlObj = new URL(url, window.location.origin);
+  session.sequence += 1;
+  session.usesLeft -= 1;
+  const msg =
+    session.id +
+    ":" +
+    session.sequence +
+    urlObj.pathname +
+    urlObj.search +
+    data_str;
+  headers["X-Auth-Session"] = session.id;
+  headers["X-Auth-Sequence"] = String(session.sequence);
+  headers["X-Auth-HMAC"] = sha256.hmac(session.key, msg);
+}
+
+function sessionUsable(session, password) {
+  return (
+    session !== null &&
+    session.password === password &&
+    session.usesLeft > 0 &&
+    Date.now() < session.expires
+  );
+}
+
 async function smartFetch(url, data = false, auth = true) {
   console.log({ url, data, auth });
-  const headers = {
+  const data_str = data ? JSON.stringify(data) : "";
+  const method = data ? "POST" : "GET";
+  const send = function (headers) {
+    return fetch(url, {
+      method,
+      headers,
+      body: data ? data_str : undefined,
+    });
+  };
+  const baseHeaders = {
     "Content-Type": "application/json",
   };
-  if (auth) {
-    const password = await window.get_password();
-    const cRes = await fetch("/api/auth/challenge");
-    if (!cRes.ok) throw new Error("Failed to get challenge.");
-    const { challenge } = await cRes.json();
-    const urlObj = new URL(url, window.location.origin);
-    const data_str = data ? JSON.stringify(data) : "";
-    const msg = challenge + urlObj.pathname + urlObj.search + data_str;
-    const hmacHex = sha256.hmac(password, msg);
-    headers["X-Auth-HMAC"] = hmacHex;
-    headers["X-Auth-challenge"] = challenge;
+  if (!auth) {
+    return send(baseHeaders);
   }
-  const method = data ? "POST" : "GET";
-  const response = await fetch(url, {
-    method,
-    headers,
-    body: data ? JSON.stringify(data) : undefined,
-  });
-  if (auth && response.status === 401) {
+
+  const password = await window.get_password();
+  if (!sessionUsable(authSession, password)) {
+    if (!authSessionOpening) {
+      authSessionOpening = openAuthSession(password).finally(() => {
+        authSessionOpening = null;
+      });
+    }
+    authSession = await authSessionOpening;
+  }
+
+  let response = null;
+  const session = authSession;
+  if (session) {
+    const headers = { ...baseHeaders };
+    signWithSession(session, url, data_str, headers);
+    response = await send(headers);
+    if (response.status === 401) {
+      // the board rebooted or dropped the session, fall back to a challenge
+      if (authSession === session) authSession = null;
+      response = null;
+    }
+  }
+  if (response === null) {
+    const headers = { ...baseHeaders };
+    await signWithChallenge(password, url, data_str, headers);
+    response = await send(headers);
+  }
+
+  if (response.status === 401) {
     alert("Authentication failed. Please try again.");
     window.logout();
   }
@@ -86,6 +168,34 @@ async function smartFetch(url, data = false, auth = true) {
 
 window.smartFetch = smartFetch;
 
+// Last ETag and body per url, the board answers 304 while its data is unchanged
+const etagCache = {};
+
+/**
+ * GET a JSON endpoint, revalidating with the ETag from the previous response
+ * @param {string} url - Endpoint to fetch
+ * @returns {Promise<{data: any, changed: boolean}>} changed is false when the board answered 304
+ */
+async function fetchIfChanged(url) {
+  const cached = etagCache[url];
+  const headers = cached ? { "If-None-Match": cached.etag } : {};
+  const response = await fetch(url, { headers, cache: "no-store" });
+  if (response.status === 304 && cached) {
+    return { data: cached.data, changed: false };
+  }
+  if (!response.ok) {
+    throw new Error("Network response was not ok: " + response.statusText);
+  }
+  const data = await response.json();
+  const etag = response.headers.get("ETag");
+  if (etag) {
+    etagCache[url] = { etag, data };
+  }
+  return { data, changed: true };
+}
+
+window.fetchIfChanged = fetchIfChanged;
+
 async function fetchGzip(url) {
   const response = await fetch(url);
   if (!response.ok) {
@@ -5,10 +5,9 @@
 SPI Data (player names, scores, wifi config, tournament scores, some extra config stuff)
 
 """
-import struct
-
 from micropython import const
 
+import RecordCodec
 import SPI_Store as fram
 from logger import logger_instance
 
@@ -43,6 +42,8 @@ memory_map = {
         "count": 1,
     },
 }
+# 8 byte (Q) scores, extras flag bits 4 and 5 are WPCTimeOn / MM_Always
+RecordCodec.compile(memory_map, score="Q", flags=RecordCodec.WPC_EXTRAS_FLAGS)
 
 
 def show_mem_map():
@@ -62,12 +63,21 @@ def show_mem_map():
         print(f"{key}: start={value['start']}, end={value['end']}, size={value['size']}, count={value['count']}")
 
 
+def _address(structure, index, set):
+    return structure["start"] + index * structure["size"] + set * structure["size"] * structure["count"]
+
+
+def _codec(structure_name):
+    try:
+        return memory_map[structure_name]["codec"]
+    except KeyError:
+        raise ValueError("Unknown structure name")
+
+
 def write_record(structure_name, record, index=0, set=0):
     try:
         structure = memory_map[structure_name]
-        start_address = structure["start"] + index * structure["size"] + structure["size"] * structure["count"] * set
-        data = serialize(record, structure_name)
-        fram.write(start_address, data)
+        fram.write(_address(structure, index, set), serialize(record, structure_name))
 
     except Exception as e:
         error_message = f"Error writing record to {structure_name}: {e}"
@@ -76,150 +86,33 @@ def write_record(structure_name, record, index=0, set=0):
 
 
 def serialize(record, structure_name):
-    if structure_name == "names":
-        return struct.pack("<3s16s", record["initials"].encode(), record["full_name"].encode())
-    elif structure_name == "leaders":
-        return struct.pack(
-            "<3s16s10sQ",
-            record["initials"].encode(),
-            record["full_name"].encode(),
-            record["date"].encode(),
-            record["score"],                         # I integer (4 bytes)  - - move to Q  (8 bytes)
-        )
-    elif structure_name == "tournament":
-        return struct.pack(
-            "<3sQBB",                             # I->Q
-            record["initials"].encode(),
-            record["score"],
-            record["game"],
-            record["index"],
-        )
-    elif structure_name == "individual":
-        return struct.pack("<Q10s", record["score"], record["date"].encode())    #I->Q
-    elif structure_name == "MapVersion":
-        return struct.pack("<16s", record["version"].encode())
-    elif structure_name == "configuration":
-        return struct.pack(
-            "<32s32s16s16s",
-            record["ssid"].encode(),
-            record["password"].encode(),
-            record["gamename"].encode(),
-            record["Gpassword"].encode(),
-        )
-    elif structure_name == "extras":
-        if record.get("enable") is None:
-            enable = 0
-            if record.get("enter_initials_on_game", True):
-                enable |= 0x01
-            if record.get("claim_scores", True):
-                enable |= 0x02
-            if record.get("show_ip_address", True):
-                enable |= 0x04
-            if record.get("tournament_mode", True):
-                enable |= 0x08
-            if record.get("WPCTimeOn", True):     #was "flag5"
-                enable |= 0x10
-            if record.get("MM_Always", True):     #was "flag6"
-                enable |= 0x20
-        else:
-            enable = record["enable"]
-        return struct.pack("<II20s20s", enable, record["other"], record["lastIP"].encode(), record["message"].encode())
-    else:
-        raise ValueError("Unknown structure name")
+    """pack into the structure's preallocated buffer, the returned view is valid until the next pack or read of that structure"""
+    return _codec(structure_name).pack(record)
 
 
 def read_record(structure_name, index=0, set=0):
     structure = memory_map[structure_name]
-    if "sets" in structure:
-        start_address = structure["start"] + index * structure["size"] + set * structure["size"] * structure["count"]
-    else:
-        start_address = structure["start"] + index * structure["size"]
-    data = fram.read(start_address, structure["size"])
-    return deserialize(data, structure_name)
+    codec = _codec(structure_name)
+    fram.readinto(_address(structure, index, set), codec.view)
+    return deserialize(codec.view, structure_name)
+
+
+def read_field(structure_name, field, index=0, set=0):
+    """read and decode one field (or extras flag) of a record, only that field's bytes cross the SPI bus"""
+    structure = memory_map[structure_name]
+    codec = _codec(structure_name)
+    offset, _, _, size = codec.fields["enable" if codec.flags and field in codec.flags else field]
+    fram.readinto(_address(structure, index, set) + offset, codec.view[offset : offset + size])
+    return codec.field(field)
 
 
 def deserialize(data, structure_name):
-    if structure_name == "names":
-        try:
-            initials, name = struct.unpack("<3s16s", data)
-            return {
-                "initials": initials.decode().strip("\0"),
-                "full_name": name.decode().strip("\0"),
-            }
-        except Exception:
-            return {"initials": " ", "full_name": " "}
-    elif structure_name == "leaders":
-        try:
-            initials, name, date, score = struct.unpack("<3s16s10sQ", data)
-            return {
-                "initials": initials.decode().strip("\0"),
-                "full_name": name.decode().strip("\0"),
-                "date": date.decode().strip("\0"),
-                "score": score,
-            }
-        except Exception:
-            return None
-    elif structure_name == "tournament":
-        try:
-            initials, score, game, index = struct.unpack("<3sQBB", data)
-            return {
-                "initials": initials.decode().strip("\0"),
-                "score": score,
-                "game": game,
-                "index": index,
-            }
-        except Exception:
-            return None
-    elif structure_name == "individual":
-        try:
-            score, date = struct.unpack("<Q10s", data)
-            return {"score": score, "date": date.decode().strip("\0")}
-        except Exception:
-            return {"score": 1, "date": "9"}
-    elif structure_name == "MapVersion":
-        ver = struct.unpack("<16s", data)
-        return {"version": ver[0].decode()}
-
-    elif structure_name == "configuration":
-        ssid, password, gamename, gpassword = struct.unpack("<32s32s16s16s", data)
-        return {
-            "ssid": ssid.decode().strip("\0"),
-            "password": password.decode().strip("\0"),
-            "gamename": gamename.decode().strip("\0"),
-            "Gpassword": gpassword.decode().strip("\0"),
-        }
-
-    elif structure_name == "extras":
-        # print (data,"length= ",len(data))  #,"s-> ",data.strip('\00'))
-        try:
-            enable, other, lastIP, message = struct.unpack("<II20s20s", data)
-            return {
-                "other": other,
-                "lastIP": lastIP.decode().strip("\0"),
-                "message": message.decode().strip("\0"),
-                "enter_initials_on_game": bool(enable & 0x01),
-                "claim_scores": bool(enable & 0x02),
-                "show_ip_address": bool(enable & 0x04),
-                "tournament_mode": bool(enable & 0x08),
-                "WPCTimeOn": bool(enable & 0x10),
-                "MM_Always": bool(enable & 0x20)
-            }
-        except Exception:
-            Log.log("DATSTORE: fault extras")
-            return {
-                "enable": 5,
-                "other": 1,
-                "lastIP": "none",
-                "message": "none",
-                "enter_initials_on_game": True,
-                "claim_scores": False,
-                "show_ip_address": True,
-                "tournament_mode": False,
-                "WPCTimeOn": False,
-                "MM_Always": False,
-            }
-    else:
-        raise ValueError("Unknown structure name")
+    codec = _codec(structure_name)
+    try:
+        return codec.unpack(data)
+    except Exception:
+        Log.log(f"DATSTORE: fault {structure_name}")
+        return codec.default()
 
 
 def blankStruct(structure_name):
@@ -249,6 +142,15 @@ def blankStruct(structure_name):
             write_record(structure_name, fake_entry, i)
     Log.log(f"DATST: blank {structure_name}")
 
+    # resident score boards and settings no longer match fram
+    from ScoreIndex import invalidate
+
+    invalidate(structure_name)
+    if structure_name == "extras":
+        import Settings
+
+        Settings.invalidate()
+
 
 def blankIndPlayerScores(playernum):
     fake_entry = {"score": 0, "date": ""}
@@ -256,6 +158,10 @@ def blankIndPlayerScores(playernum):
     for i in range(structure["count"]):
         write_record("individual", fake_entry, i, playernum)
 
+    from ScoreIndex import clear_set
+
+    clear_set(playernum)
+
 
 def blankAll():
     blankStruct("tournament")
@@ -269,9 +175,10 @@ def blankAll():
 
 
 def writeIP(ipaddress):
-    rec = read_record("extras")
-    rec["lastIP"] = ipaddress
-    write_record("extras", rec, 0)
+    # through the resident settings so they stay in step with fram
+    from Settings import update
+
+    update(lastIP=ipaddress)
 
 
 if __name__ == "__main__":
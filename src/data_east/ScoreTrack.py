@@ -9,7 +9,10 @@ Score Track
     Must account for highscores and in play score availability
 """
 import DataMapper
+import GameEvents
 import SharedState as S
+import ScoreIndex
+import Settings
 import SPI_DataStore as DataStore
 from logger import logger_instance
 from machine import RTC
@@ -49,7 +52,7 @@ def get_claim_score_list():
     fetch the list of claimable scores
     """
     result = []
-    if DataStore.read_record("extras", 0)["claim_scores"] is True:
+    if Settings.get().claim_scores is True:
         for game in recent_scores[:4]:
             # if there are any unclaimed non zero scores, add them to the list
             if any(score[0] == "" and score[1] != 0 for score in game[1:]):
@@ -81,7 +84,7 @@ def claim_score(initials, player_index, score):
                 log.log(f"SCORE: claim new score: {initials}, {score}, {game_index}, {player_index}")
                 recent_scores[game_index][player_index + 1] = (initials, score)
                 new_score = {"initials": initials, "full_name": None, "score": score, "game": game[0]}
-                if DataStore.read_record("extras", 0)["tournament_mode"]:
+                if Settings.get().tournament_mode:
                     update_tournament(new_score)
                 else:
                     update_leaderboard(new_score)
@@ -99,18 +102,8 @@ def _place_game_in_claim_list(game):
    
 
 def find_player_by_initials(new_entry):
-    """find players name from list of intials with names from storage"""
-    findInitials = new_entry["initials"]
-    if findInitials == "" or findInitials is None:
-        return ("", -1)
-    count = DataStore.memory_map["names"]["count"]
-    for index in range(count):
-        rec = DataStore.read_record("names", index)
-        if rec is not None:
-            if rec["initials"] == findInitials:
-                player_name = rec["full_name"].strip("\x00")
-                return (player_name, index)
-    return ("", -1)
+    """find players name from list of intials with names from storage (resident initials index)"""
+    return ScoreIndex.find_player(new_entry["initials"])
 
 
 def update_individual_score(new_entry):
@@ -135,13 +128,14 @@ def update_individual_score(new_entry):
             return False
         scores.append(existing_score)
 
+    stored = list(scores)
     scores.append(new_entry)
     scores.sort(key=lambda x: x["score"], reverse=True)
     scores = scores[:num_scores]
 
-    # Save the updated scores
-    for i in range(num_scores):
-        DataStore.write_record("individual", scores[i], i, playernum)
+    # Save the updated scores, only the slots at and below the new entry moved
+    ScoreIndex.store_set("individual", stored, scores, playernum)
+    ScoreIndex.set_best(playernum, scores[0])
 
     # print(f"Updated scores for {initials}")
     return True
@@ -169,8 +163,8 @@ def update_leaderboard(new_entry):
         if new_entry["full_name"] is None:
             new_entry["full_name"] = ""
 
-    # Load scores
-    top_scores = [DataStore.read_record("leaders", i) for i in range(DataStore.memory_map["leaders"]["count"])]
+    # working copy of the resident board
+    top_scores = [dict(entry) for entry in ScoreIndex.board("leaders")]
 
     # if matches a record without initials in top_scores (score claim) - just add initials
     for entry in top_scores:
@@ -179,7 +173,7 @@ def update_leaderboard(new_entry):
             # print(" using claim - - - - - ")
             entry["initials"] = new_entry["initials"]
             entry["full_name"] = new_entry["full_name"]
-            DataStore.write_record("leaders", entry, top_scores.index(entry))
+            ScoreIndex.put("leaders", top_scores.index(entry), entry)
 
             update_individual_score(new_entry)
             return True
@@ -195,8 +189,8 @@ def update_leaderboard(new_entry):
 
     count = DataStore.memory_map["leaders"]["count"]
     top_scores = top_scores[:count]
-    for i in range(count):
-        DataStore.write_record("leaders", top_scores[i], i)
+    # only the slots that moved are written
+    ScoreIndex.store("leaders", top_scores)
 
     return True
 
@@ -208,25 +202,27 @@ def initialize_leaderboard():
 
     # init gameCounter, find highest # in tournament board
     n = 0
-    for i in range(DataStore.memory_map["tournament"]["count"]):
+    for i, rec in enumerate(ScoreIndex.load("tournament")):
         try:
-            game_value = DataStore.read_record("tournament", i)["game"]
+            game_value = rec["game"]
             n = max(game_value, n)
         except (KeyError, TypeError):
             log.log(f"SCORE: Error reading game value at index {i}")
             continue
     S.gameCounter = n
 
+    # names and the initials -> player lookup
+    ScoreIndex.load("names")
+
     # load up top scores from fram with safe defaults
     count = DataStore.memory_map["leaders"]["count"]
     top_scores = []
-    for i in range(count):
-        rec = DataStore.read_record("leaders", i)
+    for i, rec in enumerate(ScoreIndex.load("leaders")):
         if rec is None or not isinstance(rec, dict):
             # Create a blank/safe entry if the record is None or corrupt
             rec = {"initials": "   ", "full_name": "", "score": 100 + (count - i) * 100, "date": "01/01/2025", "game_count": 0}  # Descending placeholder scores
             log.log(f"SCORE: leaders[{i}] was None/corrupt, using default")
-        top_scores.append(rec)
+        top_scores.append(dict(rec))
 
 
 def check_for_machine_high_scores(report=True):
@@ -266,8 +262,8 @@ def update_tournament(new_entry):
         return False
 
     count = DataStore.memory_map["tournament"]["count"]
-    rec = DataStore.read_record("tournament", 0)
-    nextIndex = rec["index"]
+    tournament = ScoreIndex.board("tournament")
+    nextIndex = tournament[0]["index"]
 
     # check for a match in the tournament board, for Claim Score function
     #   look back 6 games x 4 scores = 24 places for a match
@@ -277,24 +273,25 @@ def update_tournament(new_entry):
             ind = nextIndex - 1 - i
             if ind < 0:
                 ind += count
-            rec = DataStore.read_record("tournament", ind)
+            rec = tournament[ind]
             if rec["game"] == new_entry["game"] and rec["score"] == new_entry["score"]:
+                rec = dict(rec)
                 rec["initials"] = new_entry["initials"]
-                DataStore.write_record("tournament", rec, ind)
+                ScoreIndex.put("tournament", ind, rec)
         return
 
     new_entry["game"] = S.gameCounter
     new_entry["full_name"] = ""
     new_entry["index"] = nextIndex
-    DataStore.write_record("tournament", new_entry, nextIndex)
+    ScoreIndex.put("tournament", nextIndex, new_entry)
     log.log(f"SCORE: tournament new score {new_entry}")
 
     nextIndex += 1
     if nextIndex >= count:
         nextIndex = 0
-    rec = DataStore.read_record("tournament", 0)
+    rec = dict(tournament[0])
     rec["index"] = nextIndex
-    DataStore.write_record("tournament", rec, 0)
+    ScoreIndex.put("tournament", 0, rec)
     return
 
 
@@ -307,9 +304,21 @@ STATE_PLAYING = 2  # Game in progress
 _game_state = STATE_INIT
 
 
+# set by GameEvents at game end, so a game end between two checks is not missed.
+# the in-play scores are kept from that sample, a new game may have reset them by the next check
+_game_ended = False
+_final_scores = None
+
+
+def _on_game_end(event, active):
+    global _game_ended, _final_scores
+    _game_ended = True
+    _final_scores = GameEvents.scores()
+
+
 def CheckForNewScores():
     """Called by scheduler every 5 seconds. Tracks game state and updates scores."""
-    global nGameIdleCounter, GameEndCount, _game_state, push_game_count, last_pushed_game
+    global nGameIdleCounter, GameEndCount, _game_state, push_game_count, last_pushed_game, _game_ended
 
     if push_game_count>0:
         from origin import push_end_of_game
@@ -324,6 +333,7 @@ def CheckForNewScores():
     if _game_state == STATE_INIT:
         _game_state = STATE_WAITING
         print("SCORE: State 0 - Power up initialization")
+        GameEvents.subscribe(GameEvents.GAME_END, _on_game_end)
         scores = DataMapper.read_high_scores()
         print("Power up read machine scores - ", scores)
         for entry in scores:
@@ -363,15 +373,16 @@ def CheckForNewScores():
                 nGameIdleCounter = 0
                 print("SCORE: game list 10 minute expire")
 
-            ballInPlay = DataMapper.get_ball_in_play()
+            ballInPlay = GameEvents.ball_in_play()
             print(f"SCORE: Ball in play = {ballInPlay}")
 
             if ballInPlay != 0:
                 _game_state = STATE_PLAYING  # Game Started!
+                _game_ended = False
 
                 log.log("SCORE: Game Started")
                 nGameIdleCounter = 0
-                if DataStore.read_record("extras", 0)["enter_initials_on_game"] is True:
+                if Settings.get().enter_initials_on_game is True:
                     print("SCORE: Removing machine scores (enter_initials_on_game=True)")
                     highScores = [["aaa", 900], ["aaa", 800], ["aaa", 700], ["aaa", 600]]
                     DataMapper.write_high_scores(highScores)
@@ -381,15 +392,15 @@ def CheckForNewScores():
         elif _game_state == STATE_PLAYING:
             print("SCORE: State PLAYING - Game in progress, waiting for end")
 
-            ballInPlay = DataMapper.get_ball_in_play()
+            ballInPlay = GameEvents.ball_in_play()
             print(f"SCORE: Ball in play = {ballInPlay}")
-            if ballInPlay == 0:
+            if _game_ended:
+                _game_ended = False
                 _game_state = STATE_WAITING
                 if S.gdata["HighScores"]["Type"] in range(20, 29):
-                    if DataStore.read_record("extras", 0)["enter_initials_on_game"]:
+                    if Settings.get().enter_initials_on_game:
                         high_scores = DataMapper.read_high_scores()
-                        in_play_data = DataMapper.get_in_play_data()
-                        in_play_scores = in_play_data["Scores"]
+                        in_play_scores = _final_scores
                         print("in play scores - - - - ", in_play_scores)
                         scores = []
 
@@ -408,18 +419,11 @@ def CheckForNewScores():
                     else:
                         # read in play scores after game over to populate claim list ?  ?
                         log.log("SCORE: end, use in-play scores")
-                        in_play_data = DataMapper.get_in_play_data()
-
-                        # Extract scores list from the returned dictionary
-                        if isinstance(in_play_data, dict) and "Scores" in in_play_data:
-                            # Convert from [score1, score2, score3, score4] to [["", score1], ["", score2], ...]
-                            scores = [["", score] for score in in_play_data["Scores"]]
-                        else:
-                            log.log(f"SCORE: get_in_play_data returned invalid type: {type(in_play_data)}")
-                            scores = [["", 0], ["", 0], ["", 0], ["", 0]]
+                        # Convert from [score1, score2, score3, score4] to [["", score1], ["", score2], ...]
+                        scores = [["", score] for score in _final_scores]
                         print(f"SCORE: In-play scores: {scores}")
 
-                    tournament_mode = DataStore.read_record("extras", 0)["tournament_mode"]
+                    tournament_mode = Settings.get().tournament_mode
                     print(f"SCORE: tournament_mode = {tournament_mode}")
 
                     if tournament_mode:
@@ -453,7 +457,7 @@ def CheckForNewScores():
                     S.gameCounter = (S.gameCounter + 1) % 100
 
                     # put high scores back in machine memory
-                    if DataStore.read_record("extras", 0)["enter_initials_on_game"] is True:
+                    if Settings.get().enter_initials_on_game is True:
                         print("SCORE: Placing high scores back in machine")
 
                         # Pull top 6 scores from leaderboard
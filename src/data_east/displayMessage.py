@@ -13,7 +13,7 @@ Data East - optionally shows IP address in high score display
 
 from Shadow_Ram_Definitions import shadowRam
 import SharedState as S
-import SPI_DataStore as DataStore
+import Settings
 import DataMapper
 from logger import logger_instance
 log = logger_instance
@@ -55,10 +55,10 @@ def init(ipAddress):
     """
     global localCopyIp, show_ip_last_state
     localCopyIp = ipAddress
-    show_ip_last_state = DataStore.read_record("extras", 0)["show_ip_address"]
+    show_ip_last_state = Settings.get().show_ip_address
     log.log(f"MSG: init ip address {ipAddress}")
 
-    if DataStore.read_record("extras", 0)["show_ip_address"] == 1:
+    if Settings.get().show_ip_address == 1:
         _set(localCopyIp)
         print("MSG: refreshed ", localCopyIp)
    
@@ -71,15 +71,15 @@ def refresh():
     global localCopyIp, show_ip_last_state
     
     #just turned off 
-    if show_ip_last_state==1 and DataStore.read_record("extras", 0)["show_ip_address"]==0:
+    if show_ip_last_state==1 and Settings.get().show_ip_address==0:
         # turn off custom message                
         _blank()        
         print("MSG: turned off")
         
     #refresh message    
-    if DataStore.read_record("extras", 0)["show_ip_address"] == 1:
+    if Settings.get().show_ip_address == 1:
         _set(localCopyIp)
         print("MSG: refreshed ", localCopyIp)
         
-    show_ip_last_state = DataStore.read_record("extras", 0)["show_ip_address"]
+    show_ip_last_state = Settings.get().show_ip_address
 
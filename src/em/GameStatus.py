@@ -14,6 +14,8 @@ import ScoreTrack
 import SharedState as S
 from logger import logger_instance
 from origin import push_game_state
+from phew.sse import EventStream
+from ujson import dumps as json_dumps
 
 log = logger_instance
 
@@ -26,6 +28,10 @@ S.game_status = {"game_active": False, "number_of_players": 0, "time_game_start"
 # from web request rate and avoiding per-request allocations (GC pressure).
 _last_report = None
 
+# /api/game/stream clients, sent the report only when it changes.  encoded once for all of them
+stream = EventStream()
+_last_streamed = None
+
 
 def cached_report():
     """Return the most recent game report from poll_fast.
@@ -38,6 +44,25 @@ def cached_report():
     return _last_report
 
 
+def _stream_report(report, force=False):
+    global _last_streamed
+    if not (stream.clients or force):
+        # nobody listening, skip the encode
+        _last_streamed = None
+        return
+    data = json_dumps(report)
+    if data != _last_streamed:
+        _last_streamed = data
+        stream.publish(data)
+
+
+def game_stream():
+    """EventStream of game reports, brought up to date for a new client"""
+    if not stream.clients:
+        _stream_report(cached_report(), force=True)
+    return stream
+
+
 def _get_machine_score(player):
     """get score  from scoretrack module"""
     return ScoreTrack.getPlayerScore(player)
@@ -94,3 +119,4 @@ def poll_fast():
     global _last_report
     _last_report = game_report()
     push_game_state(_last_report)
+    _stream_report(_last_report)
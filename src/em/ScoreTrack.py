@@ -17,6 +17,8 @@ import time
 import displayMessage
 import sensorRead
 import SharedState as S
+import ScoreIndex
+import Settings
 import SPI_DataStore as DataStore
 import uctypes
 from logger import logger_instance
@@ -126,9 +128,9 @@ def initialize():
     """
     one time power up Initialize
     """
-    from phew.server import schedule
+    from phew.server import PRIORITY_HIGH, schedule
 
-    schedule(processSensorData, 1000, 800)
+    schedule(processSensorData, 1000, 800, priority=PRIORITY_HIGH)
 
     loadState()
     # from displayMessage import init
@@ -1003,7 +1005,7 @@ def reset_scores():
 
 def get_claim_score_list():
     result = []
-    if DataStore.read_record("extras", 0)["claim_scores"]:
+    if Settings.get().claim_scores:
         for game in recent_scores[:4]:
             # if there are any unclaimed non zero scores, add them to the list
             if any(score[0] == "" and score[1] != 0 for score in game[1:]):
@@ -1029,7 +1031,7 @@ def claim_score(initials, player_index, score):
             log.log(f"SCORE: claim new score: {initials}, {score}, {game_index}, {player_index}")
             recent_scores[game_index][player_index + 1] = (initials, score)
             new_score = {"initials": initials, "full_name": None, "score": score, "game": game[0]}
-            if DataStore.read_record("extras", 0)["tournament_mode"]:
+            if Settings.get().tournament_mode:
                 update_tournament(new_score)
             else:
                 update_leaderboard(new_score)
@@ -1093,18 +1095,8 @@ def place_machine_scores():
 
 
 def find_player_by_initials(new_entry):
-    """find players name from list of intials with names from storage"""
-    findInitials = new_entry["initials"]
-    if findInitials == "" or findInitials is None:
-        return ("", -1)
-    count = DataStore.memory_map["names"]["count"]
-    for index in range(count):
-        rec = DataStore.read_record("names", index)
-        if rec is not None:
-            if rec["initials"] == findInitials:
-                player_name = rec["full_name"].strip("\x00")
-                return (player_name, index)
-    return ("", -1)
+    """find players name from list of intials with names from storage (resident initials index)"""
+    return ScoreIndex.find_player(new_entry["initials"])
 
 
 def update_individual_score(new_entry):
@@ -1129,13 +1121,14 @@ def update_individual_score(new_entry):
     for i in range(num_scores):
         scores.append(DataStore.read_record("individual", i, playernum))
 
+    stored = list(scores)
     scores.append(new_entry)
     scores.sort(key=lambda x: x["score"], reverse=True)
     scores = scores[:num_scores]
 
-    # Save the updated scores
-    for i in range(num_scores):
-        DataStore.write_record("individual", scores[i], i, playernum)
+    # Save the updated scores, only the slots at and below the new entry moved
+    ScoreIndex.store_set("individual", stored, scores, playernum)
+    ScoreIndex.set_best(playernum, scores[0])
 
     print(f"Updated scores for {initials}")
     return True
@@ -1160,15 +1153,15 @@ def update_leaderboard(new_entry):
     if new_entry["full_name"] is None:
         new_entry["full_name"] = ""
 
-    # Load scores
-    top_scores = [DataStore.read_record("leaders", i) for i in range(DataStore.memory_map["leaders"]["count"])]
+    # working copy of the resident board
+    top_scores = [dict(entry) for entry in ScoreIndex.board("leaders")]
 
     # if matches a record without initials in top_scores (score claim) - just add initials
     for entry in top_scores:
         if entry["initials"] == "" and entry["score"] == new_entry["score"]:
             entry["initials"] = new_entry["initials"]
             entry["full_name"] = new_entry["full_name"]
-            DataStore.write_record("leaders", entry, top_scores.index(entry))
+            ScoreIndex.put("leaders", top_scores.index(entry), entry)
             return True
 
     # Check if the score already exists in the top_scores list
@@ -1181,8 +1174,8 @@ def update_leaderboard(new_entry):
 
     count = DataStore.memory_map["leaders"]["count"]
     top_scores = top_scores[:count]
-    for i in range(count):
-        DataStore.write_record("leaders", top_scores[i], i)
+    # only the slots that moved are written
+    ScoreIndex.store("leaders", top_scores)
 
     return True
 
@@ -1194,18 +1187,20 @@ def initialize_leaderboard():
 
     # init gameCounter, find highest # in tournament board
     n = 0
-    for i in range(DataStore.memory_map["tournament"]["count"]):
+    for i, rec in enumerate(ScoreIndex.load("tournament")):
         try:
-            game_value = DataStore.read_record("tournament", i)["game"]
+            game_value = rec["game"]
             n = max(game_value, n)
         except (KeyError, TypeError):
             log.log(f"SCORE: Error reading game value at index {i}")
             continue
     S.gameCounter = n
 
+    # names and the initials -> player lookup
+    ScoreIndex.load("names")
+
     # load up top scores from fram
-    count = DataStore.memory_map["leaders"]["count"]
-    top_scores = [DataStore.read_record("leaders", i) for i in range(count)]
+    top_scores = [dict(entry) for entry in ScoreIndex.load("leaders")]
 
 
 def check_for_machine_high_scores():
@@ -1224,8 +1219,8 @@ def update_tournament(new_entry):
         return False
 
     count = DataStore.memory_map["tournament"]["count"]
-    rec = DataStore.read_record("tournament", 0)
-    nextIndex = rec["index"]
+    tournament = ScoreIndex.board("tournament")
+    nextIndex = tournament[0]["index"]
 
     # check for a match in the tournament board, for Claim Score function
     #   look back 6 games x 4 scores = 24 places for a match
@@ -1235,24 +1230,25 @@ def update_tournament(new_entry):
             ind = nextIndex - 1 - i
             if ind < 0:
                 ind += count
-            rec = DataStore.read_record("tournament", ind)
+            rec = tournament[ind]
             if rec["game"] == new_entry["game"] and rec["score"] == new_entry["score"]:
+                rec = dict(rec)
                 rec["initials"] = new_entry["initials"]
-                DataStore.write_record("tournament", rec, ind)
+                ScoreIndex.put("tournament", ind, rec)
         return
 
     new_entry["game"] = S.gameCounter
     new_entry["full_name"] = ""
     new_entry["index"] = nextIndex
-    DataStore.write_record("tournament", new_entry, nextIndex)
+    ScoreIndex.put("tournament", nextIndex, new_entry)
     log.log(f"SCORE: tournament new score {new_entry}")
 
     nextIndex += 1
     if nextIndex >= count:
         nextIndex = 0
-    rec = DataStore.read_record("tournament", 0)
+    rec = dict(tournament[0])
     rec["index"] = nextIndex
-    DataStore.write_record("tournament", rec, 0)
+    ScoreIndex.put("tournament", 0, rec)
     return
 
 
@@ -1307,7 +1303,7 @@ def CheckForNewScores(nState=[0]):
             S.game_status["game_active"] = False
 
             # load scoes into scores[][]
-            if DataStore.read_record("extras", 0)["tournament_mode"]:
+            if Settings.get().tournament_mode:
                 for i in range(0, 4):
                     update_tournament({"initials": "", "score": getPlayerScore(i)})
             else:
@@ -569,8 +569,56 @@ def get_flipper_state():
     return 0, 0
 
 
+#
+# Mode plans
+#   S.gdata["Modes"] (and "ModeChamps") are compiled once into flat tuples of live shadow
+#   ram views and decoder functions, each poll then just runs the plan
+#
+def _u8(data):
+    return data[0] if len(data) > 0 else 0
 
 
+def _u16(data):
+    # little-endian, a single byte reads as u8
+    if len(data) >= 2:
+        return data[0] | (data[1] << 8)
+    return _u8(data)
+
+
+def _u16be(data):
+    if len(data) >= 2:
+        return (data[0] << 8) | data[1]
+    return _u8(data)
+
+
+_DECODERS = {"u8": _u8, "BCD": _bcd_to_int, "u16": _u16, "u16be": _u16be}
+
+# (config the plan was compiled from, plan) - compiled again if the game config is replaced
+_mode_plan = (None, ())
+
+
+def _field(config, what):
+    """(view, decode) for one Address / Length / Format entry"""
+    address = config.get("Address", 0)
+    data_format = config.get("Format", "u8")
+    decode = _DECODERS.get(data_format)
+    if decode is None:
+        # Unknown format, treat as raw byte value
+        log.log(f"DATAMAPPER: Unknown format '{data_format}' for {what}")
+        decode = _u8
+    return memoryview(shadowRam)[address : address + config.get("Length", 1)], decode
+
+
+def _modes_plan():
+    global _mode_plan
+    modes = S.gdata.get("Modes")
+    if _mode_plan[0] is not modes:
+        plan = []
+        for mode_name, mode_config in (modes or {}).items():
+            view, decode = _field(mode_config, f"mode '{mode_name}'")
+            plan.append((mode_name, view, decode, mode_config.get("OffValue", None), mode_config.get("Multiplier", 1)))
+        _mode_plan = (modes, tuple(plan))
+    return _mode_plan[1]
 
 
 def get_modes():
@@ -579,7 +627,7 @@ def get_modes():
     
     Reads mode-specific data (like mission progress, fish caught, etc.)
     based on configuration in S.gdata["Modes"]. Each mode can have:
-    - Address: Memory address (hex string "0x515" or integer)
+    - Address: Memory address (integer)
     - Length: Number of bytes to read
     - Format: Data format ("u8", "BCD", etc.)
     - OffValue: Value threshold - mode excluded if value <= OffValue (optional)
@@ -592,71 +640,18 @@ def get_modes():
               Example: {"Fish Caught": 5, "Monster Fish": 1234}
     """
     modes_data = {}
-    
-    # Check if Modes configuration exists
-    if "Modes" not in S.gdata:
-        return modes_data
-    
+
     try:
-        for mode_name, mode_config in S.gdata["Modes"].items():
-            # Parse address (could be hex string like "0x515" or integer)
-            address = mode_config.get("Address", 0)
-            if isinstance(address, str):
-                # Convert hex string to integer
-                address = int(address, 16) if address.startswith("0x") else int(address)
-            
-            # Get configuration parameters
-            length = mode_config.get("Length", 1)
-            data_format = mode_config.get("Format", "u8")
-            multiplier = mode_config.get("Multiplier", 1)
-            off_value = mode_config.get("OffValue", None)
-            
-            # Read bytes from shadow RAM
-            mode_bytes = shadowRam[address : address + length]
-            
-            # Convert based on format
-            if data_format == "u8":
-                # Unsigned 8-bit integer
-                value = mode_bytes[0] if len(mode_bytes) > 0 else 0
-            elif data_format == "BCD":
-                # BCD encoded
-                value = _bcd_to_int(mode_bytes)
-            elif data_format == "u16":
-                # Unsigned 16-bit integer (little-endian)
-                if len(mode_bytes) >= 2:
-                    value = mode_bytes[0] | (mode_bytes[1] << 8)
-                elif len(mode_bytes) == 1:
-                    value = mode_bytes[0]
-                else:
-                    value = 0
-            elif data_format == "u16be":
-                # Unsigned 16-bit integer (big-endian)
-                if len(mode_bytes) >= 2:
-                    value = (mode_bytes[0] << 8) | mode_bytes[1]
-                elif len(mode_bytes) == 1:
-                    value = mode_bytes[0]
-                else:
-                    value = 0
-            else:
-                # Unknown format, treat as raw byte value
-                log.log(f"DATAMAPPER: Unknown format '{data_format}' for mode '{mode_name}'")
-                value = mode_bytes[0] if len(mode_bytes) > 0 else 0
-            
+        for mode_name, view, decode, off_value, multiplier in _modes_plan():
+            value = decode(view)
             # Only include mode if value > OffValue (if OffValue is specified)
-            if off_value is not None:
-                if value > off_value:
-                    modes_data[mode_name] = value * multiplier
-            else:
-                # No OffValue specified, always include
+            if off_value is None or value > off_value:
                 modes_data[mode_name] = value * multiplier
-    
+
     except Exception as e:
         log.log(f"DATAMAPPER: Error reading modes: {e}")
-    
-    return modes_data
-
-
 
+    return modes_data
 
 
 def get_switches_tripped():
@@ -57,25 +57,10 @@ sanitize_adjustment_names()
 
 def blank_all():
     """blank out all adjustment storage - only for manufacturing init"""
-    chunk_size = 16
-    zero_chunk = bytearray(chunk_size)
-
     fram_adr = ADJ_FRAM_START
-    remaining = ADJ_FRAM_TOTAL_DATA_LENGTH
-    offset = 0    
-    Log.log(f"ADJS: Blanking {remaining:04X} bytes from {fram_adr:04X}")
-    
-    while remaining > 0:
-        write_size = min(chunk_size, remaining)
-        if write_size < chunk_size:
-            # For the last partial chunk
-            fram.write(fram_adr + offset, zero_chunk[:write_size])
-        else:
-            fram.write(fram_adr + offset, zero_chunk)
-            
-        offset += write_size
-        remaining -= write_size
-        
+    Log.log(f"ADJS: Blanking {ADJ_FRAM_TOTAL_DATA_LENGTH:04X} bytes from {fram_adr:04X}")
+    fram.write(fram_adr, bytearray(ADJ_FRAM_TOTAL_DATA_LENGTH))
+
     Log.log("ADJS: All adjustment data cleared")
 
     # Write valid empty strings for names at ADJ_NAMES_START
@@ -247,20 +232,14 @@ def get_active_adjustment():
         return None
 
     matches = []
-    # try to do this 16 bytes at a time for speed - (one SPI read cycle)
+    # one burst read per profile into a reused buffer
+    active_data = shadowRam[cpyStart:cpyEnd]
+    stored_data = bytearray(cpyEnd - cpyStart)
     for i in range(4):
         fram_adr = ADJ_FRAM_START + ADJ_FRAM_RECORD_SIZE * i
-        active_data = shadowRam[cpyStart:cpyEnd]
-        match = True
         print(f"ADJS: Checking {i} at {fram_adr:04X} against shadowRam {cpyStart:04X}:{cpyEnd:04X}")
-        for offset in range(0, cpyEnd - cpyStart, 16):
-            length = min(16, cpyEnd - cpyStart - offset)
-            stored_data = fram.read(fram_adr + offset, length)
-
-            if stored_data != active_data[offset : offset + 16]:
-                match = False
-                break
-        if match:
+        fram.readinto(fram_adr, stored_data)
+        if stored_data == active_data:
             matches.append(i)
     if not matches:
         print("ADJS: No active adjustment found")
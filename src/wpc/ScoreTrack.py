@@ -9,11 +9,14 @@ Score Track
     Must account for highscores and in play score avilability
 """
 import SharedState as S
+import ScoreIndex
+import Settings
 import SPI_DataStore as DataStore
 from logger import logger_instance
 from machine import RTC
 from Shadow_Ram_Definitions import shadowRam
 import DataMapper
+import GameEvents
 
 log = logger_instance
 
@@ -70,7 +73,7 @@ def fix_high_score_checksum():
 def get_claim_score_list():
     """fetch the list of claimable scores"""
     result = []
-    if DataStore.read_record("extras", 0)["claim_scores"] is True:
+    if Settings.get().claim_scores is True:
         for game in recent_scores[:4]:
             # if there are any unclaimed non zero scores, add them to the list
             if any(score[0] == "" and score[1] != 0 for score in game[1:]):
@@ -100,7 +103,7 @@ def claim_score(initials, player_index, score):
                 log.log(f"SCORE: claim new score: {initials}, {score}, {game_index}, {player_index}")
                 recent_scores[game_index][player_index + 1] = (initials, score)
                 new_score = {"initials": initials, "full_name": None, "score": score, "game": game[0]}
-                if DataStore.read_record("extras", 0)["tournament_mode"]:
+                if Settings.get().tournament_mode:
                     update_tournament(new_score)
                 else:
                     update_leaderboard(new_score)
@@ -322,18 +325,8 @@ def _remove_machine_scores(GrandChamp="Max"):
 
 
 def find_player_by_initials(new_entry):
-    """find players name from list of initials with names from storage"""
-    findInitials = new_entry["initials"]
-    if findInitials == "" or findInitials is None:
-        return ("", -1)
-    count = DataStore.memory_map["names"]["count"]
-    for index in range(count):
-        rec = DataStore.read_record("names", index)
-        if rec is not None:
-            if rec["initials"] == findInitials:
-                player_name = rec["full_name"].strip("\x00")
-                return (player_name, index)
-    return ("", -1)
+    """find players name from list of initials with names from storage (resident initials index)"""
+    return ScoreIndex.find_player(new_entry["initials"])
 
 
 def update_individual_score(new_entry):
@@ -361,13 +354,14 @@ def update_individual_score(new_entry):
             return False
         scores.append(existing_score)
 
+    stored = list(scores)
     scores.append(new_entry)
     scores.sort(key=lambda x: x["score"], reverse=True)
     scores = scores[:num_scores]
 
-    # Save the updated scores
-    for i in range(num_scores):
-        DataStore.write_record("individual", scores[i], i, playernum)
+    # Save the updated scores, only the slots at and below the new entry moved
+    ScoreIndex.store_set("individual", stored, scores, playernum)
+    ScoreIndex.set_best(playernum, scores[0])
 
     # print(f"Updated scores for {initials}")
     return True
@@ -395,8 +389,8 @@ def update_leaderboard(new_entry):
         if new_entry["full_name"] is None:
             new_entry["full_name"] = ""
 
-    # Load scores
-    top_scores = [DataStore.read_record("leaders", i) for i in range(DataStore.memory_map["leaders"]["count"])]
+    # working copy of the resident board
+    top_scores = [dict(entry) for entry in ScoreIndex.board("leaders")]
 
     # if matches a record without initials in top_scores (score claim) - just add initials
     for entry in top_scores:
@@ -405,7 +399,7 @@ def update_leaderboard(new_entry):
             print(" using claim - - - - - ")
             entry["initials"] = new_entry["initials"]
             entry["full_name"] = new_entry["full_name"]
-            DataStore.write_record("leaders", entry, top_scores.index(entry))
+            ScoreIndex.put("leaders", top_scores.index(entry), entry)
 
             update_individual_score(new_entry)
             return True
@@ -421,8 +415,8 @@ def update_leaderboard(new_entry):
 
     count = DataStore.memory_map["leaders"]["count"]
     top_scores = top_scores[:count]
-    for i in range(count):
-        DataStore.write_record("leaders", top_scores[i], i)
+    # only the slots that moved are written
+    ScoreIndex.store("leaders", top_scores)
 
     return True
 
@@ -434,18 +428,20 @@ def initialize_leaderboard():
 
     # init gameCounter, find highest # in tournament board
     n = 0
-    for i in range(DataStore.memory_map["tournament"]["count"]):
+    for i, rec in enumerate(ScoreIndex.load("tournament")):
         try:
-            game_value = DataStore.read_record("tournament", i)["game"]
+            game_value = rec["game"]
             n = max(game_value, n)
         except (KeyError, TypeError):
             log.log(f"SCORE: Error reading game value at index {i}")
             continue
     S.gameCounter = n
 
+    # names and the initials -> player lookup
+    ScoreIndex.load("names")
+
     # load up top scores from fram
-    count = DataStore.memory_map["leaders"]["count"]
-    top_scores = [DataStore.read_record("leaders", i) for i in range(count)]
+    top_scores = [dict(entry) for entry in ScoreIndex.load("leaders")]
 
 
 def check_for_machine_high_scores(report=True):
@@ -474,8 +470,8 @@ def update_tournament(new_entry):
         return False
 
     count = DataStore.memory_map["tournament"]["count"]
-    rec = DataStore.read_record("tournament", 0)
-    nextIndex = rec["index"]
+    tournament = ScoreIndex.board("tournament")
+    nextIndex = tournament[0]["index"]
 
     # check for a match in the tournament board, for Claim Score function
     #   look back 6 games x 4 scores = 24 places for a match
@@ -485,24 +481,25 @@ def update_tournament(new_entry):
             ind = nextIndex - 1 - i
             if ind < 0:
                 ind += count
-            rec = DataStore.read_record("tournament", ind)
+            rec = tournament[ind]
             if rec["game"] == new_entry["game"] and rec["score"] == new_entry["score"]:
+                rec = dict(rec)
                 rec["initials"] = new_entry["initials"]
-                DataStore.write_record("tournament", rec, ind)
+                ScoreIndex.put("tournament", ind, rec)
         return
 
     new_entry["game"] = S.gameCounter
     new_entry["full_name"] = ""
     new_entry["index"] = nextIndex
-    DataStore.write_record("tournament", new_entry, nextIndex)
+    ScoreIndex.put("tournament", nextIndex, new_entry)
     log.log(f"SCORE: tournament new score {new_entry}")
 
     nextIndex += 1
     if nextIndex >= count:
         nextIndex = 0
-    rec = DataStore.read_record("tournament", 0)
+    rec = dict(tournament[0])
     rec["index"] = nextIndex
-    DataStore.write_record("tournament", rec, 0)
+    ScoreIndex.put("tournament", 0, rec)
     return
 
 
@@ -512,9 +509,21 @@ live_scores = [["", 0], ["", 0], ["", 0], ["", 0]]
 push_game_count = 0
 last_pushed_game = [["", 0], ["", 0], ["", 0], ["", 0]]
 
+# set by GameEvents at game end, so a game end between two checks is not missed.
+# the in-play scores are kept from that sample, a new game may have reset them by the next check
+_game_ended = False
+_final_scores = None
+
+
+def _on_game_end(event, active):
+    global _game_ended, _final_scores
+    _game_ended = True
+    _final_scores = GameEvents.scores()
+
+
 def CheckForNewScores(nState=[0]):
     """called by scheduler every 5 seconds"""
-    global nGameIdleCounter, GameEndCount, initials_capture_this_game, live_scores, push_game_count, last_pushed_game  
+    global nGameIdleCounter, GameEndCount, initials_capture_this_game, live_scores, push_game_count, last_pushed_game, _game_ended
 
     if push_game_count>0:
         from origin import push_end_of_game
@@ -531,9 +540,10 @@ def CheckForNewScores(nState=[0]):
         machine.mem32[0x20081FF8] = 0x02030101
 
         place_machine_scores()
+        GameEvents.subscribe(GameEvents.GAME_END, _on_game_end)
         nState[0] = 1
         # if enter initials on game set high score rewards to zero
-        if S.gdata["HSRewards"]["Type"] == 10 and DataStore.read_record("extras", 0)["enter_initials_on_game"]:
+        if S.gdata["HSRewards"]["Type"] == 10 and Settings.get().enter_initials_on_game:
             for key, value in S.gdata["HSRewards"].items():
                 if key.startswith("HS"):  # Check if the key starts with 'HS'
                     shadowRam[value] = S.gdata["HSRewards"]["DisableByte"]
@@ -565,13 +575,14 @@ def CheckForNewScores(nState=[0]):
             place_machine_scores()
 
             print("SCORE: game start check ", nGameIdleCounter)
-            if shadowRam[S.gdata["InPlay"]["GameActiveAdr"]] == S.gdata["InPlay"]["GameActiveValue"]:
+            if GameEvents.game_active():
                 nState[0] = 2
                 #Game Started!
                 log.log("SCORE: Game Started")
                 nGameIdleCounter = 0
+                _game_ended = False
 
-                if DataStore.read_record("extras", 0)["enter_initials_on_game"] is True:
+                if Settings.get().enter_initials_on_game is True:
                     #_remove_machine_scores()
                     DataMapper.prepare_initials_capture()
                     initials_capture_this_game = True
@@ -584,10 +595,10 @@ def CheckForNewScores(nState=[0]):
         elif nState[0] == 2:
             print("SCORE: game end check ")
             #print(_read_machine_score(UseHighScores=True))
-            if shadowRam[S.gdata["InPlay"]["GameActiveAdr"]] != S.gdata["InPlay"]["GameActiveValue"]:
-                #get and store player scores - convert to [[initials, score], ...] format
-                score_values = DataMapper.get_live_scores()
-                live_scores = [["", score_values[i]] for i in range(4)]
+            if _game_ended:
+                _game_ended = False
+                #store player scores from the end of the game - convert to [[initials, score], ...] format
+                live_scores = [["", _final_scores[i]] for i in range(4)]
                 nState[0] = 3
 
         # game over, wait for intiials to be entered
@@ -599,7 +610,7 @@ def CheckForNewScores(nState=[0]):
                 GameEndCount = 0
 
             # game start check, if a game starts get out of here
-            if shadowRam[S.gdata["InPlay"]["GameActiveAdr"]] == S.gdata["InPlay"]["GameActiveValue"]:
+            if GameEvents.game_active():
                 nState[0] = 4
 
             if initials_capture_this_game is True:
@@ -638,7 +649,7 @@ def CheckForNewScores(nState=[0]):
                 scores = DataMapper.match_in_play_with_high_score_initials(live_scores, high_scores)
                 #scores = _read_machine_score(UseHighScores=True)[1:]  # remove grand champ
 
-            if DataStore.read_record("extras", 0)["tournament_mode"]:
+            if Settings.get().tournament_mode:
                 for i in range(0, 4):
                     if scores[i][1] > 10000:
                         update_tournament({"initials": scores[i][0], "score": scores[i][1]})
@@ -657,7 +668,7 @@ def CheckForNewScores(nState=[0]):
             _place_game_in_claim_list(game)
 
             # put high scores back in machine memory
-            if DataStore.read_record("extras", 0)["enter_initials_on_game"]:
+            if Settings.get().enter_initials_on_game:
                 place_machine_scores()
 
             S.gameCounter = (S.gameCounter + 1) % 100  
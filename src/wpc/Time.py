@@ -13,7 +13,7 @@ Time Module
     One time trigger of midnight maddess - call trigger_midnight_madness
 """
 import machine
-import SPI_DataStore as DataStore
+import Settings
 from logger import logger_instance
 log = logger_instance
 import SharedState as S
@@ -38,7 +38,7 @@ def _midnight_now():
 def trigger_midnight_madness():
     """ call this from midnight madness now button """
     global MM_Trigger_Active_Count
-    if  DataStore.read_record("extras", 0)["WPCTimeOn"] == True:
+    if  Settings.get().WPCTimeOn == True:
         _midnight_now()
         # trigger and then let update_game_time set back to normal      
         log.log("TIME: trigger Midnight Madness")
@@ -52,8 +52,8 @@ def update_game_time():
         return
 
     if MM_Trigger_Active_Count == 0:
-        if  DataStore.read_record("extras", 0)["WPCTimeOn"] == True:
-            if DataStore.read_record("extras", 0)["MM_Always"] == True and get_ball_in_play()>1: 
+        if  Settings.get().WPCTimeOn == True:
+            if Settings.get().MM_Always == True and get_ball_in_play()>1: 
                 _midnight_now()    
             else:
                 import time
@@ -61,12 +61,12 @@ def update_game_time():
                 machine.mem8[SRAM_CLOCK_HOURS] = 0x17     #t[3]  # Hour (0-23) 
                 machine.mem8[SRAM_CLOCK_MINUTES] = 0x20   #t[4]  # Minute (0-59)                   
 
-        if (DataStore.read_record("extras", 0)["WPCTimeOn"] == False) and (Time_Enabeled==True):        
+        if (Settings.get().WPCTimeOn == False) and (Time_Enabeled==True):        
             log.log("TIME: enable off")          
             disableClockCapture()
             Time_Enabeled=False
         
-        if (DataStore.read_record("extras", 0)["WPCTimeOn"] == True) and (Time_Enabeled==False):
+        if (Settings.get().WPCTimeOn == True) and (Time_Enabeled==False):
             log.log("TIME: enable on")          
             enableClockCapture()
             Time_Enabeled=True
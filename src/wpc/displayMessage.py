@@ -14,7 +14,7 @@ updated for system 9 - optionally shows IP address in high score display
 
 from Shadow_Ram_Definitions import shadowRam
 import SharedState as S
-import SPI_DataStore as DataStore
+import Settings
 from logger import logger_instance
 log = logger_instance
 
@@ -107,7 +107,7 @@ def init(ipAddress):
     """
     global localCopyIp, show_ip_last_state
     localCopyIp = ipAddress
-    show_ip_last_state = DataStore.read_record("extras", 0)["show_ip_address"]
+    show_ip_last_state = Settings.get().show_ip_address
     log.log(f"MSG: init ip address {ipAddress}")
 
 
@@ -118,7 +118,7 @@ def refresh():
     global localCopyIp, show_ip_last_state
     
     #just turned off 
-    if show_ip_last_state==1 and DataStore.read_record("extras", 0)["show_ip_address"]==0:
+    if show_ip_last_state==1 and Settings.get().show_ip_address==0:
         # turn off custom message                
         _blank()        
         message_adr = S.gdata["Adjustments"].get("CustomMessageOn")
@@ -128,10 +128,10 @@ def refresh():
         print("MSG: turned off")
         
     #refresh message    
-    if DataStore.read_record("extras", 0)["show_ip_address"] == 1:
+    if Settings.get().show_ip_address == 1:
         _blank()
         _set(localCopyIp)
         print("MSG: refreshed ", localCopyIp)
         
-    show_ip_last_state = DataStore.read_record("extras", 0)["show_ip_address"]
+    show_ip_last_state = Settings.get().show_ip_address
 